@@ -1,18 +1,23 @@
 import pygame
 import os
+import queue
+import argparse
 import threading
-from copy import deepcopy
+import time
 from src.Logica.Logica import Ecosistema, Herbivoro, Carnivoro, Omnivoro, Conejo, Raton, Cabra, Leopardo, Gato, Cerdo, Mono, Halcon, Insecto
 from src.Interfaz.Interfaz import PygameView
 from src.Interfaz.Menu_view import Menu
+from src.Logica.Hilo_simulacion import SimulacionEnHilo
+from src.Logica.Plantilla_mundo import activar_cache_en_disco
 import src.Persistencia.Persistencia as persistencia # Importamos el nuevo módulo
 
 class SimulationController:
-    def __init__(self, dias_simulacion: int):
+    def __init__(self, dias_simulacion: int, threaded: bool = False, mundo: dict = None, grabar_sesiones: bool = False):
         pygame.init()  # Asegurar que pygame está inicializado
         pygame.mixer.init() # Asegurar que el mixer está listo para la música del menú
         self.view = PygameView()
-        self.ecosistema = Ecosistema()
+        self.mundo = mundo or {} # ancho, alto, tamano_celda, dormancia, cinetico y reparto de decisiones de los ecosistemas nuevos
+        self.ecosistema = Ecosistema(**self.mundo)
         self.dias_simulacion = dias_simulacion
         
         # El controlador ahora es responsable de obtener los datos para el menú
@@ -49,11 +54,24 @@ class SimulationController:
         self.paused = True
         
         self.sim_speed_multiplier = 3
+        self.speed_options = [1, 2, 3, 5, 10, 20, 50, 100] # Velocidades seleccionables con las teclas +/-
         self.special_sound_channel = None # Canal para sonidos especiales PUNTUALES (reproducción, etc.)
         self.music_volume_before_fade = 0.2 # Almacena el volumen de la música antes de atenuarla
 
         self.base_time_per_hour = 50 # Ralentizamos un poco para mejor visualización
         self.last_update_time = pygame.time.get_ticks()
+        # Paso fijo: el acumulador guarda el tiempo real pendiente de simular
+        self.sim_accumulator_ms = 0.0
+        self.sim_budget_ms = 10 # Tiempo máximo por frame dedicado a simular (el resto es para dibujar)
+        self.sim_lagging = False # True si en el último frame no dio tiempo a simular todas las horas pendientes
+        self.dropped_hours = 0 # Horas descartadas por falta de tiempo desde el inicio
+        self.max_backlog_ms = 1000 # Retraso que se recupera en los frames siguientes; lo que pase de aquí se descarta
+        # Con threaded=True la simulación corre en su propio hilo y la vista dibuja instantáneas
+        self.threaded = threaded
+        self.sim_thread = None
+        self.grabar_sesiones = grabar_sesiones # Guardar cada sesión en replays/ (ver _guardar_registro_sesion)
+        self.instantanea = None # Última instantánea dibujada (también se usa para seleccionar con el ratón)
+        self._version_instantanea = None # (ecosistema, hora, comandos aplicados, selección) con los que se creó
         self.clock = pygame.time.Clock()
         self._play_menu_music()
         # Asegurarse de que el botón de música refleje el estado inicial
@@ -80,11 +98,8 @@ class SimulationController:
             print(f"No se pudo cargar el sonido de reproducción 'reproduccion_1.mp3': {e}")
 
     def _poblar_ecosistema(self):
-        tipos_de_animales = [Conejo, Raton, Cabra, Leopardo, Gato, Cerdo, Mono, Halcon, Insecto]
-        for tipo in tipos_de_animales:
-            for _ in range(2):
-                nuevo_animal = self.ecosistema.agregar_animal(tipo)
-                self.view.play_animal_sound(nuevo_animal.__class__.__name__)
+        for nuevo_animal in self.ecosistema.aplicar_comando("poblar", 2):
+            self.view.play_animal_sound(nuevo_animal.__class__.__name__)
 
     def _avanzar_dia(self):
         for _ in range(24):
@@ -96,19 +111,14 @@ class SimulationController:
         return self.ecosistema.dia_total >= self.dias_simulacion or not self.ecosistema.animales
     
     def _actualizar_grafico(self):
-        poblaciones = (
-            sum(1 for a in self.ecosistema.animales if isinstance(a, Herbivoro)),
-            sum(1 for a in self.ecosistema.animales if isinstance(a, Carnivoro)),
-            sum(1 for a in self.ecosistema.animales if isinstance(a, Omnivoro))
-        )
-        self.view.graph.update(poblaciones)
+        self.view.graph.update(self.ecosistema.agregados.dietas())
 
-    def _check_autosave(self):
+    def _check_autosave(self, dia_total):
         """Comprueba si debe activarse el autoguardado basado en el día actual."""
         if self.autosave_interval is not None and self.autosave_interval > 0:
             # Usamos el módulo para asegurarnos de que se active en los múltiplos exactos del intervalo.
             # Se activa en el día 30, 60, 90... para un intervalo de 30.
-            if self.ecosistema.dia_total > 0 and self.ecosistema.dia_total % self.autosave_interval == 0:
+            if dia_total > 0 and dia_total % self.autosave_interval == 0:
                 self.trigger_autosave = True # Activamos el trigger para el bucle principal
 
     def _avanzar_hora(self):
@@ -117,7 +127,7 @@ class SimulationController:
             return True
         if self.ecosistema.hora_actual == 0:
             self._actualizar_grafico()
-            self._check_autosave() # Comprobar si es día de autoguardado
+            self._check_autosave(self.ecosistema.dia_total) # Comprobar si es día de autoguardado
         return self.ecosistema.dia_total >= self.dias_simulacion or not self.ecosistema.animales
 
     def _setup_button_actions(self):
@@ -143,21 +153,43 @@ class SimulationController:
         # Mapeo dinámico para los botones de "añadir animal"
         for name, cls in animal_map.items():
             # La acción ahora también reproduce el sonido a través de la vista
-            self.button_actions[f"add_{name}"] = lambda species=cls: \
-                self.view.play_animal_sound(self.ecosistema.agregar_animal(species).__class__.__name__)
+            self.button_actions[f"add_{name}"] = lambda species=cls: self._action_add_animal(species)
+
+    def _run_on_sim(self, func):
+        """
+        Ejecuta func() sobre el ecosistema. Con el hilo de simulación activo se encola
+        y se aplica entre dos horas; si no, se ejecuta directamente.
+        """
+        if self.sim_thread:
+            self.sim_thread.encolar(func)
+        else:
+            func()
+
+    def _action_add_animal(self, species):
+        ecosistema = self.ecosistema
+        self._run_on_sim(lambda: ecosistema.aplicar_comando("agregar", species.__name__))
+        self.view.play_animal_sound(species.__name__)
 
     def _save_in_background(self, save_path, sim_speed, autosave_interval):
         """
-        Copia el ecosistema y lo guarda en un hilo separado para no bloquear la simulación.
+        Saca el estado con to_dict() entre dos horas de simulación y lo escribe
+        en disco en un hilo separado para no bloquear la simulación.
         """
-        ecosistema_copiado = deepcopy(self.ecosistema)
-        persistencia.guardar_partida(ecosistema_copiado, save_path, autosave=True, sim_speed_multiplier=sim_speed, autosave_interval=autosave_interval)
+        ecosistema = self.ecosistema
+
+        def _capturar():
+            datos = ecosistema.to_dict(sim_speed, autosave_interval)
+            threading.Thread(target=persistencia.guardar_datos,
+                             args=(datos, ecosistema.dia_total, len(ecosistema.animales), save_path),
+                             kwargs={"autosave": True}).start()
+        self._run_on_sim(_capturar)
 
-        
     def _action_save(self, autosave=False):
         """Utiliza la clase Persistencia para guardar el estado del ecosistema."""
         if self.save_path:
-            persistencia.guardar_partida(self.ecosistema, self.save_path, autosave=autosave, sim_speed_multiplier=self.sim_speed_multiplier, autosave_interval=self.autosave_interval)
+            ecosistema, save_path = self.ecosistema, self.save_path
+            speed, interval = self.sim_speed_multiplier, self.autosave_interval
+            self._run_on_sim(lambda: persistencia.guardar_partida(ecosistema, save_path, autosave=autosave, sim_speed_multiplier=speed, autosave_interval=interval))
         else:
             print("Error: No hay una ruta de guardado definida.")
 
@@ -173,6 +205,7 @@ class SimulationController:
             self._display_message("Error: No se ha seleccionado una ruta de guardado.", is_error=True)
             return False
 
+        self._guardar_registro_sesion()
         try:
             loaded_ecosystem, loaded_speed, loaded_autosave = persistencia.cargar_partida(self.save_path)
             if loaded_ecosystem:
@@ -223,13 +256,26 @@ class SimulationController:
         except Exception as e:
             # Catch any other unexpected errors during loading, e.g., JSON parsing errors
             error_message = f"Error inesperado al cargar la partida '{os.path.basename(self.save_path)}': {e}"
-            self.ecosistema = Ecosistema()
+            self.ecosistema = Ecosistema(semilla=self.ecosistema.semilla, **self.mundo) # Mismo mundo: se copia de la plantilla
             self._setup_button_actions()
             self._display_message(error_message, is_error=True)
             return False
 
+    def _guardar_registro_sesion(self):
+        """
+        Con grabar_sesiones, guarda semilla y comandos de la partida actual para repetirla
+        con 'python -m src.Logica.run --replay'.
+        """
+        self._stop_sim_thread() # El registro debe reflejar una hora completa, no una a medias
+        if not self.grabar_sesiones or not self.ecosistema.reproducible or self.ecosistema.hora_absoluta == 0:
+            return
+        ruta = os.path.join("replays", f"sesion_{time.strftime('%Y%m%d_%H%M%S')}.json")
+        persistencia.guardar_registro_comandos(self.ecosistema, ruta)
+
     def _action_restart(self):
-        self.ecosistema = Ecosistema()
+        self._guardar_registro_sesion()
+        # Misma semilla: el mundo sale de la plantilla en memoria y el reinicio es inmediato
+        self.ecosistema = Ecosistema(semilla=self.ecosistema.semilla, **self.mundo)
         self._poblar_ecosistema()
         self.view.graph.history.clear()
         self.animal_seleccionado = None
@@ -266,22 +312,106 @@ class SimulationController:
 
     def _action_toggle_pause(self): self.paused = not self.paused
     def _action_advance_day(self):
+        if self.sim_thread:
+            # El hilo simula las 24 horas de golpe; el final se detecta con sim_thread.terminada
+            if not self.sim_thread.terminada:
+                self.sim_thread.adelantar(24)
+            return False
         if self.ecosistema.dia_total < self.dias_simulacion and self.ecosistema.animales:
             return self._avanzar_dia()
         return True
+
+    def _action_change_speed(self, direction):
+        """Sube (direction=1) o baja (direction=-1) la velocidad de simulación entre las opciones disponibles."""
+        faster = [s for s in self.speed_options if s > self.sim_speed_multiplier]
+        slower = [s for s in self.speed_options if s < self.sim_speed_multiplier]
+        if direction > 0 and faster:
+            self.sim_speed_multiplier = faster[0]
+        elif direction < 0 and slower:
+            self.sim_speed_multiplier = slower[-1]
+
+    def _run_simulation_steps(self, delta_time):
+        """
+        Acumulador de paso fijo: simula tantas horas como pide el tiempo transcurrido,
+        sin superar el presupuesto de tiempo por frame. Las horas que no caben se quedan
+        en el acumulador y se recuperan en los frames siguientes (simulación retrasada);
+        solo se descartan, y se cuentan en dropped_hours, las que pasan de max_backlog_ms.
+        Devuelve True si la simulación ha terminado.
+        """
+        self.sim_accumulator_ms += delta_time
+        time_per_hour = self.base_time_per_hour / self.sim_speed_multiplier
+        exceso = self.sim_accumulator_ms - self.max_backlog_ms
+        if exceso >= time_per_hour:
+            descartadas = int(exceso // time_per_hour)
+            self.dropped_hours += descartadas
+            self.sim_accumulator_ms -= descartadas * time_per_hour
+        frame_start = time.perf_counter()
+        while self.sim_accumulator_ms >= time_per_hour:
+            self.sim_accumulator_ms -= time_per_hour
+            if self._avanzar_hora():
+                self.sim_accumulator_ms = 0.0
+                self.sim_lagging = False
+                return True
+            if (time.perf_counter() - frame_start) * 1000 >= self.sim_budget_ms:
+                break
+        self.sim_lagging = self.sim_accumulator_ms >= time_per_hour
+        return False
+
+    def _refrescar_instantanea(self):
+        """
+        Sin hilo de simulación: rehace la instantánea solo si el ecosistema ha cambiado
+        (se ha simulado una hora, se ha aplicado un comando o es otra partida) o la selección.
+        """
+        ecosistema = self.ecosistema
+        version = (ecosistema, ecosistema.hora_absoluta, len(ecosistema.registro_comandos), self.animal_seleccionado, self.pareja_seleccionada)
+        if self.instantanea is None or version != self._version_instantanea:
+            self.instantanea = ecosistema.crear_instantanea(self.animal_seleccionado, self.pareja_seleccionada)
+            self._version_instantanea = version
+
+    def _stop_sim_thread(self):
+        if self.sim_thread:
+            self.sim_thread.detener()
+            self.sim_thread = None
+
+    def _update_threaded_simulation(self):
+        """
+        Sincroniza el hilo de simulación con el controlador (ecosistema, pausa, velocidad)
+        y recoge lo que ha publicado: días completados e instantánea.
+        Devuelve True si la simulación ha terminado.
+        """
+        if self.sim_thread and self.sim_thread.ecosistema is not self.ecosistema:
+            self._stop_sim_thread() # Se ha cargado o reiniciado la partida
+        if not self.sim_thread:
+            self.sim_thread = SimulacionEnHilo(self.ecosistema, self.base_time_per_hour, self.dias_simulacion)
+            self.sim_thread.iniciar()
+
+        self.sim_thread.velocidad = self.sim_speed_multiplier
+        self.sim_thread.pausado = self.paused
+        self.sim_thread.seleccionar(self.animal_seleccionado, self.pareja_seleccionada)
+        while True:
+            try:
+                dia, poblaciones = self.sim_thread.dias_completados.get_nowait()
+            except queue.Empty:
+                break
+            self.view.graph.update(poblaciones)
+            self._check_autosave(dia)
+        self.sim_lagging = self.sim_thread.retrasada and not self.paused
+        self.instantanea = self.sim_thread.instantanea
+        return self.sim_thread.terminada
     
     def _action_feed_all_herbivores(self):
         """Da la orden de comer a todos los herbívoros y omnívoros con baja energía."""
         print("Dando orden de comer a herbívoros y omnívoros hambrientos...")
-        for animal in self.ecosistema.animales:
-            if not isinstance(animal, Carnivoro) and (animal.energia / animal.max_energia) < 0.8:
-                animal.buscar_comida(forzado=True)
+        ecosistema = self.ecosistema
+        self._run_on_sim(lambda: ecosistema.aplicar_comando("alimentar"))
 
     def _action_toggle_hunt_mode(self):
         """Activa o desactiva el modo de caza para carnívoros."""
-        self.ecosistema.activar_modo_caza_carnivoro()
+        activar = not self.instantanea.modo_caza_carnivoro_activo
+        ecosistema = self.ecosistema
+        self._run_on_sim(lambda: ecosistema.aplicar_comando("modo_caza", activar))
         # Actualizar texto del botón
-        if self.ecosistema.modo_caza_carnivoro_activo:
+        if activar:
             # Cambiar la música de fondo a la de caza
             pygame.mixer.music.load("assets/atacar_1.mp3")
             pygame.mixer.music.set_volume(0.25) # Volumen de caza
@@ -313,14 +443,26 @@ class SimulationController:
             if type(self.animal_seleccionado) == type(self.pareja_seleccionada):
                 # Reproducimos el sonido una sola vez, sin bucle. La restauración se gestiona en el bucle principal.
                 self._play_special_sound_and_fade_music(self.reproduction_sound) # loops=0 es el valor por defecto
-                self.animal_seleccionado.buscar_pareja_para_reproducir(self.pareja_seleccionada)
+                animal, pareja, ecosistema = self.animal_seleccionado, self.pareja_seleccionada, self.ecosistema
+
+                def _reproducir():
+                    # Los índices se toman al aplicar el comando: son los que usará la repetición
+                    if animal in ecosistema.animales and pareja in ecosistema.animales:
+                        ecosistema.aplicar_comando("reproducir", ecosistema.animales.index(animal), ecosistema.animales.index(pareja))
+                self._run_on_sim(_reproducir)
                 # La restauración del volumen de la música se gestiona automáticamente en el bucle principal.
             else:
-                self._display_message(f"{self.animal_seleccionado.nombre} y {self.pareja_seleccionada.nombre} no son de la misma especie.", is_error=True)
+                seleccionado, pareja = self.instantanea.seleccionado, self.instantanea.pareja
+                if seleccionado and pareja:
+                    self._display_message(f"{seleccionado.nombre} y {pareja.nombre} no son de la misma especie.", is_error=True)
 
     def _action_select_animal_at(self, pos):
         """Selecciona un animal en la posición dada o deselecciona si se hace clic en un espacio vacío."""
-        animal_clicado = self.ecosistema.get_animal_at(pos)
+        # Se selecciona sobre la instantánea dibujada: es lo que el usuario ve en pantalla
+        if self.instantanea:
+            animal_clicado = self.instantanea.animal_en(pos)
+        else:
+            animal_clicado = self.ecosistema.get_animal_at(pos)
         
         if not animal_clicado:
             # Si se hace clic en espacio vacío, se deselecciona todo.
@@ -350,6 +492,12 @@ class SimulationController:
 
         while running:
             self.clock.tick(60)  # Mantener 60 FPS constantes
+
+            if self.current_state != "SIMULATION":
+                # Fuera de la simulación el reloj no acumula horas pendientes
+                self.last_update_time = pygame.time.get_ticks()
+                # y el hilo de simulación se detiene (guardar como, menú, carga...)
+                self._stop_sim_thread()
             
             if self.current_state == "MENU":
                 # Al volver al menú, siempre recargamos los usuarios y las partidas del usuario seleccionado.
@@ -385,10 +533,17 @@ class SimulationController:
                         pygame.mixer.music.set_volume(self.music_volume_before_fade)
                     self.special_sound_channel = None # Limpiamos la referencia al canal.
 
-                if not self.paused and not sim_over and delta_time > self.base_time_per_hour / self.sim_speed_multiplier:
-                    sim_over = self._avanzar_hora()
-                    self.last_update_time = current_time
+                if self.threaded:
+                    sim_over = self._update_threaded_simulation()
+                elif not self.paused and not sim_over:
+                    sim_over = self._run_simulation_steps(delta_time)
+                else:
+                    self.sim_accumulator_ms = 0.0
+                    self.sim_lagging = False
+                self.last_update_time = current_time
                 running, sim_over = self.handle_simulation_events(running, sim_over) # type: ignore
+                if not self.threaded:
+                    self._refrescar_instantanea()
 
                 # --- Lógica de Autoguardado ---
                 if self.trigger_autosave:
@@ -397,11 +552,10 @@ class SimulationController:
                     self.autosave_icon_end_time = pygame.time.get_ticks() + 3000 # 3 segundos
                     
                     print(f"Autoguardando partida... (Intervalo: {self.autosave_interval} días)")
-                    # Iniciar el guardado en un hilo separado para no pausar la simulación.
-                    save_thread = threading.Thread(target=self._save_in_background, args=(self.save_path, self.sim_speed_multiplier, self.autosave_interval))
-                    save_thread.start()
+                    # El estado se captura aquí, entre dos horas; solo la escritura del archivo va en otro hilo
+                    self._save_in_background(self.save_path, self.sim_speed_multiplier, self.autosave_interval)
 
-                self.view.draw_simulation(self.ecosistema, sim_over, self.animal_seleccionado, self.pareja_seleccionada, self.sim_speed_multiplier, self.is_autosaving)
+                self.view.draw_simulation(self.instantanea, sim_over, self.sim_speed_multiplier, self.is_autosaving, self.sim_lagging)
             
             elif self.current_state == "SAVING":
                 self.view.draw_save_menu(self.save_menu_saves, self.save_menu_input, self.save_menu_selected) # Pasamos el save seleccionado
@@ -435,6 +589,7 @@ class SimulationController:
                         self.current_state = "SIMULATION"
                         self.paused = False
 
+        self._guardar_registro_sesion()
         self.view.close()
 
     def handle_menu_events(self):
@@ -552,7 +707,7 @@ class SimulationController:
                         self.current_state = "CONFIRM_LOAD"
                         # Preparamos el ecosistema para la transición, pero no lo mostramos aún
                         if is_new_game:
-                            self.ecosistema = Ecosistema()
+                            self.ecosistema = Ecosistema(**self.mundo)
                             self._poblar_ecosistema()
 
         return True
@@ -560,7 +715,7 @@ class SimulationController:
     def handle_simulation_events(self, running, sim_over):
         for event in pygame.event.get():
             # La vista procesa el evento y devuelve un comando de alto nivel
-            command = self.view.handle_event(event, self.ecosistema, self.animal_seleccionado)
+            command = self.view.handle_event(event, self.instantanea, self.animal_seleccionado)
 
             if not command:
                 continue
@@ -576,13 +731,16 @@ class SimulationController:
                 self.current_state = "MENU" # Volver al menú
             elif command_type == "toggle_music":
                 self.view.toggle_music()
+            elif command_type == "speed_up":
+                self._action_change_speed(1)
+            elif command_type == "speed_down":
+                self._action_change_speed(-1)
             elif command_type == "click_simulation_area" and not sim_over:
                 self._action_select_animal_at(command["pos"])
             elif command_type and command_type.startswith("click_button_") and not sim_over:
                 button_name = command_type.replace("click_button_", "")
                 action = self.button_actions.get(button_name)
                 if action:
-                    print(f"DEBUG: Controller executing action for button '{button_name}'")
                     result = action()
                     # Si la acción fue avanzar el día, actualizamos el estado de sim_over
                     if button_name == "next_day" and result:
@@ -666,9 +824,33 @@ class SimulationController:
         return True
 
 def main():
+    parser = argparse.ArgumentParser(description="Simulador de ecosistema virtual.")
+    parser.add_argument("--threaded", action="store_true", help="Simular en un hilo aparte y dibujar instantáneas del estado.")
+    parser.add_argument("--width", type=int, default=None, help="Ancho del mundo en píxeles; si es mayor que la ventana se recorre con las flechas.")
+    parser.add_argument("--height", type=int, default=None, help="Alto del mundo en píxeles.")
+    parser.add_argument("--cell-size", type=int, default=None, help="Tamaño de las celdas de la simulación en píxeles.")
+    parser.add_argument("--dormancy", action="store_true", help="Dormir las regiones del mapa sin animales activos cerca (mapas grandes).")
+    parser.add_argument("--kinetic", action="store_true", help="Mover a los animales que deambulan por tramos rectos calculados una vez.")
+    parser.add_argument("--decision-phases", type=int, default=None, help="Grupos en los que se reparten las decisiones de los animales: cada uno decide una de cada N horas.")
+    parser.add_argument("--decision-budget", type=int, default=None, help="Máximo de decisiones de los animales por hora.")
+    parser.add_argument("--record", action="store_true", help="Guardar en replays/ la semilla y las acciones de cada sesión para repetirla con 'python -m src.Logica.run --replay'.")
+    parser.add_argument("--world-cache", action="store_true", help="Guardar los mundos generados de cada semilla en la carpeta de caché del usuario (~/.cache/ecosistema/mundos) y reutilizarlos.")
+    args = parser.parse_args()
+    if args.world_cache:
+        activar_cache_en_disco()
+    mundo = {clave: valor for clave, valor in (("ancho", args.width), ("alto", args.height), ("tamano_celda", args.cell_size)) if valor is not None}
+    if args.dormancy:
+        mundo["dormancia"] = True
+    if args.kinetic:
+        mundo["cinetico"] = True
+    if args.decision_phases is not None:
+        mundo["fases_decision"] = args.decision_phases
+    if args.decision_budget is not None:
+        mundo["presupuesto_decisiones"] = args.decision_budget
+
     # Limpiar archivos temporales de sesiones anteriores antes de empezar
     persistencia.limpiar_archivos_temporales_antiguos()
-    controlador = SimulationController(dias_simulacion=730)
+    controlador = SimulationController(dias_simulacion=730, threaded=args.threaded, mundo=mundo, grabar_sesiones=args.record)
     controlador.run()
     
 
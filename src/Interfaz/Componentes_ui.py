@@ -66,8 +66,9 @@ class Button:
 
 class Cloud:
     """Representa una nube que se mueve por la pantalla."""
-    def __init__(self, image, screen_width, screen_height, y_range):
+    def __init__(self, image, screen_width, screen_height, y_range, rng=None):
         self.image = image
+        self.rng = rng if rng is not None else random.Random() # Aleatoriedad solo visual, separada de la simulación
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.y_range = y_range
@@ -75,13 +76,13 @@ class Cloud:
 
     def reset(self, on_screen=False):
         """Reinicia la posición y velocidad de la nube."""
-        self.speed = random.uniform(0.2, 0.8) # Velocidad lenta y variable
-        self.y = random.randint(self.y_range[0], self.y_range[1]) # Aparecen en el rango Y especificado
+        self.speed = self.rng.uniform(0.2, 0.8) # Velocidad lenta y variable
+        self.y = self.rng.randint(self.y_range[0], self.y_range[1]) # Aparecen en el rango Y especificado
         # Si on_screen es True, la posiciona en cualquier parte de la pantalla. Si no, a la izquierda.
         if on_screen:
-            self.x = random.randint(0, self.screen_width)
+            self.x = self.rng.randint(0, self.screen_width)
         else:
-            self.x = random.randint(-self.image.get_width() - 200, -self.image.get_width())
+            self.x = self.rng.randint(-self.image.get_width() - 200, -self.image.get_width())
 
     def update(self):
         """Mueve la nube y la reinicia si sale de la pantalla."""
@@ -6,9 +6,19 @@ from src.Interfaz.Constantes import *
 from .Componentes_ui import PopulationGraph, Button, Cloud
 import os
 
+PASO_CAMARA = 200 # Píxeles que se desplaza la vista con cada pulsación de una flecha
+TECLAS_CAMARA = {
+    pygame.K_LEFT: (-1, 0),
+    pygame.K_RIGHT: (1, 0),
+    pygame.K_UP: (0, -1),
+    pygame.K_DOWN: (0, 1),
+}
+
 class PygameView:
     def __init__(self):
         pygame.init()
+        # Aleatoriedad de la presentación (nubes, música): nunca toca el generador del ecosistema
+        self.rng_render = random.Random()
         try:
             pygame.mixer.init()
         except Exception:
@@ -46,6 +56,9 @@ class PygameView:
             print("Advertencia: No se pudo cargar 'assets/icono_carga.png'. El icono de autoguardado no se mostrará.")
             self.autosave_icon = None
         self.mouse_pos = None
+        # Esquina superior izquierda de la vista en coordenadas del mundo (mundos mayores que la ventana)
+        self.camara_x = 0
+        self.camara_y = 0
  
         self.hierba_surface = pygame.Surface((SIM_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
         self.background_surface = pygame.Surface((SIM_WIDTH, SCREEN_HEIGHT))
@@ -80,7 +93,7 @@ class PygameView:
             # Seleccionamos solo los archivos .mp3 que NO están en la lista de efectos de sonido
             music_files = [f for f in os.listdir(music_folder) if f.endswith(".mp3") and f not in sound_effects]
             if music_files:
-                music_path = os.path.join(music_folder, random.choice(music_files))
+                music_path = os.path.join(music_folder, self.rng_render.choice(music_files))
                 pygame.mixer.music.load(music_path)
                 pygame.mixer.music.set_volume(0.25)
                 pygame.mixer.music.play(-1)
@@ -255,7 +268,7 @@ class PygameView:
         
         # Aseguramos que la nube tenga transparencia
         cloud_sprite_alpha = cloud_sprite.convert_alpha()
-        return [Cloud(cloud_sprite_alpha, SIM_WIDTH, SCREEN_HEIGHT, y_range) for _ in range(count)]
+        return [Cloud(cloud_sprite_alpha, SIM_WIDTH, SCREEN_HEIGHT, y_range, self.rng_render) for _ in range(count)]
 
     def _draw_text(self, text, font, color, surface, x, y):
         text_shadow = font.render(text, 1, (0, 0, 0))
@@ -268,11 +281,32 @@ class PygameView:
     def _draw_tiled_texture(self, surface, texture, rect):
         if not texture:
             return
+        # Solo las baldosas que caen dentro de la superficie (los terrenos de un mundo grande la desbordan)
+        visible = rect.clip(surface.get_rect())
+        if visible.width <= 0 or visible.height <= 0:
+            return
         tex_w, tex_h = texture.get_size()
-        for y in range(rect.top, rect.bottom, tex_h):
-            for x in range(rect.left, rect.right, tex_w):
+        x0 = rect.left + (visible.left - rect.left) // tex_w * tex_w
+        y0 = rect.top + (visible.top - rect.top) // tex_h * tex_h
+        for y in range(y0, visible.bottom, tex_h):
+            for x in range(x0, visible.right, tex_w):
                 surface.blit(texture, (x, y))
 
+    def _a_pantalla(self, rect):
+        """Rectángulo del mundo en coordenadas de la pantalla."""
+        return pygame.Rect(rect).move(-self.camara_x, -self.camara_y)
+
+    def _en_pantalla(self, x, y, margen=20):
+        return -margen <= x < SIM_WIDTH + margen and -margen <= y < SCREEN_HEIGHT + margen
+
+    def _ajustar_camara(self, terreno):
+        """Mantiene la vista dentro del mundo; redibuja el fondo si la cámara se ha movido."""
+        camara_x = max(0, min(self.camara_x, terreno.ancho - SIM_WIDTH))
+        camara_y = max(0, min(self.camara_y, terreno.alto - SCREEN_HEIGHT))
+        if (camara_x, camara_y) != (self.camara_x, self.camara_y):
+            self.camara_x, self.camara_y = camara_x, camara_y
+            self.needs_static_redraw = True
+
     def _update_water_animation(self):
         if not self.agua_texturas:
             return
@@ -283,26 +317,29 @@ class PygameView:
             self.agua_frame_actual = (self.agua_frame_actual + 1) % len(self.agua_texturas)
 
     def _draw_animal_bars(self, animal):
-        """Dibuja las barras de vida y sed sobre un animal."""
+        """Dibuja las barras de vida y sed sobre un animal (AnimalVisible de la instantánea)."""
         BAR_WIDTH = 20
         BAR_HEIGHT = 3
         Y_OFFSET_VIDA = 10  # Distancia sobre el animal para la barra de vida
 
         # --- Barra de Vida (Energía) ---
-        vida_percent = animal.energia / animal.max_energia
+        vida_percent = animal.ratio_energia
         vida_bar_width = int(BAR_WIDTH * vida_percent)
-        vida_bar_bg = pygame.Rect(animal.x - BAR_WIDTH // 2, animal.y - Y_OFFSET_VIDA, BAR_WIDTH, BAR_HEIGHT)
-        vida_bar_fill = pygame.Rect(animal.x - BAR_WIDTH // 2, animal.y - Y_OFFSET_VIDA, vida_bar_width, BAR_HEIGHT)
+        x, y = animal.x - self.camara_x, animal.y - self.camara_y
+        vida_bar_bg = pygame.Rect(x - BAR_WIDTH // 2, y - Y_OFFSET_VIDA, BAR_WIDTH, BAR_HEIGHT)
+        vida_bar_fill = pygame.Rect(x - BAR_WIDTH // 2, y - Y_OFFSET_VIDA, vida_bar_width, BAR_HEIGHT)
         pygame.draw.rect(self.screen, (80, 0, 0), vida_bar_bg) # Fondo rojo oscuro
         pygame.draw.rect(self.screen, (0, 255, 0), vida_bar_fill) # Relleno verde
 
-    def _draw_animales(self, ecosistema, animal_seleccionado):
-        for animal in ecosistema.animales:
-            sprite = self.sprites.get(animal.__class__.__name__)
+    def _draw_animales(self, instantanea):
+        for animal in instantanea.animales:
+            if not self._en_pantalla(animal.x - self.camara_x, animal.y - self.camara_y):
+                continue
+            sprite = self.sprites.get(animal.especie)
             if sprite:
                 sprite_w, sprite_h = sprite.get_size()
-                sprite_pos_x = animal.x - sprite_w // 2
-                sprite_pos_y = animal.y - sprite_h // 2
+                sprite_pos_x = animal.x - self.camara_x - sprite_w // 2
+                sprite_pos_y = animal.y - self.camara_y - sprite_h // 2
                 self.screen.blit(sprite, (sprite_pos_x, sprite_pos_y))
             else:
                 # Si no hay sprite, dibuja un círculo de color como fallback
@@ -311,22 +348,23 @@ class PygameView:
             # Dibujar las barras de estado para cada animal
             self._draw_animal_bars(animal)
 
-        if animal_seleccionado:
-            pygame.draw.circle(self.screen, (255, 255, 0), (animal_seleccionado.x, animal_seleccionado.y), 10, 2)
+        seleccionado = instantanea.seleccionado
+        if seleccionado:
+            pygame.draw.circle(self.screen, (255, 255, 0), (seleccionado.x - self.camara_x, seleccionado.y - self.camara_y), 10, 2)
 
     def _draw_pareja_seleccionada(self, pareja):
         if pareja:
-            pygame.draw.circle(self.screen, (255, 0, 255), (pareja.x, pareja.y), 10, 2) # Color magenta para la pareja
+            pygame.draw.circle(self.screen, (255, 0, 255), (pareja.x - self.camara_x, pareja.y - self.camara_y), 10, 2) # Color magenta para la pareja
 
     def _draw_fallback_animal(self, animal):
         """Dibuja un círculo de color para un animal si su sprite no está disponible."""
         color = (0, 0, 0)  # Color por defecto
-        if isinstance(animal, Herbivoro): color = COLOR_HERBIVORO
-        elif isinstance(animal, Carnivoro): color = COLOR_CARNIVORO
-        elif isinstance(animal, Omnivoro): color = COLOR_OMNIVORO
-        pygame.draw.circle(self.screen, color, (int(animal.x), int(animal.y)), 7)
+        if animal.dieta == "herbivoro": color = COLOR_HERBIVORO
+        elif animal.dieta == "carnivoro": color = COLOR_CARNIVORO
+        elif animal.dieta == "omnivoro": color = COLOR_OMNIVORO
+        pygame.draw.circle(self.screen, color, (int(animal.x) - self.camara_x, int(animal.y) - self.camara_y), 7)
 
-    def _draw_ui(self, ecosistema, animal_seleccionado, pareja_seleccionada, sim_speed):
+    def _draw_ui(self, instantanea, sim_speed, sim_lagging=False):
         ui_x = SIM_WIDTH + 10
         ui_rect = pygame.Rect(SIM_WIDTH, 0, UI_WIDTH, SCREEN_HEIGHT)
         if self.ui_background_image:
@@ -334,19 +372,20 @@ class PygameView:
         else:
             pygame.draw.rect(self.screen, COLOR_BACKGROUND, ui_rect)
 
-        hora_str = str(ecosistema.hora_actual).zfill(2)
-        self._draw_text(f"DÍA: {ecosistema.dia_total} - {hora_str}:00", self.font_header, COLOR_TEXT, self.screen, ui_x, 5)
+        hora_str = str(instantanea.hora_actual).zfill(2)
+        self._draw_text(f"DÍA: {instantanea.dia_total} - {hora_str}:00", self.font_header, COLOR_TEXT, self.screen, ui_x, 5)
 
         y_offset = 40
-        self._draw_text(f"Clima: {ecosistema.clima_actual}", self.font_normal, COLOR_TEXT, self.screen, ui_x, y_offset)
+        self._draw_text(f"Clima: {instantanea.clima_actual}", self.font_normal, COLOR_TEXT, self.screen, ui_x, y_offset)
         
         y_offset = 105 # Aumentamos el offset para dejar espacio al nuevo botón
         self._draw_text("--- INFO GENERAL ---", self.font_normal, COLOR_TEXT, self.screen, ui_x, y_offset)
         y_offset += 25
+        animal_seleccionado = instantanea.seleccionado
         if animal_seleccionado:
             info = [
                 f"Nombre: {animal_seleccionado.nombre}",
-                f"Tipo: {animal_seleccionado.__class__.__name__}",
+                f"Tipo: {animal_seleccionado.especie}",
                 f"Energía: {animal_seleccionado.energia}/{animal_seleccionado.max_energia}",
                 f"Edad: {animal_seleccionado.edad} días"
             ]
@@ -358,25 +397,22 @@ class PygameView:
             # Dibujar botón de reproducción si hay un animal seleccionado
             self.buttons["force_reproduce"].draw(self.screen)
         else:
-            herb_count = sum(1 for a in ecosistema.animales if isinstance(a, Herbivoro))
-            carn_count = sum(1 for a in ecosistema.animales if isinstance(a, Carnivoro))
-            omni_count = sum(1 for a in ecosistema.animales if isinstance(a, Omnivoro))
-
-            self._draw_text(f"Herbívoros: {herb_count}", self.font_normal, COLOR_HERBIVORO, self.screen, ui_x, y_offset)
+            self._draw_text(f"Herbívoros: {instantanea.herbivoros}", self.font_normal, COLOR_HERBIVORO, self.screen, ui_x, y_offset)
             y_offset += 20
-            self._draw_text(f"Carnívoros: {carn_count}", self.font_normal, COLOR_CARNIVORO, self.screen, ui_x, y_offset)
+            self._draw_text(f"Carnívoros: {instantanea.carnivoros}", self.font_normal, COLOR_CARNIVORO, self.screen, ui_x, y_offset)
             y_offset += 20
-            self._draw_text(f"Omnívoros: {omni_count}", self.font_normal, COLOR_OMNIVORO, self.screen, ui_x, y_offset)
+            self._draw_text(f"Omnívoros: {instantanea.omnivoros}", self.font_normal, COLOR_OMNIVORO, self.screen, ui_x, y_offset)
             y_offset += 20
 
-            bayas_totales = sum(s.bayas for s in ecosistema.terreno["selvas"])
-            self._draw_text(f"Bayas: {bayas_totales}", self.font_normal, COLOR_TEXT, self.screen, ui_x, y_offset)
+            self._draw_text(f"Bayas: {instantanea.bayas}", self.font_normal, COLOR_TEXT, self.screen, ui_x, y_offset)
             y_offset += 20
-            peces_totales = sum(len(r.peces) for r in ecosistema.terreno["rios"])
+            peces_totales = len(instantanea.peces)
             self._draw_text(f"Peces: {peces_totales}", self.font_normal, COLOR_TEXT, self.screen, ui_x, y_offset)
             y_offset += 20
             speed_text = f"Velocidad: x{sim_speed}"
             self._draw_text(speed_text, self.font_normal, COLOR_TEXT, self.screen, ui_x, y_offset)
+            if sim_lagging:
+                self._draw_text("Simulación retrasada", self.font_normal, self.error_color, self.screen, ui_x + 130, y_offset)
             y_offset += 20
             self._draw_text("Haz clic en un animal", self.font_small, COLOR_TEXT, self.screen, ui_x, y_offset)
             y_offset += 15
@@ -399,13 +435,13 @@ class PygameView:
 
 
 
-    def _create_static_background(self, ecosistema):
+    def _create_static_background(self, terreno):
         """Crea la superficie de fondo con elementos que no cambian (terreno, decoraciones)."""
-        self._draw_terrenos_estaticos(ecosistema)
-        self._draw_decoraciones(ecosistema)
+        self._draw_terrenos_estaticos(terreno)
+        self._draw_decoraciones(terreno)
         self.needs_static_redraw = False
 
-    def _draw_terrenos_estaticos(self, ecosistema):
+    def _draw_terrenos_estaticos(self, terreno):
         """Dibuja las texturas de fondo y luego las áreas de terreno específicas."""
         # 1. Dibuja la textura de fondo general en toda la superficie de la simulación.
         fondo_texture = self.terrain_textures.get("fondo")
@@ -419,25 +455,25 @@ class PygameView:
         for terrain_name in terrain_types_to_draw:
             texture = self.terrain_textures.get(terrain_name[:-1]) # "praderas" -> "pradera"
             if texture:
-                for terreno_obj in ecosistema.terreno[terrain_name]:
-                    self._draw_tiled_texture(self.background_surface, texture, terreno_obj.rect)
+                for rect in terreno.zonas[terrain_name]:
+                    self._draw_tiled_texture(self.background_surface, texture, self._a_pantalla(rect))
 
-    def _draw_rios(self, ecosistema):
+    def _draw_rios(self, terreno):
         """Dibuja los ríos, actualizando la animación del agua."""
         self._update_water_animation()
-        for rio in ecosistema.terreno["rios"]:
+        for rect in terreno.zonas["rios"]:
             if self.agua_texturas:
-                self._draw_tiled_texture(self.screen, self.agua_texturas[self.agua_frame_actual], rio.rect)
+                self._draw_tiled_texture(self.screen, self.agua_texturas[self.agua_frame_actual], self._a_pantalla(rect))
             else:
-                pygame.draw.rect(self.screen, COLOR_RIO, rio.rect)
+                pygame.draw.rect(self.screen, COLOR_RIO, self._a_pantalla(rect))
 
-    def _draw_puentes(self, ecosistema):
+    def _draw_puentes(self, terreno):
         """Dibuja los puentes sobre el mapa."""
         sprite_puente_v = self.sprites.get("puente") # Textura para puentes verticales
         sprite_puente_h = self.sprites.get("puente_horizontal") # Textura para puentes horizontales
-        center_x = SIM_WIDTH // 2
+        center_x = terreno.ancho // 2
 
-        for x, y in ecosistema.terreno["puentes"]:
+        for x, y in terreno.puentes:
             # Si la coordenada X del puente es la del centro + 1, es el puente superior (horizontal).
             if x == center_x + 2 and sprite_puente_h:
                 sprite_a_usar = sprite_puente_h
@@ -447,22 +483,21 @@ class PygameView:
             else:
                 continue # Si no hay sprites, no dibujamos nada.
             
-            self.screen.blit(sprite_a_usar, (x - sprite_a_usar.get_width() // 2, y - sprite_a_usar.get_height() // 2))
+            x, y = x - self.camara_x, y - self.camara_y
+            if self._en_pantalla(x, y, margen=100):
+                self.screen.blit(sprite_a_usar, (x - sprite_a_usar.get_width() // 2, y - sprite_a_usar.get_height() // 2))
 
-    def _draw_decoraciones(self, ecosistema):
+    def _draw_decoraciones(self, terreno):
         """Dibuja elementos de decoración como árboles y plantas sobre el fondo estático."""
-        sprite_arbol = self.sprites.get("arbol")
-        if sprite_arbol:
-            for x, y in ecosistema.terreno["arboles"]:
-                self.background_surface.blit(sprite_arbol, (x - sprite_arbol.get_width()//2, y - sprite_arbol.get_height()//2))
-        sprite_planta = self.sprites.get("planta")
-        if sprite_planta:
-            for x, y in ecosistema.terreno["plantas"]:
-                self.background_surface.blit(sprite_planta, (x - sprite_planta.get_width()//2, y - sprite_planta.get_height()//2))
-        sprite_planta_2 = self.sprites.get("planta_2")
-        if sprite_planta_2:
-            for x, y in ecosistema.terreno["plantas_2"]:
-                self.background_surface.blit(sprite_planta_2, (x - sprite_planta_2.get_width()//2, y - sprite_planta_2.get_height()//2))
+        for clave, nombre_sprite in (("arboles", "arbol"), ("plantas", "planta"), ("plantas_2", "planta_2")):
+            sprite = self.sprites.get(nombre_sprite)
+            if not sprite:
+                continue
+            mitad_w, mitad_h = sprite.get_width() // 2, sprite.get_height() // 2
+            for x, y in terreno.decoraciones[clave]:
+                x, y = x - self.camara_x, y - self.camara_y
+                if self._en_pantalla(x, y, margen=max(mitad_w, mitad_h)):
+                    self.background_surface.blit(sprite, (x - mitad_w, y - mitad_h))
 
     def _draw_clouds(self):
         """Dibuja y actualiza las nubes."""
@@ -473,53 +508,64 @@ class PygameView:
             cloud.image.set_alpha(180) # Hacemos las nubes semitransparentes
             self.screen.blit(cloud.image, (cloud.x, cloud.y))
 
-    def _draw_recursos(self, ecosistema):
+    def _draw_recursos(self, instantanea):
         carcasa_sprite = self.sprites.get("carcasa")
-        for carcasa in ecosistema.recursos["carcasas"]:
-            alpha = max(0, 255 - carcasa.dias_descomposicion * 50)
+        for x, y, dias_descomposicion in instantanea.carcasas:
+            if not self._en_pantalla(x - self.camara_x, y - self.camara_y):
+                continue
+            alpha = max(0, 255 - dias_descomposicion * 50)
             if carcasa_sprite:
                 temp_sprite = carcasa_sprite.copy()
                 temp_sprite.set_alpha(alpha)
                 sprite_w, sprite_h = temp_sprite.get_size()
-                self.screen.blit(temp_sprite, (carcasa.x - sprite_w // 2, carcasa.y - sprite_h // 2))
+                self.screen.blit(temp_sprite, (x - self.camara_x - sprite_w // 2, y - self.camara_y - sprite_h // 2))
             else:
                 temp_surface = pygame.Surface((10, 10), pygame.SRCALPHA)
                 pygame.draw.circle(temp_surface, COLOR_CARCASA + (alpha,), (5, 5), 5)
-                self.screen.blit(temp_surface, (carcasa.x - 5, carcasa.y - 5))
+                self.screen.blit(temp_surface, (x - self.camara_x - 5, y - self.camara_y - 5))
 
-    def _draw_peces(self, ecosistema):
+    def _draw_peces(self, instantanea):
         """Dibuja los peces en los ríos."""
         pez_sprite = self.sprites.get("Pez")
-        for rio in ecosistema.terreno["rios"]:
-            for pez in rio.peces:
-                if pez_sprite:
-                    sprite_w, sprite_h = pez_sprite.get_size()
-                    self.screen.blit(pez_sprite, (pez.x - sprite_w // 2, pez.y - sprite_h // 2))
-                else:
-                    # Fallback a un círculo si no hay sprite
-                    pygame.draw.circle(self.screen, COLOR_PEZ, (pez.x, pez.y), 4)
-
-    def draw_simulation(self, ecosistema, sim_over, animal_seleccionado, pareja_seleccionada, sim_speed, is_autosaving=False):
+        for x, y in instantanea.peces:
+            x, y = x - self.camara_x, y - self.camara_y
+            if not self._en_pantalla(x, y):
+                continue
+            if pez_sprite:
+                sprite_w, sprite_h = pez_sprite.get_size()
+                self.screen.blit(pez_sprite, (x - sprite_w // 2, y - sprite_h // 2))
+            else:
+                # Fallback a un círculo si no hay sprite
+                pygame.draw.circle(self.screen, COLOR_PEZ, (x, y), 4)
+
+    def draw_simulation(self, instantanea, sim_over, sim_speed, is_autosaving=False, sim_lagging=False):
+        """
+        Dibuja un frame. Todo sale de la instantánea (también el terreno estático y los
+        animales seleccionados) para no leer un estado a medio actualizar cuando la
+        simulación corre en otro hilo.
+        """
+        terreno = instantanea.terreno
         self.screen.fill(COLOR_BACKGROUND)
+        self._ajustar_camara(terreno)
         
         if self.needs_static_redraw:
-            self._create_static_background(ecosistema)
+            self._create_static_background(terreno)
 
         self.screen.blit(self.background_surface, (0, 0))
-        self._draw_rios(ecosistema)
-        self._draw_peces(ecosistema) # Dibujar peces sobre el agua
-        self._draw_puentes(ecosistema)
+        self._draw_rios(terreno)
+        self._draw_peces(instantanea) # Dibujar peces sobre el agua
+        self._draw_puentes(terreno)
         self.screen.blit(self.hierba_surface, (0, 0))
-        self._draw_recursos(ecosistema)
+        self._draw_recursos(instantanea)
         
-        self._draw_animales(ecosistema, animal_seleccionado)
+        self._draw_animales(instantanea)
         self._draw_clouds() # Dibujamos las nubes aquí para que se superpongan a todo
-        self._draw_pareja_seleccionada(pareja_seleccionada)
-        self._draw_ui(ecosistema, animal_seleccionado, pareja_seleccionada, sim_speed)
+        self._draw_pareja_seleccionada(instantanea.pareja)
+        self._draw_ui(instantanea, sim_speed, sim_lagging)
         
         self._draw_text("ESC para salir", self.font_small, COLOR_TEXT, self.screen, 10, SCREEN_HEIGHT - 25)
         if self.mouse_pos and self.mouse_pos[0] < SIM_WIDTH:
-            coord_text = f"({self.mouse_pos[0]}, {self.mouse_pos[1]})"
+            coord_text = f"({self.mouse_pos[0] + self.camara_x}, {self.mouse_pos[1] + self.camara_y})"
             self._draw_text(coord_text, self.font_small, COLOR_TEXT, self.screen, 10, SCREEN_HEIGHT - 45)
         
         # Dibujar el icono de autoguardado al final para que se superponga a todo
@@ -714,7 +760,7 @@ class PygameView:
         except Exception as e:
             print(f"Error al alternar música: {e}")
 
-    def handle_event(self, event, ecosistema, animal_seleccionado):
+    def handle_event(self, event, instantanea, animal_seleccionado):
         """
         Procesa un evento de Pygame y lo traduce a un comando de alto nivel para el controlador.
         Devuelve un diccionario con el tipo de comando y datos adicionales si es necesario.
@@ -725,6 +771,22 @@ class PygameView:
         if event.type == pygame.KEYDOWN and event.key == pygame.K_m:
             return {"type": "toggle_music"}
 
+        if event.type == pygame.KEYDOWN and event.key in (pygame.K_PLUS, pygame.K_KP_PLUS, pygame.K_EQUALS):
+            return {"type": "speed_up"}
+
+        if event.type == pygame.KEYDOWN and event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            return {"type": "speed_down"}
+
+        if event.type == pygame.KEYDOWN and event.key in TECLAS_CAMARA:
+            # Flechas: mover la vista por un mundo mayor que la ventana
+            dx, dy = TECLAS_CAMARA[event.key]
+            self.camara_x += dx * PASO_CAMARA
+            self.camara_y += dy * PASO_CAMARA
+            if instantanea:
+                self._ajustar_camara(instantanea.terreno)
+            self.needs_static_redraw = True
+            return None
+
         if event.type == pygame.MOUSEMOTION:
             self.mouse_pos = event.pos
             return None # No es necesario notificar al controlador de cada movimiento
@@ -744,6 +806,6 @@ class PygameView:
 
             # 2. Si no es un botón, comprobar si se ha hecho clic en un animal en el área de simulación
             if pos[0] < SIM_WIDTH:
-                return {"type": "click_simulation_area", "pos": pos}
+                return {"type": "click_simulation_area", "pos": (pos[0] + self.camara_x, pos[1] + self.camara_y)}
 
         return None
@@ -0,0 +1,77 @@
+import numpy as np
+
+DIETAS = ("herbivoro", "carnivoro", "omnivoro")
+
+
+class Agregados:
+    """
+    Resúmenes de la población y los recursos para la interfaz, la gráfica, las
+    estadísticas y las partidas guardadas. Solo la energía media recorre los animales.
+
+    - Animales por especie y por dieta: se actualizan al registrar un animal
+      (nacer, añadirlo, cargarlo) y al notificar su muerte.
+    - Edad: se guarda el día de nacimiento de cada animal, así que la edad media
+      sale de la suma de esos días y no cambia al pasar de día.
+    - Hierba, peces y bayas: la hierba total la lleva RejillaHierba y los ríos y
+      selvas son unos pocos objetos fijos del mapa.
+    - Energía media: cambia cada hora en todos los animales, así que es una pasada
+      O(N) al pedirla; se guarda hasta la hora siguiente (una pasada por hora como mucho).
+    """
+    def __init__(self, ecosistema):
+        self._ecosistema = ecosistema
+        self.total = 0
+        self.por_especie = {}
+        self.por_dieta = dict.fromkeys(DIETAS, 0)
+        self._suma_nacimientos = 0 # Suma de los días de nacimiento de los animales vivos
+        self._energia = (None, None) # (hora, media)
+
+    def agregar(self, animal):
+        especie = type(animal).__name__
+        self._energia = (None, None)
+        self.total += 1
+        self.por_especie[especie] = self.por_especie.get(especie, 0) + 1
+        self.por_dieta[animal.DIETA] += 1
+        animal._dia_nacimiento = self._ecosistema.dia_total - animal.edad
+        self._suma_nacimientos += animal._dia_nacimiento
+
+    def quitar(self, animal):
+        especie = type(animal).__name__
+        self._energia = (None, None)
+        self.total -= 1
+        restantes = self.por_especie[especie] - 1
+        if restantes:
+            self.por_especie[especie] = restantes
+        else:
+            del self.por_especie[especie]
+        self.por_dieta[animal.DIETA] -= 1
+        self._suma_nacimientos -= animal._dia_nacimiento
+
+    def dietas(self):
+        """(herbívoros, carnívoros, omnívoros)."""
+        return tuple(self.por_dieta[dieta] for dieta in DIETAS)
+
+    def peces(self):
+        return sum(rio.num_peces for rio in self._ecosistema.terreno["rios"])
+
+    def bayas(self):
+        return sum(selva.bayas for selva in self._ecosistema.terreno["selvas"])
+
+    def hierba(self):
+        return self._ecosistema.hierba.total()
+
+    def edad_media(self):
+        if not self.total:
+            return 0.0
+        return self._ecosistema.dia_total - self._suma_nacimientos / self.total
+
+    def energia_media(self):
+        hora = self._ecosistema.hora_absoluta
+        if self._energia[0] != hora:
+            ecosistema = self._ecosistema
+            if ecosistema.almacen is not None:
+                energias = ecosistema.almacen.columnas["_energia"][:ecosistema.almacen.n]
+            else:
+                energias = np.fromiter((a.energia for a in ecosistema.animales), dtype=np.float64, count=len(ecosistema.animales))
+            energias = energias[energias > 0]
+            self._energia = (hora, float(energias.mean()) if len(energias) else 0.0)
+        return self._energia[1]
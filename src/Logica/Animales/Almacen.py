@@ -0,0 +1,205 @@
+import math
+import numpy as np
+
+from src.Logica.Animales.Comportamiento import Estado
+
+ESTADOS = list(Estado)
+CODIGOS_ESTADO = {estado: codigo for codigo, estado in enumerate(ESTADOS)}
+
+
+class CampoAlmacen:
+    """
+    Atributo de Animal que vive en el propio objeto o, si el animal está
+    registrado en un AlmacenAnimales, en la columna correspondiente del almacén.
+    """
+    def __set_name__(self, owner, nombre):
+        self.nombre = nombre
+
+    def __get__(self, obj, tipo=None):
+        if obj is None:
+            return self
+        if obj._almacen is None:
+            return obj.__dict__[self.nombre]
+        return obj._almacen.leer(self.nombre, obj._indice)
+
+    def __set__(self, obj, valor):
+        if obj._almacen is None:
+            obj.__dict__[self.nombre] = valor
+        else:
+            obj._almacen.escribir(self.nombre, obj._indice, valor)
+
+
+def _a_float_opcional(valor):
+    return math.nan if valor is None else float(valor)
+
+
+def _desde_float_opcional(valor):
+    return None if math.isnan(valor) else float(valor)
+
+
+class AlmacenAnimales:
+    """
+    Backend structure-of-arrays para los animales.
+    Posiciones, objetivos, velocidades, energía y temporizadores viven en arrays
+    contiguos; los objetos Animal quedan como vistas finas sobre su fila.
+    """
+    # nombre del atributo en Animal: (dtype, conversión al array, conversión desde el array)
+    COLUMNAS = {
+        "_x_float": (np.float64, float, float),
+        "_y_float": (np.float64, float, float),
+        "_energia": (np.float64, float, float),
+        "max_energia": (np.float64, float, float),
+        "velocidad": (np.float64, float, float),
+        "target_x": (np.float64, _a_float_opcional, _desde_float_opcional),
+        "target_y": (np.float64, _a_float_opcional, _desde_float_opcional),
+        "tiempo_deambulando": (np.int64, int, int),
+        "ticks_desde_ultimo_paso": (np.int64, int, int),
+        "modo_caza_activado": (np.bool_, bool, bool),
+    }
+
+    def __init__(self, capacidad=64):
+        self.n = 0
+        self.animales = []
+        self._capacidad = capacidad
+        self.columnas = {nombre: np.zeros(capacidad, dtype=dtype) for nombre, (dtype, _, _) in self.COLUMNAS.items()}
+        # El estado se guarda como código entero (posición en Estado)
+        self.columnas["estado"] = np.zeros(capacidad, dtype=np.int8)
+        # Umbrales de energía (fracción de max_energia) por debajo de los cuales el animal necesita decidir
+        self.columnas["umbral"] = np.zeros(capacidad, dtype=np.float64)
+        self.columnas["umbral_caza"] = np.zeros(capacidad, dtype=np.float64)
+
+    def leer(self, nombre, i):
+        if nombre == "estado":
+            return ESTADOS[self.columnas["estado"][i]]
+        return self.COLUMNAS[nombre][2](self.columnas[nombre][i])
+
+    def escribir(self, nombre, i, valor):
+        if nombre == "estado":
+            self.columnas["estado"][i] = CODIGOS_ESTADO[valor]
+        else:
+            self.columnas[nombre][i] = self.COLUMNAS[nombre][1](valor)
+
+    def _asegurar_capacidad(self, extra=1):
+        """Hace sitio para extra filas más (duplicando la capacidad las veces necesarias)."""
+        if self.n + extra <= self._capacidad:
+            return
+        while self._capacidad < self.n + extra:
+            self._capacidad *= 2
+        for nombre, arr in self.columnas.items():
+            nuevo = np.zeros(self._capacidad, dtype=arr.dtype)
+            nuevo[:self.n] = arr[:self.n]
+            self.columnas[nombre] = nuevo
+
+    def agregar(self, animal):
+        """Copia los atributos del animal al almacén y lo convierte en una vista sobre su fila."""
+        self._asegurar_capacidad()
+        i = self.n
+        for nombre in self.COLUMNAS:
+            self.escribir(nombre, i, animal.__dict__[nombre])
+        self.escribir("estado", i, animal.__dict__["estado"])
+        self.columnas["umbral"][i] = animal.UMBRAL_DECISION
+        self.columnas["umbral_caza"][i] = animal.UMBRAL_DECISION_CAZA
+        animal._almacen = self
+        animal._indice = i
+        self.animales.append(animal)
+        self.n += 1
+
+    def agregar_lote(self, animales):
+        """agregar() de varios animales a la vez: cada columna se rellena de una sola escritura."""
+        if not animales:
+            return
+        self._asegurar_capacidad(len(animales))
+        filas = slice(self.n, self.n + len(animales))
+        for nombre, (_, al_array, _) in self.COLUMNAS.items():
+            self.columnas[nombre][filas] = [al_array(animal.__dict__[nombre]) for animal in animales]
+        self.columnas["estado"][filas] = [CODIGOS_ESTADO[animal.__dict__["estado"]] for animal in animales]
+        self.columnas["umbral"][filas] = [animal.UMBRAL_DECISION for animal in animales]
+        self.columnas["umbral_caza"][filas] = [animal.UMBRAL_DECISION_CAZA for animal in animales]
+        for i, animal in enumerate(animales, self.n):
+            animal._almacen = self
+            animal._indice = i
+        self.animales.extend(animales)
+        self.n += len(animales)
+
+    def quitar(self, animal):
+        """Devuelve los valores al objeto y libera su fila moviendo la última a su lugar."""
+        i = animal._indice
+        for nombre in list(self.COLUMNAS) + ["estado"]:
+            animal.__dict__[nombre] = self.leer(nombre, i)
+        animal._almacen = None
+        animal._indice = -1
+
+        ultimo = self.n - 1
+        if i != ultimo:
+            for arr in self.columnas.values():
+                arr[i] = arr[ultimo]
+            movido = self.animales[ultimo]
+            self.animales[i] = movido
+            movido._indice = i
+        self.animales.pop()
+        self.n -= 1
+
+    def mascara_lote(self):
+        """Animales vivos, deambulando y saciados: su hora se resuelve sin lógica de decisión por objeto."""
+        deambulando, vivo, saciado = self._deambulando_vivo_saciado()
+        return deambulando & vivo & saciado
+
+    def mascara_decision(self):
+        """Animales vivos, deambulando y con hambre: los que tienen una decisión que tomar."""
+        deambulando, vivo, saciado = self._deambulando_vivo_saciado()
+        return deambulando & vivo & ~saciado
+
+    def _deambulando_vivo_saciado(self):
+        c = self.columnas
+        n = self.n
+        energia = c["_energia"][:n]
+        umbral = np.where(c["modo_caza_activado"][:n], c["umbral_caza"][:n], c["umbral"][:n])
+        deambulando = c["estado"][:n] == CODIGOS_ESTADO[Estado.DEAMBULANDO]
+        return deambulando, energia > 0, energia >= c["max_energia"][:n] * umbral
+
+    def vivos(self, indices):
+        return indices[self.columnas["_energia"][indices] > 0]
+
+    def deambular_lote(self, indices, min_x, max_x, min_y, max_y, tamano_celda):
+        """
+        Equivalente vectorizado de Animal.deambular para los índices dados.
+        Devuelve los índices de los animales que han cambiado de celda de tamano_celda píxeles.
+        """
+        if len(indices) == 0:
+            return indices
+        c = self.columnas
+        celda_x = c["_x_float"][indices] // tamano_celda
+        celda_y = c["_y_float"][indices] // tamano_celda
+
+        # Elegir un nuevo objetivo (poco frecuente) con la lógica del propio animal
+        necesita = np.isnan(c["target_x"][indices]) | (c["tiempo_deambulando"][indices] <= 0)
+        for i in indices[necesita]:
+            self.animales[i]._elegir_objetivo_deambulacion()
+
+        x, y = c["_x_float"][indices], c["_y_float"][indices]
+        tx, ty = c["target_x"][indices], c["target_y"][indices]
+        vel = c["velocidad"][indices]
+        dx = tx - x
+        dy = ty - y
+        dist = np.sqrt(dx**2 + dy**2)
+        llega = dist < vel
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x = np.where(llega, tx, x + (dx / dist) * vel)
+            y = np.where(llega, ty, y + (dy / dist) * vel)
+        c["target_x"][indices[llega]] = np.nan # Forzar nuevo objetivo
+
+        # Asegurarse de que el animal no se salga de los límites de la simulación
+        c["_x_float"][indices] = np.maximum(min_x, np.minimum(x, max_x))
+        c["_y_float"][indices] = np.maximum(min_y, np.minimum(y, max_y))
+
+        c["ticks_desde_ultimo_paso"][indices] += 1
+        for i in indices[c["ticks_desde_ultimo_paso"][indices] > 300]:
+            self.animales[i]._sonido_paso()
+
+        c["tiempo_deambulando"][indices] -= 1
+        cambia = (c["_x_float"][indices] // tamano_celda != celda_x) | (c["_y_float"][indices] // tamano_celda != celda_y)
+        return indices[cambia]
+
+    def consumir_energia_lote(self, indices, coste):
+        energia = self.columnas["_energia"]
+        energia[indices] = np.maximum(energia[indices] - coste, 0)
@@ -2,41 +2,102 @@ import math
 import random
 import pygame
 from abc import ABC, abstractmethod
+from typing import NamedTuple
 import src.Logica.SoundBank.SoundBank as Sb # Tipos will be defined in this file
-from src.Logica.Terrenos.Terrenos import Rio
+from src.Logica.Animales.Almacen import CampoAlmacen
+from src.Logica.Animales import Comportamiento as comportamiento
+from src.Logica.Animales.Comportamiento import Estado
+from src.Logica.Eventos import NACIMIENTO, MUERTE, DECISION
 
+# Tamaño por defecto del mundo y de las celdas; cada Ecosistema puede usar otros
 SIM_WIDTH = 800
 SCREEN_HEIGHT = 700
 CELL_SIZE = 20
 BORDE_MARGEN = 20 # Margen de seguridad para que los animales no se acerquen a los bordes
+TRAMO_MINIMO = 2 # Horas; los tramos más cortos se hacen hora a hora
+
+
+class Tramo(NamedTuple):
+    """Avance en línea recta de un animal que deambula (modo cinético del ecosistema)."""
+    x0: float
+    y0: float
+    paso_x: float # Avance por hora
+    paso_y: float
+    energia0: float
+    hora0: int # Primera hora del tramo
+    fin: int # Primera hora después del tramo: el animal vuelve a actualizarse
+
+    def pasos(self, hora):
+        """Horas del tramo hechas al terminar la hora dada."""
+        return min(hora, self.fin - 1) - self.hora0 + 1
+
+    def posicion(self, pasos):
+        return self.x0 + self.paso_x * pasos, self.y0 + self.paso_y * pasos
+
+    def siguiente_cruce(self, pasos, tamano_celda):
+        """Primer paso, después de pasos, en el que el animal cambia de celda de la rejilla."""
+        cruce = math.inf
+        for inicio, paso in zip(self.posicion(pasos), (self.paso_x, self.paso_y)):
+            borde = int(inicio) // tamano_celda * tamano_celda
+            if paso > 0:
+                cruce = min(cruce, pasos + math.ceil((borde + tamano_celda - inicio) / paso))
+            elif paso < 0:
+                cruce = min(cruce, pasos + int((inicio - borde) / -paso) + 1)
+        return cruce
+
 
 class Animal(ABC):
     contador = 0
-
-    def __init__(self, nombre: str, x: int, y: int, edad: int = 0, energia: int = 100, max_energia=None):
+    COSTE_ENERGIA_HORA = 0.05
+    # Fracción de max_energia por debajo de la cual el animal necesita tomar decisiones (sin/con modo caza)
+    UMBRAL_DECISION = 0.0
+    UMBRAL_DECISION_CAZA = 0.0
+
+    # Atributos que pueden vivir en un AlmacenAnimales (backend structure-of-arrays)
+    _almacen = None
+    _indice = -1
+    _region = None # Region del ecosistema en la que está (resumen por regiones)
+    _dia_nacimiento = None # Lo fija Ecosistema.agregados al registrar el animal; desde entonces la edad se calcula
+    DIETA = None # "herbivoro", "carnivoro" u "omnivoro"
+    _hora_actualizada = 0 # Última hora en la que se actualizó (regiones dormidas y tramos del modo cinético)
+    _fase_decision = None # Ver PlanificadorDecisiones
+    _decision_pendiente = False # Aplazada por el presupuesto de decisiones de la hora
+    _decision_urgente = False # Tiene que decidir sin esperar a su fase (p. ej. su presa ha muerto)
+    _x_float = CampoAlmacen()
+    _y_float = CampoAlmacen()
+    _energia = CampoAlmacen()
+    max_energia = CampoAlmacen()
+    velocidad = CampoAlmacen()
+    target_x = CampoAlmacen()
+    target_y = CampoAlmacen()
+    tiempo_deambulando = CampoAlmacen()
+    ticks_desde_ultimo_paso = CampoAlmacen()
+    modo_caza_activado = CampoAlmacen()
+    estado = CampoAlmacen()
+
+    def __init__(self, nombre: str, x: int, y: int, edad: int = 0, energia: int = 100, max_energia=None, rng=None):
         self._nombre = nombre
+        self.rng = rng if rng is not None else random # Generador aleatorio del ecosistema (o el global)
         self._x_float = float(x)
         self._y_float = float(y)
         self._edad = max(0, edad)
         if max_energia is None:
-            max_energia = max(80, min(120, 100 + random.randint(-10, 10)))
+            max_energia = max(80, min(120, 100 + self.rng.randint(-10, 10)))
         self.max_energia = max_energia
         self._energia = max(0, min(energia, self.max_energia))
         self._esta_vivo = True
-        self.estado = "deambulando" # Estados: deambulando, buscando_comida, buscando_agua, cazando, huyendo
+        self.estado = Estado.DEAMBULANDO # Ver Comportamiento.Estado
         self.objetivo = None  # Puede ser una tupla (x,y) o un objeto Animal
                 # === BEGIN AUDIO FIELDS ===
         self.sonidos = Sb.SoundBank.get_for(type(self).__name__)
         self._last_walk_tick = 0
         # === END AUDIO FIELDS ===
 
-        
-        self.estado = "deambulando"
-        self.velocidad = 1.5 + random.uniform(-0.2, 0.2)
+        self.velocidad = 1.5 + self.rng.uniform(-0.2, 0.2)
         self.target_x = None
         self.target_y = None
         self.tiempo_deambulando = 0
-        self.ticks_desde_ultimo_paso = random.randint(0, 300) # Inicialización aleatoria para desincronizar
+        self.ticks_desde_ultimo_paso = self.rng.randint(0, 300) # Inicialización aleatoria para desincronizar
         self.ecosistema = None
         self.pareja_objetivo = None
         self.objetivo_puente = None
@@ -44,6 +105,7 @@ class Animal(ABC):
         self.modo_caza_activado = False
         
         self.objetivo_comida = None # Puede ser un río, una carcasa, etc.
+        self._tramo = None # Tramo en curso (modo cinético): posición y energía se calculan al pedirlas
         type(self).contador = getattr(type(self), 'contador', 0) + 1
 
     @property
@@ -51,6 +113,8 @@ class Animal(ABC):
         return self._nombre
     def reproducir_sonido(self, tipo: int, volume: float = 1.0):
         """tipo: 1=aparece, 2=camina, 3=muere"""
+        if self.ecosistema is not None and not self.ecosistema.sonido_activo:
+            return
         if 1 <= tipo <= 3 and self.sonidos and pygame.mixer.get_init():
             snd = self.sonidos[tipo-1] if len(self.sonidos) >= tipo else None
             if snd:
@@ -65,18 +129,26 @@ class Animal(ABC):
 
     @property
     def x(self):
+        if self._tramo is not None:
+            return int(self._tramo.posicion(self._pasos_tramo())[0])
         return int(self._x_float)
 
     @property
     def y(self):
+        if self._tramo is not None:
+            return int(self._tramo.posicion(self._pasos_tramo())[1])
         return int(self._y_float)
 
     @property
     def edad(self):
-        return self._edad
+        if self._dia_nacimiento is None:
+            return self._edad
+        return self.ecosistema.dia_total - self._dia_nacimiento
 
     @property
     def energia(self):
+        if self._tramo is not None:
+            return self._tramo.energia0 - self.COSTE_ENERGIA_HORA * self._pasos_tramo()
         return self._energia
 
     @property
@@ -85,83 +157,165 @@ class Animal(ABC):
 
     def __str__(self):
         estado = "Vivo" if self.esta_vivo else "Muerto"
-        return f"Animal: {self._nombre}, Tipo: {self.__class__.__name__}, Edad: {self._edad}, Energía: {self._energia}, Estado: {estado}"
+        return f"Animal: {self._nombre}, Tipo: {self.__class__.__name__}, Edad: {self.edad}, Energía: {self.energia}, Estado: {estado}"
 
     def _obtener_zona_deambulacion(self):
-        """Devuelve el rectángulo (x, y, w, h) de la zona de deambulación."""
-        center_x = SIM_WIDTH // 2
-        center_y = SCREEN_HEIGHT // 2
-        thickness = 60
-        
-        rio_borde_izq = center_x - thickness // 2
-        rio_borde_der = center_x + thickness // 2
-        rio_borde_sup = center_y - thickness // 2
-
+        """Devuelve el rectángulo (x, y, w, h) de la zona de deambulación (calculadas por el ecosistema)."""
+        zonas = self.ecosistema.zonas_deambulacion
         if isinstance(self, Carnivoro) and not self.modo_caza_activado:
             # Cuadrante superior izquierdo
-            return (BORDE_MARGEN, BORDE_MARGEN, rio_borde_izq - BORDE_MARGEN * 2, rio_borde_sup - BORDE_MARGEN * 2)
+            return zonas["carnivoro"]
         elif isinstance(self, Herbivoro):
             # Cuadrante inferior (todo el ancho)
-            return (BORDE_MARGEN, rio_borde_sup + thickness, SIM_WIDTH - BORDE_MARGEN * 2, SCREEN_HEIGHT - (rio_borde_sup + thickness) - BORDE_MARGEN)
+            return zonas["herbivoro"]
         elif isinstance(self, Omnivoro):
             # Cuadrante superior derecho
-            return (rio_borde_der, BORDE_MARGEN, SIM_WIDTH - rio_borde_der - BORDE_MARGEN, rio_borde_sup - BORDE_MARGEN * 2)
-        return (BORDE_MARGEN, BORDE_MARGEN, SIM_WIDTH - 2 * BORDE_MARGEN, SCREEN_HEIGHT - 2 * BORDE_MARGEN)
+            return zonas["omnivoro"]
+        return zonas["todo"]
 
-    def deambular(self):
-        """Comportamiento de movimiento errático dentro de una zona."""
+    def _elegir_objetivo_deambulacion(self):
+        zona_x, zona_y, zona_w, zona_h = self._obtener_zona_deambulacion()
+        self.target_x = self.rng.randint(zona_x, zona_x + zona_w)
+        self.target_y = self.rng.randint(zona_y, zona_y + zona_h)
+        self.tiempo_deambulando = self.rng.randint(50, 150) # Ticks para deambular hacia el objetivo
+
+    def _sonido_paso(self):
+        self.reproducir_sonido(2, volume=0.3)  # Tipo 2 es el sonido de caminar
+        self.ticks_desde_ultimo_paso = self.rng.randint(-50, 50) # Reinicio aleatorio para mantener la desincronización
+
+    def deambular(self, pasos=1):
+        """Comportamiento de movimiento errático dentro de una zona (pasos > 1: varias horas de golpe)."""
         if self.target_x is None or self.tiempo_deambulando <= 0:
-            zona_x, zona_y, zona_w, zona_h = self._obtener_zona_deambulacion()
-            self.target_x = random.randint(zona_x, zona_x + zona_w)
-            self.target_y = random.randint(zona_y, zona_y + zona_h)
-            self.tiempo_deambulando = random.randint(50, 150) # Ticks para deambular hacia el objetivo
+            self._elegir_objetivo_deambulacion()
 
         dx = self.target_x - self._x_float
         dy = self.target_y - self._y_float
         dist = math.sqrt(dx**2 + dy**2)
+        avance = self.velocidad * pasos
 
-        if dist < self.velocidad:
+        if dist < avance:
             self._x_float = self.target_x
             self._y_float = self.target_y
             self.target_x = None # Forzar nuevo objetivo
         else:
-            self._x_float += (dx / dist) * self.velocidad
-            self._y_float += (dy / dist) * self.velocidad
+            self._x_float += (dx / dist) * avance
+            self._y_float += (dy / dist) * avance
 
         # Asegurarse de que el animal no se salga de los límites de la simulación
-        self._x_float = max(BORDE_MARGEN, min(self._x_float, SIM_WIDTH - BORDE_MARGEN))
-        self._y_float = max(BORDE_MARGEN, min(self._y_float, SCREEN_HEIGHT - BORDE_MARGEN))
+        self._x_float = max(BORDE_MARGEN, min(self._x_float, self.ecosistema.ancho - BORDE_MARGEN))
+        self._y_float = max(BORDE_MARGEN, min(self._y_float, self.ecosistema.alto - BORDE_MARGEN))
 
-        self.ticks_desde_ultimo_paso += 1
+        self.ticks_desde_ultimo_paso += pasos
         if self.ticks_desde_ultimo_paso > 300:  # 300 ticks = 5 segundos a 60 FPS
-            self.reproducir_sonido(2, volume=0.3)  # Tipo 2 es el sonido de caminar
-            self.ticks_desde_ultimo_paso = random.randint(-50, 50) # Reinicio aleatorio para mantener la desincronización
-
-
-        self.tiempo_deambulando -= 1
+            self._sonido_paso()
+
+
+        self.tiempo_deambulando -= pasos
+
+    def iniciar_tramo(self, hora):
+        """
+        Modo cinético: en lugar de dar un paso, anota un tramo con todas las horas
+        seguidas (empezando por esta) en las que el animal solo avanzaría en línea
+        recta hacia su objetivo: se detiene antes de llegar, de sonar un paso, de
+        necesitar decidir por hambre o de morir. Esas horas ya no hay que actualizarlo:
+        su posición y su energía se calculan al pedirlas (origen + horas × avance), y
+        los cambios de celda de la rejilla se programan en Ecosistema.cruces_tramos.
+        Como la posición no se acumula paso a paso, el redondeo no es el mismo que sin
+        el modo cinético. Devuelve False si el tramo sería demasiado corto. Llamar
+        solo si en_reposo().
+        """
+        if self.target_x is None or self.tiempo_deambulando <= 0:
+            return False
+        ecosistema = self.ecosistema
+        x0, y0 = self._x_float, self._y_float
+        if not (BORDE_MARGEN <= x0 <= ecosistema.ancho - BORDE_MARGEN and BORDE_MARGEN <= y0 <= ecosistema.alto - BORDE_MARGEN):
+            return False # Fuera de los márgenes: deambular() lo recoloca paso a paso
+        dx = self.target_x - x0
+        dy = self.target_y - y0
+        dist = math.sqrt(dx**2 + dy**2)
+        if dist < self.velocidad * TRAMO_MINIMO:
+            return False
+
+        umbral = self.UMBRAL_DECISION_CAZA if self.modo_caza_activado else self.UMBRAL_DECISION
+        coste = self.COSTE_ENERGIA_HORA
+        horas = min(
+            self.tiempo_deambulando,
+            int(dist / self.velocidad), # El paso que llega al objetivo se da fuera del tramo
+            300 - self.ticks_desde_ultimo_paso, # Idem con el que suena
+            int((self._energia - self.max_energia * umbral) / coste) + 1, # Y la primera hora con hambre
+            math.ceil(self._energia / coste) - 1, # Sin llegar a 0 de energía
+        )
+        if horas < TRAMO_MINIMO:
+            return False
+        tramo = Tramo(x0, y0, (dx / dist) * self.velocidad, (dy / dist) * self.velocidad, self._energia, hora, hora + horas)
+        self._tramo = tramo
+        self._programar_cruce(tramo, 0)
+        return True
+
+    def _programar_cruce(self, tramo, pasos):
+        """Programa la actualización de la rejilla para la hora del próximo cambio de celda del tramo."""
+        cruce = tramo.siguiente_cruce(pasos, self.ecosistema.tamano_celda)
+        if cruce <= tramo.fin - tramo.hora0:
+            self.ecosistema.cruces_tramos.programar(tramo.hora0 + cruce - 1, self._cruzar_celda, tramo, cruce)
+
+    def _cruzar_celda(self, tramo, pasos):
+        if self._tramo is not tramo:
+            return # El tramo ya se asentó
+        self.ecosistema.notificar_movimiento(self)
+        self._programar_cruce(tramo, pasos)
+
+    def _pasos_tramo(self):
+        """Horas del tramo en curso que ya ha hecho: la actual solo si ya le ha tocado en esta hora."""
+        hora = self.ecosistema.hora_absoluta
+        if self._hora_actualizada < hora:
+            hora -= 1
+        return self._tramo.pasos(hora)
+
+    def asentar_tramo(self):
+        """Escribe la posición, la energía y los contadores del tramo en curso y lo termina."""
+        tramo = self._tramo
+        if tramo is None:
+            return
+        pasos = self._pasos_tramo()
+        self._tramo = None
+        self._x_float, self._y_float = tramo.posicion(pasos)
+        self._energia = max(0, tramo.energia0 - self.COSTE_ENERGIA_HORA * pasos)
+        self.ticks_desde_ultimo_paso += pasos
+        self.tiempo_deambulando -= pasos
+        if self.esta_vivo:
+            self.ecosistema.notificar_movimiento(self) # Puede haber cambiado de celda desde el último cruce programado
+
+    def en_reposo(self):
+        """True si solo deambula saciado, sin decisiones pendientes (mismo criterio que AlmacenAnimales.mascara_lote)."""
+        umbral = self.UMBRAL_DECISION_CAZA if self.modo_caza_activado else self.UMBRAL_DECISION
+        return self.estado is Estado.DEAMBULANDO and self._energia >= self.max_energia * umbral
 
     def buscar_comida(self, forzado=False):
         """Método para iniciar la búsqueda de comida."""
         # Esta es una implementación básica. Se puede expandir en las subclases.
-        # Por ahora, simplemente cambia el estado para que la lógica en 'actualizar' se active.
+        # Por ahora, simplemente cambia el estado para que la lógica en Comportamiento se active.
         if forzado:
-            self.estado = "buscando_comida"
-            print(f"{self.nombre} forzado a buscar comida.")
+            self.asentar_tramo()
+            self.estado = Estado.BUSCANDO_COMIDA
+            self.ecosistema.eventos.emitir(DECISION, self.nombre, detalle="forzado a buscar comida")
 
     def buscar_pareja_para_reproducir(self, pareja_potencial):
         """Método para iniciar el comportamiento de reproducción con una pareja específica."""
         # Condiciones simplificadas: misma especie y ambos vivos.
         if self.esta_vivo and pareja_potencial.esta_vivo and type(self) == type(pareja_potencial):
-            print(f"Iniciando reproducción entre {self.nombre} y {pareja_potencial.nombre}.")
-            self.estado = "buscando_pareja"
+            self.ecosistema.eventos.emitir(DECISION, self.nombre, pareja_potencial.nombre, detalle=f"va a reproducirse con {pareja_potencial.nombre}")
+            self.asentar_tramo()
+            pareja_potencial.asentar_tramo()
+            self.estado = Estado.BUSCANDO_PAREJA
             self.pareja_objetivo = pareja_potencial
-            pareja_potencial.estado = "buscando_pareja"
+            pareja_potencial.estado = Estado.BUSCANDO_PAREJA
             pareja_potencial.pareja_objetivo = self
         else:
             print(f"No se puede reproducir: {self.nombre} y {pareja_potencial.nombre} no son de la misma especie.")
 
     def _dar_a_luz(self):
-        print(f"¡{self.nombre} ha dado a luz!")
+        pareja = self.pareja_objetivo.nombre if self.pareja_objetivo else None
+        self.ecosistema.eventos.emitir(NACIMIENTO, self.nombre, pareja)
         self.ecosistema.agregar_animal(type(self), es_cria=True, pos=(self.x, self.y))
 
     def actualizar(self, ecosistema):
@@ -170,211 +324,43 @@ class Animal(ABC):
 
         if self.ecosistema is None:
             self.ecosistema = ecosistema
-
-        # Lógica de comportamiento principal
-        if self.estado == "buscando_pareja":
-            if self.pareja_objetivo and self.pareja_objetivo.esta_vivo and self.pareja_objetivo.estado == "buscando_pareja":
-                # Moverse hacia la pareja
-                dx = self.pareja_objetivo.x - self._x_float
-                dy = self.pareja_objetivo.y - self._y_float
-                dist = math.sqrt(dx**2 + dy**2)
-
-                if dist < 10: # Umbral de cercanía para reproducirse
-                    # Reproducción instantánea
-                    print(f"¡{self.nombre} y {self.pareja_objetivo.nombre} se han encontrado y reproducido!")
-                    self._dar_a_luz()
-                    # self._energia -= 30 # Coste de energía por reproducirse (eliminado)
-                    
-                    # Ambos vuelven a deambular
-                    self.pareja_objetivo.estado = "deambulando"
-                    self.pareja_objetivo.pareja_objetivo = None
-                    self.estado = "deambulando"
-                    self.pareja_objetivo = None
-                    return # Terminar actualización de este tick tras reproducir
-                else:
-                    self._x_float += (dx / dist) * self.velocidad
-                    self._y_float += (dy / dist) * self.velocidad
-            else:
-                # La pareja ya no está disponible
-                self.estado = "deambulando"
-                self.pareja_objetivo = None
-        elif self.estado == "buscando_comida":
-            # Lógica para comer hierba si no es carnívoro
-            if not isinstance(self, Carnivoro):
-                grid_x = self.x // CELL_SIZE
-                grid_y = self.y // CELL_SIZE
-                
-                # Asegurarse de que las coordenadas están dentro de los límites del grid
-                if 0 <= grid_x < ecosistema.grid_width and 0 <= grid_y < ecosistema.grid_height:
-                    if ecosistema.grid_hierba[grid_x][grid_y] > 10:
-                        ecosistema.grid_hierba[grid_x][grid_y] -= 10
-                        self._energia = min(self.max_energia, self._energia + 15)
-                        print(f"{self.nombre} ha comido hierba.")
-                    else:
-                        print(f"{self.nombre} intentó comer, pero no hay suficiente hierba aquí.")
-                else:
-                    print(f"{self.nombre} está fuera de los límites del grid para comer.")
-            
-            # Después de intentar comer (o si es carnívoro), vuelve a deambular
-            self.estado = "deambulando"
-        elif self.estado == "cazando_pez":
-            if self.objetivo_comida and isinstance(self.objetivo_comida, Rio):
-                rio = self.objetivo_comida
-                # Moverse hacia el borde del río
-                target_x, target_y = rio.rect.centerx, rio.rect.centery # Simplificación: ir al centro
-                dx, dy = target_x - self._x_float, target_y - self._y_float
-                dist = math.sqrt(dx**2 + dy**2)
-
-                if dist < 40: # Si está cerca del río
-                    # Buscar un pez en el río
-                    pez_cercano = next((p for p in rio.peces if not p.fue_comido and math.sqrt((self.x - p.x)**2 + (self.y - p.y)**2) < 50), None)
-                    if pez_cercano:
-                        print(f"{self.nombre} ha cazado un pez!")
-                        pez_cercano.fue_comido = True
-                        self._energia = min(self.max_energia, self._energia + pez_cercano.energia)
-                        self.estado = "deambulando"
-                        self.objetivo_comida = None
-                    else: # No hay peces cerca, vuelve a deambular
-                        self.estado = "deambulando"
-                else: # Moverse hacia el río
-                    self._x_float += (dx / dist) * self.velocidad
-                    self._y_float += (dy / dist) * self.velocidad
-
-        elif self.estado == "yendo_a_cazar":
-            if self.objetivo_puente:
-                px, py = self.objetivo_puente
-                dx, dy = px - self._x_float, py - self._y_float
-                dist = math.sqrt(dx**2 + dy**2)
-                if dist < 10:
-                    # Ha llegado al puente, ahora puede empezar a cazar
-                    self.estado = "deambulando"
-                    self.puente_cruzado = self.objetivo_puente # Recuerda el puente que cruzó
-                    self.objetivo_puente = None
-                else:
-                    self._x_float += (dx / dist) * self.velocidad
-                    self._y_float += (dy / dist) * self.velocidad
-            else: # No se asignó puente, volver a deambular
-                self.estado = "deambulando"
-
-        elif self.estado == "regresando_de_cazar":
-            if self.objetivo_puente:
-                px, py = self.objetivo_puente
-                dx, dy = px - self._x_float, py - self._y_float
-                dist = math.sqrt(dx**2 + dy**2)
-                if dist < 10:
-                    # Ha llegado al puente, ahora puede regresar a su zona
-                    self.estado = "regresando_a_zona"
-                    self.puente_cruzado = None # Olvida el puente al regresar a su lado
-                    self.objetivo_puente = None
-                else:
-                    self._x_float += (dx / dist) * self.velocidad
-                    self._y_float += (dy / dist) * self.velocidad
-            else: # No se asignó puente, simplemente intentar regresar a la zona
-                self.estado = "regresando_a_zona"
-        
-        elif self.estado == "cazando_herbivoro":
-            if self.objetivo_comida and self.objetivo_comida.esta_vivo:
-                # Moverse hacia la presa
-                dx = self.objetivo_comida.x - self._x_float
-                dy = self.objetivo_comida.y - self._y_float
-                dist = math.sqrt(dx**2 + dy**2)
-
-                if dist < 10: # Si está cerca, ataca
-                    print(f"¡{self.nombre} ha cazado a {self.objetivo_comida.nombre}!")
-                    # La presa pierde energía, el cazador gana
-                    energia_ganada = self.objetivo_comida.energia * 0.8
-                    self.objetivo_comida._energia = 0 # La presa muere
-                    self._energia = min(self.max_energia, self._energia + energia_ganada)
-                    
-                    # Vuelve a deambular (en la zona de caza)
-                    self.estado = "deambulando"
-                    self.objetivo_comida = None
-                else:
-                    self._x_float += (dx / dist) * self.velocidad
-                    self._y_float += (dy / dist) * self.velocidad
-            else: # La presa murió o desapareció, buscar otra o deambular
-                self.estado = "deambulando"
-                self.objetivo_comida = None
-
-        elif self.estado == "regresando_a_zona":
-            zona_x, zona_y, zona_w, zona_h = self._obtener_zona_deambulacion()
-            if zona_x <= self.x < zona_x + zona_w and zona_y <= self.y < zona_y + zona_h:
-                # Ya está en su zona, vuelve a deambular normal
-                self.estado = "deambulando"
-            else:
-                self.deambular() # Usa deambular para moverse hacia su zona
-
-        elif self.estado == "deambulando":
-            self.deambular()
-
-        self._energia -= 0.05 # Coste base por hora
-        self._energia = max(0, self._energia)
-
-        if self._energia <= 0:
-            ecosistema.agregar_carcasa(self.x, self.y)
-            self.reproducir_sonido(3) #Reproducir sonido al morir
+        comportamiento.actualizar(self, ecosistema) # Decisión y acción según (DIETA, estado)
+
+    def actualizar_dormido(self, ecosistema, horas):
+        """
+        Actualización de un animal de una región dormida, que solo se actualiza cada
+        pocas horas: recupera de golpe las horas perdidas y después hace la actual.
+        """
+        perdidas = horas - 1
+        if perdidas > 0 and self.esta_vivo:
+            if self.estado is Estado.DEAMBULANDO:
+                self.deambular(pasos=perdidas)
+            self._energia = max(0, self._energia - self.COSTE_ENERGIA_HORA * perdidas)
+            if self._energia <= 0:
+                ecosistema.notificar_movimiento(self)
+                self._morir(ecosistema)
+                return
+        self.actualizar(ecosistema)
+
+    def _morir(self, ecosistema):
+        ecosistema.eventos.emitir(MUERTE, self.nombre, detalle="hambre")
+        ecosistema.notificar_muerte(self)
+        ecosistema.agregar_carcasa(self.x, self.y)
+        self.reproducir_sonido(3) #Reproducir sonido al morir
 
 # --- Tipos de Animales ---
 
 class Herbivoro(Animal):
-    def actualizar(self, ecosistema):
-        # Lógica de decisión para herbívoros
-        if self.estado == "deambulando" and self.energia < self.max_energia * 0.7:
-            # Si tiene hambre, busca comida (hierba)
-            self.estado = "buscando_comida"
-            # La lógica de 'actualizar' en la clase Animal se encargará de comer hierba.
-
-        # Ejecutar la lógica normal de Animal
-        super().actualizar(ecosistema)
+    DIETA = "herbivoro"
+    UMBRAL_DECISION = 0.7 # Por debajo busca hierba
+    UMBRAL_DECISION_CAZA = 0.7
 
 class Carnivoro(Animal):
-    def _buscar_presas(self, ecosistema):
-        """Lógica de búsqueda de presas para carnívoros y omnívoros."""
-        if self.modo_caza_activado and self.energia < self.max_energia * 0.8:
-            # Modo caza activado: buscar herbívoros cercanos
-            presas_cercanas = [
-                animal for animal in ecosistema.obtener_animales_cercanos(self.x, self.y, radio=15)
-                if isinstance(animal, Herbivoro)
-            ]
-            if presas_cercanas:
-                presa_elegida = random.choice(presas_cercanas)
-                print(f"{self.nombre} ha detectado a {presa_elegida.nombre} y va a cazarlo.")
-                self.estado = "cazando_herbivoro"
-                self.objetivo_comida = presa_elegida
-                return True # Presa encontrada
-
-        elif not self.modo_caza_activado and self.energia < self.max_energia * 0.5:
-            # Modo caza desactivado: buscar peces si tiene hambre
-            grid_x, grid_y = self.x // CELL_SIZE, self.y // CELL_SIZE
-            if (grid_x, grid_y) in ecosistema.terrain_cache["rio"]:
-                rio_cercano = ecosistema.terrain_cache["rio"][(grid_x, grid_y)]
-                if rio_cercano and any(not p.fue_comido for p in rio_cercano.peces):
-                    print(f"{self.nombre} tiene hambre y va a cazar peces al río.")
-                    self.estado = "cazando_pez"
-                    self.objetivo_comida = rio_cercano
-                    return True # Presa encontrada
-        return False # No se encontró presa
-
-    def actualizar(self, ecosistema):
-        # Lógica de decisión para carnívoros
-        if self.estado == "deambulando":
-            if self._buscar_presas(ecosistema):
-                # Si se encontró una presa, la lógica de estado de Animal se encargará del resto.
-                pass
-        
-        # Si no se tomó una decisión especial, ejecutar la lógica normal de Animal
-        super().actualizar(ecosistema)
+    DIETA = "carnivoro"
+    UMBRAL_DECISION = 0.5 # Por debajo va a pescar
+    UMBRAL_DECISION_CAZA = 0.8 # En modo caza, por debajo busca presas
 
 class Omnivoro(Animal):
-    def actualizar(self, ecosistema):
-        # Primero, intenta comportarse como un carnívoro
-        if self.estado == "deambulando":
-            # Llama a la lógica de búsqueda de presas refactorizada
-            Carnivoro._buscar_presas(self, ecosistema)
-
-        # Si después de la lógica de caza sigue deambulando y tiene hambre, busca hierba.
-        if self.estado == "deambulando" and self.energia < self.max_energia * 0.7:
-            self.estado = "buscando_comida"
-
-        # Ejecutar la lógica de estado principal de la clase Animal (movimiento, comer hierba, etc.)
-        super().actualizar(ecosistema)
\ No newline at end of file
+    DIETA = "omnivoro"
+    UMBRAL_DECISION = 0.7 # Por debajo busca presas o hierba
+    UMBRAL_DECISION_CAZA = 0.8
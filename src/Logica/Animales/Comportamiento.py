@@ -0,0 +1,309 @@
+"""
+Máquina de estados del comportamiento de los animales.
+
+Los estados son miembros de Estado: se comparan por identidad y siguen siendo
+iguales a su texto, así que las partidas guardadas y la interfaz no cambian. Cada
+hora un animal vivo hace, según su (dieta, estado):
+
+1. La decisión, si la tiene (solo los que deambulan: comer, cazar, pescar...) y
+   el planificador del ecosistema, si hay uno, le deja decidir en esta hora.
+2. La acción del estado en el que haya quedado (moverse, comer, reproducirse...).
+3. El coste de energía de la hora; si se queda sin energía, muere.
+
+Las tablas DECISIONES y ACCIONES sustituyen a la cadena de if/elif sobre textos.
+Los animales se pueden actualizar de uno en uno (actualizar) o agrupados por
+(dieta, estado) con agrupar_por_estado y actualizar_grupo, para tratar aparte a
+la mayoría que deambula y a los pocos que están en los demás estados.
+"""
+import math
+from enum import Enum
+
+from src.Logica.Agregados import DIETAS
+from src.Logica.Terrenos.Terrenos import Rio
+from src.Logica.Eventos import COMIO_HIERBA, SIN_HIERBA, CAZA, PEZ_CAPTURADO, MUERTE, DECISION
+
+
+class Estado(str, Enum):
+    DEAMBULANDO = "deambulando"
+    BUSCANDO_PAREJA = "buscando_pareja"
+    BUSCANDO_COMIDA = "buscando_comida"
+    CAZANDO_PEZ = "cazando_pez"
+    YENDO_A_CAZAR = "yendo_a_cazar"
+    REGRESANDO_DE_CAZAR = "regresando_de_cazar"
+    CAZANDO_HERBIVORO = "cazando_herbivoro"
+    REGRESANDO_A_ZONA = "regresando_a_zona"
+
+    # Mismo hash y texto que el valor: los diccionarios aceptan el miembro o el texto
+    __hash__ = str.__hash__
+    __str__ = str.__str__
+
+    @classmethod
+    def desde_texto(cls, texto):
+        """Estado de una partida guardada; los desconocidos vuelven a deambular."""
+        try:
+            return cls(texto)
+        except ValueError:
+            print(f"Estado desconocido '{texto}', el animal vuelve a deambular.")
+            return cls.DEAMBULANDO
+
+
+def _avanzar(animal, dx, dy, dist):
+    """Un paso de velocidad del animal en la dirección (dx, dy) de longitud dist."""
+    animal._x_float += (dx / dist) * animal.velocidad
+    animal._y_float += (dy / dist) * animal.velocidad
+
+
+# --- Decisiones (solo al deambular) ---
+
+def buscar_presas(animal, ecosistema):
+    """Búsqueda de presas de carnívoros y omnívoros; devuelve True si ha elegido una."""
+    if animal.modo_caza_activado and animal.energia < animal.max_energia * 0.8:
+        # Modo caza activado: elegir entre los herbívoros más cercanos (búsqueda por anillos)
+        presas_cercanas = ecosistema.buscar_presas(animal.x, animal.y, radio=15, k=8)
+        if presas_cercanas:
+            presa_elegida = animal.rng.choice(presas_cercanas)
+            ecosistema.eventos.emitir(DECISION, animal.nombre, presa_elegida.nombre, detalle=f"ha detectado a {presa_elegida.nombre} y va a cazarlo")
+            animal.estado = Estado.CAZANDO_HERBIVORO
+            animal.objetivo_comida = presa_elegida
+            return True
+
+    elif not animal.modo_caza_activado and animal.energia < animal.max_energia * 0.5:
+        # Modo caza desactivado: buscar peces si tiene hambre
+        grid_x, grid_y = animal.x // ecosistema.tamano_celda, animal.y // ecosistema.tamano_celda
+        rio_cercano = ecosistema.rio_cercano(grid_x, grid_y)
+        if rio_cercano and rio_cercano.num_peces > 0:
+            ecosistema.eventos.emitir(DECISION, animal.nombre, detalle="tiene hambre y va a cazar peces al río")
+            animal.estado = Estado.CAZANDO_PEZ
+            animal.objetivo_comida = rio_cercano
+            return True
+    return False
+
+
+def _decidir_herbivoro(animal, ecosistema):
+    if animal.energia < animal.max_energia * 0.7:
+        animal.estado = Estado.BUSCANDO_COMIDA
+
+
+def _decidir_omnivoro(animal, ecosistema):
+    # Primero como un carnívoro; si no ha elegido presa y tiene hambre, busca hierba
+    if not buscar_presas(animal, ecosistema) and animal.energia < animal.max_energia * 0.7:
+        animal.estado = Estado.BUSCANDO_COMIDA
+
+
+# --- Acciones de cada estado (True: la hora del animal termina aquí) ---
+
+def _deambulando(animal, ecosistema):
+    animal.deambular()
+
+
+def _buscando_pareja(animal, ecosistema):
+    pareja = animal.pareja_objetivo
+    if pareja and pareja.esta_vivo and pareja.estado is Estado.BUSCANDO_PAREJA:
+        dx = pareja.x - animal._x_float
+        dy = pareja.y - animal._y_float
+        dist = math.sqrt(dx**2 + dy**2)
+
+        if dist < 10: # Umbral de cercanía para reproducirse
+            animal._dar_a_luz()
+            # Ambos vuelven a deambular
+            pareja.estado = Estado.DEAMBULANDO
+            pareja.pareja_objetivo = None
+            animal.estado = Estado.DEAMBULANDO
+            animal.pareja_objetivo = None
+            return True
+        _avanzar(animal, dx, dy, dist)
+    else:
+        # La pareja ya no está disponible
+        animal.estado = Estado.DEAMBULANDO
+        animal.pareja_objetivo = None
+
+
+def _comiendo_hierba(animal, ecosistema):
+    grid_x = animal.x // ecosistema.tamano_celda
+    grid_y = animal.y // ecosistema.tamano_celda
+    if 0 <= grid_x < ecosistema.grid_width and 0 <= grid_y < ecosistema.grid_height:
+        if ecosistema.comer_hierba(grid_x, grid_y, 10):
+            animal._energia = min(animal.max_energia, animal._energia + 15)
+            ecosistema.eventos.emitir(COMIO_HIERBA, animal.nombre)
+        else:
+            ecosistema.eventos.emitir(SIN_HIERBA, animal.nombre)
+    else:
+        ecosistema.eventos.emitir(SIN_HIERBA, animal.nombre, detalle="fuera de la rejilla")
+    animal.estado = Estado.DEAMBULANDO
+
+
+def _sin_hierba(animal, ecosistema):
+    # Los carnívoros no comen hierba: vuelven a deambular
+    animal.estado = Estado.DEAMBULANDO
+
+
+def _cazando_pez(animal, ecosistema):
+    rio = animal.objetivo_comida
+    if not isinstance(rio, Rio):
+        return
+    target_x, target_y = rio.rect.centerx, rio.rect.centery # Simplificación: ir al centro
+    dx, dy = target_x - animal._x_float, target_y - animal._y_float
+    dist = math.sqrt(dx**2 + dy**2)
+
+    if dist < 40: # Si está cerca del río, busca un pez
+        pez_cercano = rio.pez_cercano(animal.x, animal.y, radio=50)
+        if pez_cercano is not None:
+            ecosistema.eventos.emitir(PEZ_CAPTURADO, animal.nombre)
+            animal._energia = min(animal.max_energia, animal._energia + rio.comer_pez(pez_cercano))
+            animal.objetivo_comida = None
+        animal.estado = Estado.DEAMBULANDO
+    else:
+        _avanzar(animal, dx, dy, dist)
+
+
+def _yendo_a_cazar(animal, ecosistema):
+    if not animal.objetivo_puente: # No se asignó puente, volver a deambular
+        animal.estado = Estado.DEAMBULANDO
+        return
+    px, py = animal.objetivo_puente
+    dx, dy = px - animal._x_float, py - animal._y_float
+    dist = math.sqrt(dx**2 + dy**2)
+    if dist < 10:
+        # Ha llegado al puente, ahora puede empezar a cazar
+        animal.estado = Estado.DEAMBULANDO
+        animal.puente_cruzado = animal.objetivo_puente # Recuerda el puente que cruzó
+        animal.objetivo_puente = None
+    else:
+        _avanzar(animal, dx, dy, dist)
+
+
+def _regresando_de_cazar(animal, ecosistema):
+    if not animal.objetivo_puente: # Sin puente, intentar regresar a la zona directamente
+        animal.estado = Estado.REGRESANDO_A_ZONA
+        return
+    px, py = animal.objetivo_puente
+    dx, dy = px - animal._x_float, py - animal._y_float
+    dist = math.sqrt(dx**2 + dy**2)
+    if dist < 10:
+        # Ha llegado al puente, ahora puede regresar a su zona
+        animal.estado = Estado.REGRESANDO_A_ZONA
+        animal.puente_cruzado = None
+        animal.objetivo_puente = None
+    else:
+        _avanzar(animal, dx, dy, dist)
+
+
+def _cazando_herbivoro(animal, ecosistema):
+    presa = animal.objetivo_comida
+    if presa:
+        presa.asentar_tramo() # Se va a cambiar su energía
+    if not (presa and presa.esta_vivo): # La presa murió o desapareció
+        animal.estado = Estado.DEAMBULANDO
+        animal.objetivo_comida = None
+        animal._decision_urgente = True # Que elija otra cosa sin esperar a su fase
+        return
+    dx = presa.x - animal._x_float
+    dy = presa.y - animal._y_float
+    dist = math.sqrt(dx**2 + dy**2)
+
+    if dist < 10: # Si está cerca, ataca
+        ecosistema.eventos.emitir(CAZA, animal.nombre, presa.nombre)
+        ecosistema.eventos.emitir(MUERTE, presa.nombre, animal.nombre, detalle="cazado")
+        # La presa muere y el cazador gana parte de su energía
+        energia_ganada = presa.energia * 0.8
+        presa._energia = 0
+        ecosistema.notificar_muerte(presa)
+        animal._energia = min(animal.max_energia, animal._energia + energia_ganada)
+        # Vuelve a deambular (en la zona de caza)
+        animal.estado = Estado.DEAMBULANDO
+        animal.objetivo_comida = None
+    else:
+        _avanzar(animal, dx, dy, dist)
+
+
+def _regresando_a_zona(animal, ecosistema):
+    zona_x, zona_y, zona_w, zona_h = animal._obtener_zona_deambulacion()
+    if zona_x <= animal.x < zona_x + zona_w and zona_y <= animal.y < zona_y + zona_h:
+        animal.estado = Estado.DEAMBULANDO # Ya está en su zona
+    else:
+        animal.deambular() # Usa deambular para moverse hacia su zona
+
+
+_ACCIONES_COMUNES = {
+    Estado.DEAMBULANDO: _deambulando,
+    Estado.BUSCANDO_PAREJA: _buscando_pareja,
+    Estado.BUSCANDO_COMIDA: _comiendo_hierba,
+    Estado.CAZANDO_PEZ: _cazando_pez,
+    Estado.YENDO_A_CAZAR: _yendo_a_cazar,
+    Estado.REGRESANDO_DE_CAZAR: _regresando_de_cazar,
+    Estado.CAZANDO_HERBIVORO: _cazando_herbivoro,
+    Estado.REGRESANDO_A_ZONA: _regresando_a_zona,
+}
+
+# (dieta, estado) -> función(animal, ecosistema)
+ACCIONES = {(dieta, estado): accion for dieta in DIETAS for estado, accion in _ACCIONES_COMUNES.items()}
+ACCIONES["carnivoro", Estado.BUSCANDO_COMIDA] = _sin_hierba
+
+DECISIONES = {
+    ("herbivoro", Estado.DEAMBULANDO): _decidir_herbivoro,
+    ("carnivoro", Estado.DEAMBULANDO): buscar_presas,
+    ("omnivoro", Estado.DEAMBULANDO): _decidir_omnivoro,
+}
+
+
+# --- Motor ---
+
+def _terminar_hora(animal, ecosistema):
+    animal._energia = max(0, animal._energia - animal.COSTE_ENERGIA_HORA) # Coste base por hora
+    ecosistema.notificar_movimiento(animal)
+    if animal._energia <= 0:
+        animal._morir(ecosistema)
+
+
+def _actualizar_con(animal, ecosistema, decision, accion):
+    if decision is not None:
+        estado = animal.estado
+        decision(animal, ecosistema)
+        if animal.estado is not estado:
+            accion = ACCIONES.get((animal.DIETA, animal.estado))
+    if accion is None or not accion(animal, ecosistema):
+        _terminar_hora(animal, ecosistema)
+
+
+def _permitida(decision, animal, ecosistema):
+    """La decisión, o None si el planificador del ecosistema no deja decidir al animal en esta hora."""
+    planificador = ecosistema.planificador
+    if decision is None or planificador is None or planificador.puede_decidir(animal):
+        return decision
+    return None
+
+
+def actualizar(animal, ecosistema):
+    """Hora completa de un animal vivo."""
+    clave = (animal.DIETA, animal.estado)
+    _actualizar_con(animal, ecosistema, _permitida(DECISIONES.get(clave), animal, ecosistema), ACCIONES.get(clave))
+
+
+def agrupar_por_estado(animales):
+    """{(dieta, estado): [animales]}, en el orden en que aparece cada grupo."""
+    grupos = {}
+    for animal in animales:
+        clave = (animal.DIETA, animal.estado)
+        grupo = grupos.get(clave)
+        if grupo is None:
+            grupos[clave] = [animal]
+        else:
+            grupo.append(animal)
+    return grupos
+
+
+def actualizar_grupo(clave, animales, ecosistema):
+    """
+    Hora de un grupo de agrupar_por_estado con una sola consulta a las tablas. Los
+    que han muerto o cambiado de estado desde que se agruparon (una presa cazada, la
+    pareja de uno que se acaba de reproducir) siguen el camino de uno en uno.
+    """
+    decision, accion = DECISIONES.get(clave), ACCIONES.get(clave)
+    estado = clave[1]
+    for animal in animales:
+        if not animal.esta_vivo:
+            continue
+        if animal.estado is estado:
+            _actualizar_con(animal, ecosistema, _permitida(decision, animal, ecosistema), accion)
+        else:
+            actualizar(animal, ecosistema)
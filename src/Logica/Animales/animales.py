@@ -6,61 +6,65 @@ from src.Logica.Animales.Animal import Herbivoro, Carnivoro, Omnivoro
 
 
 class Conejo(Herbivoro):
-    def __init__(self, nombre: str, x: int, y: int, edad: int = 0, energia: int = 100, max_energia=None):
+    def __init__(self, nombre: str, x: int, y: int, edad: int = 0, energia: int = 100, max_energia=None, rng=None):
         if max_energia is None:
-            max_energia = max(70, min(90, 80 + random.randint(-5, 5)))
-        super().__init__(nombre, x, y, edad, energia, max_energia)
+            max_energia = max(70, min(90, 80 + (rng or random).randint(-5, 5)))
+        super().__init__(nombre, x, y, edad, energia, max_energia, rng)
 
 class Cabra(Herbivoro):
-    def __init__(self, nombre: str, x: int, y: int, edad: int = 0, energia: int = 100, max_energia=None):
+    def __init__(self, nombre: str, x: int, y: int, edad: int = 0, energia: int = 100, max_energia=None, rng=None):
         if max_energia is None:
-            max_energia = max(90, min(110, 100 + random.randint(-5, 5)))
-        super().__init__(nombre, x, y, edad, energia, max_energia)
+            max_energia = max(90, min(110, 100 + (rng or random).randint(-5, 5)))
+        super().__init__(nombre, x, y, edad, energia, max_energia, rng)
         
 class Raton(Herbivoro):
-    def __init__(self, nombre: str, x: int, y: int, edad: int = 0, energia: int = 100, max_energia=None):
+    def __init__(self, nombre: str, x: int, y: int, edad: int = 0, energia: int = 100, max_energia=None, rng=None):
         if max_energia is None:
-            max_energia = max(30, min(50, 40 + random.randint(-5, 5)))
-        super().__init__(nombre, x, y, edad, energia, max_energia)
+            max_energia = max(30, min(50, 40 + (rng or random).randint(-5, 5)))
+        super().__init__(nombre, x, y, edad, energia, max_energia, rng)
 
 class Insecto(Herbivoro):
-    def __init__(self, nombre: str, x: int, y: int, edad: int = 0, energia: int = 100, max_energia=None):
+    _sonido_grillo = None # Se carga una sola vez y lo comparten todos los insectos
+
+    def __init__(self, nombre: str, x: int, y: int, edad: int = 0, energia: int = 100, max_energia=None, rng=None):
         if max_energia is None:
-            max_energia = max(30, min(50, 40 + random.randint(-5, 5)))
-        super().__init__(nombre, x, y, edad, energia, max_energia)
-        # Cargar el sonido del grillo
-        self.sonido_grillo = pygame.mixer.Sound("Sounds/grillo 1.wav")
+            max_energia = max(30, min(50, 40 + (rng or random).randint(-5, 5)))
+        super().__init__(nombre, x, y, edad, energia, max_energia, rng)
+        # Cargar el sonido del grillo (sin mixer, por ejemplo en un servidor sin audio, no hay sonido)
+        if Insecto._sonido_grillo is None and pygame.mixer.get_init():
+            Insecto._sonido_grillo = pygame.mixer.Sound("Sounds/grillo 1.wav")
+        self.sonido_grillo = Insecto._sonido_grillo
         self.sonidos = [self.sonido_grillo, self.sonido_grillo, self.sonido_grillo] # 1:aparece, 2:camina, 3:muere
 
     # No es necesario sobreescribir reproducir_sonido, usamos el de la clase Animal base
     # que ya funciona con la lista self.sonidos.
 
 class Leopardo(Carnivoro):
-    def __init__(self, nombre: str, x: int, y: int, edad: int = 0, energia: int = 100, max_energia=None):
+    def __init__(self, nombre: str, x: int, y: int, edad: int = 0, energia: int = 100, max_energia=None, rng=None):
         if max_energia is None:
-            max_energia = max(100, min(120, 110 + random.randint(-5, 5)))
-        super().__init__(nombre, x, y, edad, energia, max_energia)
+            max_energia = max(100, min(120, 110 + (rng or random).randint(-5, 5)))
+        super().__init__(nombre, x, y, edad, energia, max_energia, rng)
 
 class Gato(Carnivoro):
-    def __init__(self, nombre: str, x: int, y: int, edad: int = 0, energia: int = 100, max_energia=None):
+    def __init__(self, nombre: str, x: int, y: int, edad: int = 0, energia: int = 100, max_energia=None, rng=None):
         if max_energia is None:
-            max_energia = max(75, min(95, 85 + random.randint(-5, 5)))
-        super().__init__(nombre, x, y, edad, energia, max_energia)
+            max_energia = max(75, min(95, 85 + (rng or random).randint(-5, 5)))
+        super().__init__(nombre, x, y, edad, energia, max_energia, rng)
         
 class Halcon(Carnivoro):
-    def __init__(self, nombre: str, x: int, y: int, edad: int = 0, energia: int = 100, max_energia=None):
+    def __init__(self, nombre: str, x: int, y: int, edad: int = 0, energia: int = 100, max_energia=None, rng=None):
         if max_energia is None:
-            max_energia = max(70, min(90, 80 + random.randint(-5, 5)))
-        super().__init__(nombre, x, y, edad, energia, max_energia)
+            max_energia = max(70, min(90, 80 + (rng or random).randint(-5, 5)))
+        super().__init__(nombre, x, y, edad, energia, max_energia, rng)
         
 class Cerdo(Omnivoro):
-    def __init__(self, nombre: str, x: int, y: int, edad: int = 0, energia: int = 100, max_energia=None):
+    def __init__(self, nombre: str, x: int, y: int, edad: int = 0, energia: int = 100, max_energia=None, rng=None):
         if max_energia is None:
-            max_energia = max(110, min(130, 120 + random.randint(-5, 5)))
-        super().__init__(nombre, x, y, edad, energia, max_energia)
+            max_energia = max(110, min(130, 120 + (rng or random).randint(-5, 5)))
+        super().__init__(nombre, x, y, edad, energia, max_energia, rng)
         
 class Mono(Omnivoro):
-    def __init__(self, nombre: str, x: int, y: int, edad: int = 0, energia: int = 100, max_energia=None):
+    def __init__(self, nombre: str, x: int, y: int, edad: int = 0, energia: int = 100, max_energia=None, rng=None):
         if max_energia is None:
-            max_energia = max(80, min(100, 90 + random.randint(-5, 5)))
-        super().__init__(nombre, x, y, edad, energia, max_energia)
\ No newline at end of file
+            max_energia = max(80, min(100, 90 + (rng or random).randint(-5, 5)))
+        super().__init__(nombre, x, y, edad, energia, max_energia, rng)
\ No newline at end of file
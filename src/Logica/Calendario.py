@@ -0,0 +1,29 @@
+import heapq
+import itertools
+
+
+class Calendario:
+    """
+    Eventos programados por hora absoluta de simulación (cola de prioridad).
+
+    Lo que tiene que pasar a una hora conocida (que una carcasa desaparezca, que los
+    recursos crezcan al empezar el día) se programa una vez y se ejecuta cuando llega
+    esa hora, en lugar de recorrer cada día todo lo que podría tocar. Los eventos de
+    una misma hora se ejecutan en el orden en que se programaron.
+    """
+    def __init__(self):
+        self._cola = [] # (hora, orden de programación, acción, argumentos)
+        self._orden = itertools.count()
+
+    def __len__(self):
+        return len(self._cola)
+
+    def programar(self, hora, accion, *args):
+        heapq.heappush(self._cola, (hora, next(self._orden), accion, args))
+
+    def ejecutar_hasta(self, hora):
+        """Ejecuta los eventos programados hasta la hora dada (incluida)."""
+        cola = self._cola
+        while cola and cola[0][0] <= hora:
+            _, _, accion, args = heapq.heappop(cola)
+            accion(*args)
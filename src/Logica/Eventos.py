@@ -0,0 +1,86 @@
+"""
+Registro estructurado de lo que pasa en la simulación (comer, cazar, nacer, morir...).
+
+Sustituye a los print() de la lógica, que con miles de animales se llevaban buena
+parte del tiempo de cada hora. Cada evento suma uno al contador de su tipo y, según
+el nivel de ese tipo, se guarda en un anillo en memoria con los más recientes, se
+escribe en un archivo JSON Lines con buffer y se muestra en la consola. Por defecto
+no se muestra nada: se cuentan y se guardan en memoria.
+"""
+import collections
+import json
+from typing import NamedTuple
+
+# Tipos de evento
+COMIO_HIERBA = "comio_hierba"
+SIN_HIERBA = "sin_hierba"
+CAZA = "caza"
+PEZ_CAPTURADO = "pez_capturado"
+NACIMIENTO = "nacimiento"
+MUERTE = "muerte"
+DECISION = "decision" # Va a cazar o a pescar, busca pareja, entra o sale del modo caza...
+TIPOS_EVENTO = (COMIO_HIERBA, SIN_HIERBA, CAZA, PEZ_CAPTURADO, NACIMIENTO, MUERTE, DECISION)
+
+# Niveles de detalle (por tipo)
+SOLO_CONTAR = 0
+GUARDAR = 1 # Contar, guardar en el anillo y en el archivo si hay uno abierto
+MOSTRAR = 2 # Además, escribir el mensaje en la consola
+
+MENSAJES = {
+    COMIO_HIERBA: "{animal} ha comido hierba.",
+    SIN_HIERBA: "{animal} intentó comer, pero no hay suficiente hierba aquí.",
+    CAZA: "¡{animal} ha cazado a {otro}!",
+    PEZ_CAPTURADO: "{animal} ha cazado un pez!",
+    NACIMIENTO: "¡{animal} y {otro} se han reproducido y ha nacido una cría!",
+    MUERTE: "{animal} ha muerto ({detalle}).",
+    DECISION: "{animal} {detalle}.",
+}
+
+
+class Evento(NamedTuple):
+    hora: int # Hora absoluta de la simulación
+    tipo: str
+    animal: str # Nombre del animal protagonista
+    otro: str = None # Presa, pareja...
+    detalle: str = None
+
+    def mensaje(self):
+        return MENSAJES[self.tipo].format(animal=self.animal, otro=self.otro, detalle=self.detalle)
+
+
+class RegistroEventos:
+    def __init__(self, capacidad=1000):
+        self.hora = 0 # La actualiza el ecosistema al empezar cada hora
+        self.contadores = dict.fromkeys(TIPOS_EVENTO, 0)
+        self.recientes = collections.deque(maxlen=capacidad)
+        self.niveles = dict.fromkeys(TIPOS_EVENTO, GUARDAR)
+        self._archivo = None
+
+    def emitir(self, tipo, animal, otro=None, detalle=None):
+        self.contadores[tipo] += 1
+        nivel = self.niveles[tipo]
+        if nivel == SOLO_CONTAR:
+            return
+        evento = Evento(self.hora, tipo, animal, otro, detalle)
+        self.recientes.append(evento)
+        if self._archivo is not None:
+            self._archivo.write(json.dumps(evento._asdict(), ensure_ascii=False) + "\n")
+        if nivel >= MOSTRAR:
+            print(evento.mensaje())
+
+    def fijar_nivel(self, nivel, tipos=TIPOS_EVENTO):
+        for tipo in tipos:
+            self.niveles[tipo] = nivel
+
+    def abrir_archivo(self, ruta, tamano_buffer=1 << 16):
+        """Escribe los eventos (salvo los de nivel SOLO_CONTAR) en ruta, un JSON por línea."""
+        self.cerrar()
+        try:
+            self._archivo = open(ruta, "w", encoding="utf-8", buffering=tamano_buffer)
+        except OSError as e:
+            print(f"No se pudo abrir el archivo de eventos {ruta}: {e}")
+
+    def cerrar(self):
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
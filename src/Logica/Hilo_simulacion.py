@@ -0,0 +1,127 @@
+import queue
+import threading
+import time
+
+
+class SimulacionEnHilo:
+    """
+    Ejecuta Ecosistema.simular_hora en un hilo dedicado.
+
+    - Tras cada hora publica una Instantanea inmutable; la vista solo dibuja la última
+      publicada (doble búfer: la siguiente se construye aparte y se publica con un
+      simple cambio de referencia).
+    - Los comandos de la interfaz (añadir animales, modo caza, reproducción...) se
+      encolan y el hilo los aplica entre horas, nunca a mitad de una.
+    - Los animales seleccionados en la interfaz se copian en cada instantánea: la vista
+      no lee los animales vivos mientras el hilo los actualiza.
+    """
+    INTERVALO_PUBLICACION = 1 / 120 # Como mucho una instantánea nueva por frame de pantalla
+
+    def __init__(self, ecosistema, base_time_per_hour, dias_simulacion):
+        self.ecosistema = ecosistema
+        self.base_time_per_hour = base_time_per_hour # ms reales por hora simulada a velocidad x1
+        self.dias_simulacion = dias_simulacion
+        self.velocidad = 1
+        self.pausado = True
+        self.terminada = False
+        self.retrasada = False # True si el hilo no llega a simular al ritmo pedido
+        self._seleccion = (None, None) # (animal, pareja); solo la usa el hilo de simulación
+        self._seleccion_pedida = self._seleccion
+        self.instantanea = ecosistema.crear_instantanea()
+        self.dias_completados = queue.Queue() # (dia, poblaciones) de cada día terminado
+        self._comandos = queue.Queue()
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._bucle, name="SimulacionEnHilo", daemon=True)
+        self._ultima_publicacion = 0.0
+        self._pendiente = False # Hay horas simuladas que aún no se han publicado
+
+    def iniciar(self):
+        self._hilo.start()
+
+    def detener(self):
+        """Detiene el hilo y espera a que termine la hora en curso."""
+        self._detener.set()
+        if self._hilo.is_alive():
+            self._hilo.join()
+
+    def encolar(self, comando):
+        """Encola una función sin argumentos para ejecutarla en el hilo de simulación entre horas."""
+        self._comandos.put(comando)
+
+    def seleccionar(self, animal, pareja):
+        """Cambia los animales seleccionados; la instantánea se rehace entre dos horas."""
+        if (animal, pareja) == self._seleccion_pedida:
+            return
+        self._seleccion_pedida = (animal, pareja)
+
+        def _seleccionar():
+            self._seleccion = (animal, pareja)
+        self.encolar(_seleccionar)
+
+    def adelantar(self, horas):
+        """Simula de golpe el número de horas indicado (p. ej. 'Adelantar Día')."""
+        def _adelantar():
+            for _ in range(horas):
+                if self.terminada:
+                    break
+                self._simular_hora()
+        self.encolar(_adelantar)
+
+    def _publicar(self, forzar=False):
+        self._pendiente = True
+        ahora = time.perf_counter()
+        if forzar or ahora - self._ultima_publicacion >= self.INTERVALO_PUBLICACION:
+            self.instantanea = self.ecosistema.crear_instantanea(*self._seleccion)
+            self._ultima_publicacion = ahora
+            self._pendiente = False
+
+    def _aplicar_comandos(self):
+        aplicados = False
+        while True:
+            try:
+                comando = self._comandos.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                comando()
+            except Exception as e:
+                print(f"Error al aplicar un comando en el hilo de simulación: {e}")
+            aplicados = True
+        if aplicados:
+            self._publicar(forzar=True)
+
+    def _simular_hora(self):
+        self.ecosistema.simular_hora()
+        if self.ecosistema.hora_actual == 0:
+            self.dias_completados.put((self.ecosistema.dia_total, self.ecosistema.agregados.dietas()))
+        if self.ecosistema.dia_total >= self.dias_simulacion or not self.ecosistema.animales:
+            self.terminada = True
+        self._publicar()
+
+    def _bucle(self):
+        proxima = time.perf_counter()
+        while not self._detener.is_set():
+            self._aplicar_comandos()
+            if self.pausado or self.terminada:
+                if self._pendiente:
+                    self._publicar(forzar=True)
+                self._detener.wait(0.005)
+                proxima = time.perf_counter()
+                continue
+
+            segundos_por_hora = self.base_time_per_hour / self.velocidad / 1000
+            ahora = time.perf_counter()
+            if ahora < proxima:
+                self.retrasada = False # Vamos al día: sobra tiempo hasta la próxima hora
+                if self._pendiente:
+                    self._publicar(forzar=True)
+                self._detener.wait(min(proxima - ahora, 0.005))
+                continue
+
+            self._simular_hora()
+            proxima += segundos_por_hora
+            # Si vamos más de un segundo por detrás, se descarta el retraso y se informa
+            if time.perf_counter() - proxima > 1.0:
+                self.retrasada = True
+                proxima = time.perf_counter()
+        self._publicar(forzar=True)
@@ -0,0 +1,58 @@
+from typing import NamedTuple
+
+
+class AnimalVisible(NamedTuple):
+    """Lo mínimo que la vista necesita para dibujar (y seleccionar) un animal."""
+    x: int
+    y: int
+    especie: str
+    dieta: str # "herbivoro", "carnivoro" u "omnivoro"
+    ratio_energia: float
+    animal: object # Referencia al animal, solo para seleccionarlo con el ratón (la vista no lee sus campos)
+
+
+class AnimalSeleccionado(NamedTuple):
+    """Datos del animal seleccionado que muestra el panel de información."""
+    x: int
+    y: int
+    nombre: str
+    especie: str
+    energia: int
+    max_energia: int
+    edad: int
+    estado: str
+
+
+class TerrenoEstatico(NamedTuple):
+    """Lo que no cambia durante la partida: tamaño del mundo, zonas, ríos, puentes y decoraciones."""
+    ancho: int
+    alto: int
+    zonas: dict # nombre ("praderas", "rios"...) -> tuple[pygame.Rect]
+    puentes: tuple # tuple[(x, y)]
+    decoraciones: dict # "arboles", "plantas", "plantas_2" -> tuple[(x, y)]
+
+
+class Instantanea(NamedTuple):
+    """Estado inmutable y compacto del ecosistema tras una hora, listo para dibujar."""
+    dia_total: int
+    hora_actual: int
+    clima_actual: str
+    modo_caza_carnivoro_activo: bool
+    animales: tuple # tuple[AnimalVisible]
+    carcasas: tuple # tuple[(x, y, dias_descomposicion)]
+    peces: tuple # tuple[(x, y)]
+    herbivoros: int
+    carnivoros: int
+    omnivoros: int
+    bayas: int
+    terreno: TerrenoEstatico # Compartido entre instantáneas del mismo ecosistema
+    seleccionado: AnimalSeleccionado # None si no hay selección o el animal ha muerto
+    pareja: AnimalSeleccionado
+
+    def animal_en(self, pos, radio=10):
+        """Devuelve el primer animal dibujado en la posición del clic."""
+        x, y = pos
+        for a in self.animales:
+            if (a.x - x)**2 + (a.y - y)**2 < radio**2:
+                return a.animal
+        return None
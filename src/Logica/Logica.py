@@ -1,37 +1,117 @@
 import pygame
 import math
 import random
+import numpy as np
 from datetime import datetime 
-from .Terrenos.Terrenos import Rio, Selva, Pradera, Pez, Carcasa
+from .Terrenos.Terrenos import Rio, Selva, Pradera, Carcasa, DIAS_DESCOMPOSICION
 import src.Logica.Terrenos.Terrenos as Terrenos
+from .Animales.Almacen import AlmacenAnimales
+from .Instantanea import Instantanea, AnimalVisible, AnimalSeleccionado, TerrenoEstatico
+from .Rejilla_espacial import RejillaEspacial
+from .Terrenos.Muestreo_poisson import RejillaPuntos, muestrear_poisson
+from .Terrenos.Hierba import RejillaHierba
+from .Plantilla_mundo import clave_plantilla, obtener_plantilla, guardar_plantilla
+from .Regiones import Region, RecursoRegional, TAMANO_REGION, HORAS_DORMIDA
+from .Eventos import RegistroEventos, DECISION
+from .Agregados import Agregados
+from .Calendario import Calendario
+from .Planificador import PlanificadorDecisiones
+from .Animales.Comportamiento import Estado, agrupar_por_estado, actualizar_grupo
 from .Animales.Animal import Animal, CELL_SIZE, SCREEN_HEIGHT, BORDE_MARGEN, SIM_WIDTH
 from .Animales.animales import Conejo, Raton, Cabra, Leopardo, Gato, Cerdo, Mono, Halcon, Insecto, Herbivoro, Carnivoro, Omnivoro
 
+# Capas de la máscara de obstáculos (un bit por capa, resolución de celda)
+OBSTACULO_RIO = 1
+OBSTACULO_TRONCO = 2
+OBSTACULO_PUENTE = 4 # Zona de seguridad alrededor de los puentes (sin vegetación)
+RADIO_TRONCO = 5
+RADIO_SEGURIDAD_PUENTE = 40
+
+# Jerarquía de terrenos (el primero tiene más prioridad)
+TERRAIN_HIERARCHY = [
+    ("montanas", "montana"),
+    ("santuarios", "santuario"),
+    ("santuarios_especiales", "santuario_1"),
+    ("selvas", "selva"),
+    ("praderas", "pradera")
+]
+# Códigos uint8 de codigos_terreno; TIPOS_TERRENO[codigo] da el nombre (None si no hay terreno)
+TIPOS_TERRENO = [None] + [nombre for _, nombre in TERRAIN_HIERARCHY] + ["rio"]
+CODIGO_TERRENO = {nombre: codigo for codigo, nombre in enumerate(TIPOS_TERRENO)}
+
 
 class Ecosistema:
     class Santuario(Terrenos.Pradera):
         """Clase para definir zonas de santuario, hereda de Pradera para simplicidad."""
         pass
-    def __init__(self):
+    def __init__(self, usar_soa=False, semilla=None, ancho=SIM_WIDTH, alto=SCREEN_HEIGHT, tamano_celda=CELL_SIZE, dormancia=False, cinetico=False,
+                 fases_decision=1, presupuesto_decisiones=None):
+        """
+        usar_soa: guarda posiciones, objetivos, velocidades y energía de los animales
+        en arrays contiguos (AlmacenAnimales) y procesa en lote a los que deambulan.
+        Cambia el orden en que se actualizan los animales (ver _actualizar_animales_soa):
+        con la misma semilla es reproducible, pero no idéntica a la simulación sin SoA.
+        semilla: semilla del generador aleatorio propio del ecosistema, compartido por
+        terreno, peces y animales. Con la misma semilla y los mismos comandos, la
+        simulación se repite exactamente. Si es None se elige una al azar.
+        ancho, alto, tamano_celda: tamaño del mundo y de las celdas en píxeles. El diseño
+        del mapa (terrenos, ríos, puentes, zonas de los animales) se escala con el mundo.
+        dormancia: las regiones sin animales activos cerca duermen (ver Regiones.py), para
+        que el coste por hora dependa de la actividad y no del tamaño del mapa.
+        cinetico: los animales que deambulan saciados avanzan por tramos rectos que se
+        calculan una vez (ver Animal.iniciar_tramo) en lugar de paso a paso. Sin efecto
+        con usar_soa o dormancia, que ya tratan aparte a esos animales.
+        fases_decision, presupuesto_decisiones: los animales toman sus decisiones solo
+        una de cada fases_decision horas (salvo urgencias) y como mucho se toman
+        presupuesto_decisiones por hora (ver PlanificadorDecisiones). Con los valores
+        por defecto todos deciden cada hora.
+        """
+        self._iniciar_estado(usar_soa, semilla, ancho, alto, tamano_celda, dormancia, cinetico, fases_decision, presupuesto_decisiones)
+        self._crear_rios_y_puentes()
+
+        # Rejillas, hierba inicial y decoraciones: copiadas de la plantilla si este mundo ya se generó
+        clave = clave_plantilla(self._diseno(), self.semilla, self.tamano_celda)
+        plantilla = obtener_plantilla(clave)
+        if plantilla is not None:
+            self._aplicar_plantilla(plantilla)
+        else:
+            self._generar_mundo()
+            # Una semilla al azar difícilmente se repetirá en otra ejecución: solo en memoria
+            guardar_plantilla(clave, self._crear_plantilla(), en_disco=semilla is not None)
+        self._crear_regiones()
+        self._programar_crecimiento()
+
+    def _iniciar_estado(self, usar_soa, semilla, ancho=SIM_WIDTH, alto=SCREEN_HEIGHT, tamano_celda=CELL_SIZE, dormancia=False, cinetico=False,
+                        fases_decision=1, presupuesto_decisiones=None):
+        """Estado sin generar nada al azar: diseño del mapa, reloj, rejillas de animales... Común a __init__ y from_dict."""
+        self.ancho, self.alto, self.tamano_celda = ancho, alto, tamano_celda
+        # El diseño original es de SIM_WIDTH x SCREEN_HEIGHT; los mundos más grandes lo escalan
+        self.escala_x, self.escala_y = ancho / SIM_WIDTH, alto / SCREEN_HEIGHT
+        self.semilla = semilla if semilla is not None else random.randrange(2**32)
+        self.rng = random.Random(self.semilla)
+        self.usar_soa = usar_soa
+        # Comandos aplicados desde fuera (interfaz): [hora_absoluta, tipo, *argumentos]
+        self.registro_comandos = []
+        self.reproducible = True # False si el estado viene de una partida guardada: la semilla ya no basta
         self.tipos_de_animales = [Conejo, Raton, Cabra, Leopardo, Gato, Cerdo, Mono, Halcon, Insecto]
         self.animales: list[Animal] = []
         
         self.terreno = {
             "praderas": [
-                Terrenos.Pradera((50, 50, 250, 150)),      # Pradera en la esquina superior izquierda
-                Terrenos.Pradera((500, 80, 200, 100)),     # Pradera en la zona superior derecha
-                Terrenos.Pradera((50, 450, 250, 200)),     # Gran pradera en la esquina inferior izquierda
-                Terrenos.Pradera((550, 480, 200, 150)),    # Pradera en la esquina inferior derecha
+                Terrenos.Pradera(self._escalar_rect((50, 50, 250, 150))),      # Pradera en la esquina superior izquierda
+                Terrenos.Pradera(self._escalar_rect((500, 80, 200, 100))),     # Pradera en la zona superior derecha
+                Terrenos.Pradera(self._escalar_rect((50, 450, 250, 200))),     # Gran pradera en la esquina inferior izquierda
+                Terrenos.Pradera(self._escalar_rect((550, 480, 200, 150))),    # Pradera en la esquina inferior derecha
             ],
             "rios": [],
             "selvas": [
-                Terrenos.Selva((350, 500, 150, 100)),      # Pequeña selva en la parte inferior central
+                Terrenos.Selva(self._escalar_rect((350, 500, 150, 100))),      # Pequeña selva en la parte inferior central
             ],
             "montanas": [],
             "santuarios": [
-                self.Santuario((550, 200, 150, 100)), # Santuario 1 (textura normal)
+                self.Santuario(self._escalar_rect((550, 200, 150, 100))), # Santuario 1 (textura normal)
             ],
-            "santuarios_especiales": [self.Santuario((550, 400, 150, 100))], # Santuario 2 (textura especial)
+            "santuarios_especiales": [self.Santuario(self._escalar_rect((550, 400, 150, 100)))], # Santuario 2 (textura especial)
             "arboles": [],
             "plantas": [],
             "plantas_2": [],
@@ -40,218 +120,568 @@ class Ecosistema:
         self.recursos = {
             "carcasas": []
         }
-        self.grid_width = SIM_WIDTH // CELL_SIZE
-        self.grid_height = SCREEN_HEIGHT // CELL_SIZE
-        self.grid_hierba = [[0 for _ in range(self.grid_height)] for _ in range(self.grid_width)]
-        self.terrain_grid = [[None for _ in range(self.grid_height)] for _ in range(self.grid_width)]
-        self.is_river = [[False for _ in range(self.grid_height)] for _ in range(self.grid_width)]
+        self.grid_width = ancho // tamano_celda
+        self.grid_height = alto // tamano_celda
+        self._calcular_zonas()
 
+        self.dia_total = 1
+        self.hora_actual = 0
+        self.clima_actual = "Normal"
+        self.factor_crecimiento_base = 1.5 # Factor de crecimiento constante
+        self.prob_sequia = 0.05 # Probabilidad diaria de que el día sea de sequía
+        self.animales_nuevos = []
+        self.historial_factores = [] # Factor de crecimiento de cada día simulado (para asentar regiones dormidas)
+        self.dormancia = dormancia
+        self._recalcular_dormancia = False # Un comando puede haber despertado animales de regiones dormidas
+        self.cinetico = cinetico
+        self.fases_decision, self.presupuesto_decisiones = fases_decision, presupuesto_decisiones
+        # Sin fases ni presupuesto todos deciden cada hora: no hace falta planificador
+        escalonado = fases_decision > 1 or presupuesto_decisiones is not None
+        self.planificador = PlanificadorDecisiones(fases_decision, presupuesto_decisiones) if escalonado else None
+
+        self.rejilla = RejillaEspacial(tamano_celda) # Animales por celda, mantenida al moverse, nacer y morir
+        self.rejilla_presas = RejillaEspacial(tamano_celda) # Solo herbívoros: lo que buscan los cazadores
+        self.almacen = AlmacenAnimales() if usar_soa else None
+        self.sonido_activo = True # Desactivado en simulaciones sin pantalla ni audio
+        self.eventos = RegistroEventos() # Comer, cazar, nacer, morir... (en lugar de print)
+        self.agregados = Agregados(self) # Poblaciones y recursos sin recorrer los animales
+        self.modo_caza_carnivoro_activo = False
+        self._celdas_libres = {} # dieta -> celdas donde pueden aparecer animales (ver _celdas_aparicion)
+        self.calendario = Calendario() # Crecimiento diario, carcasas que desaparecen...
+        self.cruces_tramos = Calendario() # Cambios de celda de los tramos del modo cinético (al final de cada hora)
+
+    def _escalar_rect(self, rect):
+        """Rectángulo (x, y, w, h) del diseño original escalado al tamaño de este mundo."""
+        x, y, w, h = rect
+        return (round(x * self.escala_x), round(y * self.escala_y), round(w * self.escala_x), round(h * self.escala_y))
+
+    def _geometria_rios(self):
+        """(centro_x, centro_y, grosor del brazo vertical, grosor de los brazos horizontales)."""
+        return self.ancho // 2, self.alto // 2, round(60 * self.escala_x), round(60 * self.escala_y)
+
+    def _calcular_zonas(self):
+        """
+        Zonas de cada dieta a ambos lados de los ríos: zonas_aparicion (x_min, x_max,
+        y_min, y_max) para colocar animales nuevos y zonas_deambulacion (x, y, w, h).
+        """
+        center_x, center_y, grosor_x, grosor_y = self._geometria_rios()
+        rio_borde_izq = center_x - grosor_x // 2
+        rio_borde_der = center_x + grosor_x // 2
+        rio_borde_sup = center_y - grosor_y // 2
+        rio_borde_inf = rio_borde_sup + grosor_y
+        m = BORDE_MARGEN
+        self.zonas_aparicion = {
+            "carnivoro": (m, rio_borde_izq - m, m, rio_borde_sup - m), # Cuadrante superior izquierdo
+            "herbivoro": (m, self.ancho - m, rio_borde_inf, self.alto - m), # Cuadrante inferior
+            "omnivoro": (rio_borde_der + m, self.ancho - m, m, rio_borde_sup - m), # Cuadrante superior derecho
+        }
+        self.zonas_deambulacion = {
+            "carnivoro": (m, m, rio_borde_izq - m * 2, rio_borde_sup - m * 2),
+            "herbivoro": (m, rio_borde_inf, self.ancho - m * 2, self.alto - rio_borde_inf - m),
+            "omnivoro": (rio_borde_der, m, self.ancho - rio_borde_der - m, rio_borde_sup - m * 2),
+            "todo": (m, m, self.ancho - 2 * m, self.alto - 2 * m),
+        }
+
+    def _crear_rios_y_puentes(self, peces_iniciales=True):
         # Construir ríos nuevos: pool central + brazos hacia esquinas (aproximación con rects)
-        # Parámetros geométricos
-        center_x = SIM_WIDTH // 2
-        center_y = SCREEN_HEIGHT // 2
-        thickness = 60
+        center_x, center_y, grosor_x, grosor_y = self._geometria_rios()
 
         # Área central donde confluyen los ríos
-        pool = Terrenos.Rio((center_x - thickness // 2, center_y - thickness // 2, thickness, thickness))
+        pool = Terrenos.Rio((center_x - grosor_x // 2, center_y - grosor_y // 2, grosor_x, grosor_y), self.rng, peces_iniciales)
 
         # Brazo izquierdo horizontal: desde el borde izquierdo hasta la izquierda del pool
-        left_arm = Terrenos.Rio((0, center_y - thickness // 2, center_x - thickness // 2, thickness))
+        left_arm = Terrenos.Rio((0, center_y - grosor_y // 2, center_x - grosor_x // 2, grosor_y), self.rng, peces_iniciales)
 
         # Brazo derecho horizontal: desde la derecha del pool hasta el borde derecho
-        right_arm = Terrenos.Rio((center_x + thickness // 2, center_y - thickness // 2, SIM_WIDTH - (center_x + thickness // 2), thickness))
+        right_arm = Terrenos.Rio((center_x + grosor_x // 2, center_y - grosor_y // 2, self.ancho - (center_x + grosor_x // 2), grosor_y), self.rng, peces_iniciales)
 
         # Brazo superior vertical: desde el borde superior hasta la parte superior del pool
-        top_arm = Terrenos.Rio((center_x - thickness // 2, 0, thickness, center_y - thickness // 2))
+        top_arm = Terrenos.Rio((center_x - grosor_x // 2, 0, grosor_x, center_y - grosor_y // 2), self.rng, peces_iniciales)
 
         # Añadir a la lista de ríos
         self.terreno["rios"].extend([left_arm, right_arm, top_arm, pool])
 
         # Añadir puentes en ubicaciones estratégicas sobre los brazos horizontales
-        self.terreno["puentes"].append((150, center_y))
-        self.terreno["puentes"].append((SIM_WIDTH - 150, center_y))
-        self.terreno["puentes"].append((SIM_WIDTH // 4, center_y))
-        self.terreno["puentes"].append((center_x + 2, 150)) # Nuevo puente en el río superior, movido 2px a la derecha
-
-        # Establecer la jerarquía de terrenos (el primero tiene más prioridad)
-        terrain_hierarchy = [
-            ("montanas", "montana"),
-            ("santuarios", "santuario"),
-            ("santuarios_especiales", "santuario_1"), # Añadimos la nueva jerarquía
-            ("selvas", "selva"),
-            ("praderas", "pradera")
-        ]
+        self.terreno["puentes"].append((round(150 * self.escala_x), center_y))
+        self.terreno["puentes"].append((self.ancho - round(150 * self.escala_x), center_y))
+        self.terreno["puentes"].append((self.ancho // 4, center_y))
+        self.terreno["puentes"].append((center_x + 2, round(150 * self.escala_y))) # Puente en el río superior, movido 2px a la derecha
 
+    def _generar_mundo(self):
+        """Todo lo que depende solo del diseño y la semilla: rejillas, hierba inicial, decoraciones y terrenos cercanos."""
+        self._construir_rejillas_terreno()
+        self._generar_hierba_inicial()
+        self._poblar_decoraciones()
+        self._precalcular_terrenos_cercanos()
+
+    def _generar_hierba_inicial(self):
+        """Hierba inicial aleatoria (las celdas de río empiezan y se quedan en 0)."""
+        hierba = np.zeros((self.grid_width, self.grid_height), dtype=np.int32)
         for gx in range(self.grid_width):
             for gy in range(self.grid_height):
-                cell_rect = pygame.Rect(gx * CELL_SIZE, gy * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                
-                if any(rio.rect.colliderect(cell_rect) for rio in self.terreno["rios"]):
-                    self.grid_hierba[gx][gy] = 0
-                    self.terrain_grid[gx][gy] = "rio" # Marcar como río
-                    self.is_river[gx][gy] = True
+                if self.is_river[gx, gy]:
                     continue
+                max_val = Terrenos.MAX_HIERBA_PRADERA if self.codigos_terreno[gx, gy] == CODIGO_TERRENO["pradera"] else Terrenos.MAX_HIERBA_NORMAL
+                hierba[gx, gy] = self.rng.randint(0, max_val)
+        self.hierba = RejillaHierba(hierba, self.tasa_hierba, self.capacidad_hierba)
 
-                # Asignar tipo de terreno basado en la jerarquía
-                for terrain_list_name, terrain_type_name in terrain_hierarchy:
-                    if any(t.rect.colliderect(cell_rect) for t in self.terreno[terrain_list_name]):
-                        self.terrain_grid[gx][gy] = terrain_type_name
-                        break
-                
-                # Calcular hierba inicial
-                max_val = Terrenos.MAX_HIERBA_PRADERA if self.terrain_grid[gx][gy] == "pradera" else Terrenos.MAX_HIERBA_NORMAL
-                self.grid_hierba[gx][gy] = random.randint(0, max_val)
+    def _diseno(self):
+        """Rectángulos de cada tipo de terreno y puentes: describe el mapa en la clave de la plantilla."""
+        listas = ("praderas", "rios", "selvas", "montanas", "santuarios", "santuarios_especiales")
+        return (self.ancho, self.alto,
+                tuple((nombre, tuple(tuple(t.rect) for t in self.terreno[nombre])) for nombre in listas),
+                tuple(self.terreno["puentes"]))
 
-        self.dia_total = 1
-        self.hora_actual = 0
-        self.clima_actual = "Normal"
-        self.factor_crecimiento_base = 1.5 # Factor de crecimiento constante
-        self.animales_nuevos = []
+    def _crear_plantilla(self):
+        """Copia del mundo recién generado (sin animales) para Plantilla_mundo."""
+        return {
+            "codigos_terreno": self.codigos_terreno.copy(),
+            "is_river": self.is_river.copy(),
+            "capacidad_hierba": self.capacidad_hierba.copy(),
+            "tasa_hierba": self.tasa_hierba.copy(),
+            "grid_hierba": self.hierba.valores(),
+            "arboles": list(self.terreno["arboles"]),
+            "plantas": list(self.terreno["plantas"]),
+            "plantas_2": list(self.terreno["plantas_2"]),
+            "peces": [(r.num_peces, r.peces_x.copy(), r.peces_y.copy(), r.peces_direccion.copy(), r.peces_energia.copy()) for r in self.terreno["rios"]],
+            "rio_cercano": self.indice_rio_cercano.copy(),
+            "selva_cercana": self.indice_selva_cercana.copy(),
+            "dist_selva_cercana_sq": self.dist_selva_cercana_sq.copy(),
+            "rng_estado": self.rng.getstate(),
+        }
 
-        self.grid_animales = {}
-        self.modo_caza_carnivoro_activo = False
-        self._poblar_decoraciones()
-        self.terrain_cache = {"rio": {}, "selva": {}}
-        self._precalcular_terrenos_cercanos()
+    def _aplicar_plantilla(self, plantilla):
+        """Restaura el mundo de una plantilla; el generador queda como si se hubiera generado."""
+        self.codigos_terreno = plantilla["codigos_terreno"].copy()
+        self.is_river = plantilla["is_river"].copy()
+        self.capacidad_hierba = plantilla["capacidad_hierba"].copy()
+        self.tasa_hierba = plantilla["tasa_hierba"].copy()
+        self.hierba = RejillaHierba(plantilla["grid_hierba"], self.tasa_hierba, self.capacidad_hierba)
+        self.terreno["arboles"] = list(plantilla["arboles"])
+        self.terreno["plantas"] = list(plantilla["plantas"])
+        self.terreno["plantas_2"] = list(plantilla["plantas_2"])
+        self._construir_mascara_obstaculos() # Con los árboles de la plantilla
+        for rio, (num_peces, xs, ys, direcciones, energias) in zip(self.terreno["rios"], plantilla["peces"]):
+            rio.num_peces = num_peces
+            rio.peces_x, rio.peces_y = xs.copy(), ys.copy()
+            rio.peces_direccion, rio.peces_energia = direcciones.copy(), energias.copy()
+        self.indice_rio_cercano = plantilla["rio_cercano"].copy()
+        self.indice_selva_cercana = plantilla["selva_cercana"].copy()
+        self.dist_selva_cercana_sq = plantilla["dist_selva_cercana_sq"].copy()
+        self.rng.setstate(plantilla["rng_estado"])
+
+    def _mascara_rect(self, rect):
+        """Máscara (grid_width, grid_height) de las celdas que colisionan con el rectángulo (igual que colliderect)."""
+        if rect.width <= 0 or rect.height <= 0:
+            return np.zeros((self.grid_width, self.grid_height), dtype=bool)
+        xs = np.arange(self.grid_width) * self.tamano_celda
+        ys = np.arange(self.grid_height) * self.tamano_celda
+        en_x = (xs < rect.right) & (xs + self.tamano_celda > rect.left)
+        en_y = (ys < rect.bottom) & (ys + self.tamano_celda > rect.top)
+        return np.outer(en_x, en_y)
+
+    def _construir_rejillas_terreno(self):
+        """Calcula una sola vez las rejillas de tipo de terreno, ríos, capacidad y tasa de crecimiento de hierba."""
+        forma = (self.grid_width, self.grid_height)
+        self.codigos_terreno = np.zeros(forma, dtype=np.uint8) # Códigos de CODIGO_TERRENO
+
+        # Se recorre la jerarquía de menor a mayor prioridad para que la más prioritaria quede encima
+        for terrain_list_name, terrain_type_name in reversed(TERRAIN_HIERARCHY):
+            for t in self.terreno[terrain_list_name]:
+                self.codigos_terreno[self._mascara_rect(t.rect)] = CODIGO_TERRENO[terrain_type_name]
+
+        self.is_river = np.zeros(forma, dtype=bool)
+        for rio in self.terreno["rios"]:
+            self.is_river |= self._mascara_rect(rio.rect)
+        self.codigos_terreno[self.is_river] = CODIGO_TERRENO["rio"]
+
+        # Capacidad y tasa de crecimiento por celda: la primera pradera que colisiona manda
+        self.capacidad_hierba = np.full(forma, Terrenos.MAX_HIERBA_NORMAL, dtype=np.int32)
+        self.tasa_hierba = np.ones(forma, dtype=np.float64)
+        for pradera in reversed(self.terreno["praderas"]):
+            mascara = self._mascara_rect(pradera.rect)
+            self.capacidad_hierba[mascara] = pradera.max_hierba
+            self.tasa_hierba[mascara] = pradera.tasa_crecimiento
+        self.capacidad_hierba[self.is_river] = 0
+        self.tasa_hierba[self.is_river] = 0.0
+
+        self._construir_mascara_obstaculos()
+
+    def _construir_mascara_obstaculos(self):
+        """
+        Máscara de bits OBSTACULO_* por celda (incluidas las celdas incompletas del borde
+        derecho e inferior): una celda tiene el bit si alguno de sus píxeles está en ese
+        obstáculo. Los troncos que tocan cada celda se
+        guardan en troncos_por_celda para la comprobación exacta de _obstaculos_en. Los
+        árboles añadidos después se marcan uno a uno con _marcar_tronco.
+        """
+        c = self.tamano_celda
+        self.mascara_obstaculos = np.zeros((-(-self.ancho // c), -(-self.alto // c)), dtype=np.uint8)
+        self.troncos_por_celda = {} # (gx, gy) -> troncos (x, y) cuyo disco toca la celda
+        self._terreno_estatico = None # Ver terreno_estatico
+        for rio in self.terreno["rios"]:
+            r = rio.rect.clip(pygame.Rect(0, 0, self.ancho, self.alto))
+            if r.width > 0 and r.height > 0:
+                self.mascara_obstaculos[r.left // c:(r.right - 1) // c + 1, r.top // c:(r.bottom - 1) // c + 1] |= OBSTACULO_RIO
+        for px, py in self.terreno["puentes"]:
+            self._marcar_disco(px, py, RADIO_SEGURIDAD_PUENTE, OBSTACULO_PUENTE)
+        for ax, ay in self.terreno["arboles"]:
+            self._marcar_tronco(ax, ay)
+
+    def _marcar_disco(self, cx, cy, radio, bit):
+        """
+        Marca las celdas con algún píxel a distancia estrictamente menor que radio de
+        (cx, cy). Devuelve las celdas marcadas (gx, gy).
+        """
+        c = self.tamano_celda
+        columnas, filas = self.mascara_obstaculos.shape
+        gx0, gx1 = max(0, (cx - radio + 1) // c), min(columnas, (cx + radio - 1) // c + 1)
+        gy0, gy1 = max(0, (cy - radio + 1) // c), min(filas, (cy + radio - 1) // c + 1)
+        if gx0 >= gx1 or gy0 >= gy1:
+            return []
+        # Píxel de cada celda más cercano al centro
+        xs = np.clip(cx, np.arange(gx0, gx1) * c, np.minimum(np.arange(gx0, gx1) * c + c, self.ancho) - 1)[:, None]
+        ys = np.clip(cy, np.arange(gy0, gy1) * c, np.minimum(np.arange(gy0, gy1) * c + c, self.alto) - 1)[None, :]
+        dentro = (xs - cx)**2 + (ys - cy)**2 < radio**2
+        self.mascara_obstaculos[gx0:gx1, gy0:gy1] |= np.where(dentro, bit, 0).astype(np.uint8)
+        return [(gx0 + i, gy0 + j) for i, j in np.argwhere(dentro).tolist()]
+
+    def _marcar_tronco(self, x, y):
+        for celda in self._marcar_disco(x, y, RADIO_TRONCO, OBSTACULO_TRONCO):
+            self.troncos_por_celda.setdefault(celda, []).append((x, y))
+
+    def _agregar_arbol(self, x, y):
+        self.terreno["arboles"].append((x, y))
+        self._marcar_tronco(x, y)
+        self._celdas_libres.clear()
+
+    def _obstaculos_en(self, x, y):
+        """Bits de obstáculo en el píxel (x, y), o None si está fuera del mundo."""
+        x, y = int(x), int(y)
+        if not (0 <= x < self.ancho and 0 <= y < self.alto):
+            return None
+        celda = (x // self.tamano_celda, y // self.tamano_celda)
+        bits = int(self.mascara_obstaculos[celda])
+        if not bits:
+            return 0
+        # La celda solo dice que algún píxel suyo está ocupado: se comprueba el píxel
+        if bits & OBSTACULO_RIO and not any(rio.rect.collidepoint(x, y) for rio in self.terreno["rios"]):
+            bits &= ~OBSTACULO_RIO
+        if bits & OBSTACULO_PUENTE and not any((x - px)**2 + (y - py)**2 < RADIO_SEGURIDAD_PUENTE**2 for px, py in self.terreno["puentes"]):
+            bits &= ~OBSTACULO_PUENTE
+        if bits & OBSTACULO_TRONCO and not any((x - ax)**2 + (y - ay)**2 < RADIO_TRONCO**2 for ax, ay in self.troncos_por_celda.get(celda, ())):
+            bits &= ~OBSTACULO_TRONCO
+        return bits
+
+    def comer_hierba(self, gx, gy, cantidad):
+        """Quita cantidad de hierba de la celda si tiene más; devuelve si se pudo comer."""
+        return self.hierba.comer(gx, gy, cantidad)
+
+    # --- Regiones (ver Regiones.py) ---
+
+    def _crear_regiones(self):
+        """Divide la rejilla en regiones de TAMANO_REGION celdas."""
+        self.regiones_x = -(-self.grid_width // TAMANO_REGION)
+        self.regiones_y = -(-self.grid_height // TAMANO_REGION)
+        self._tamano_region_px = TAMANO_REGION * self.tamano_celda
+        self.regiones = []
+        for rx in range(self.regiones_x):
+            for ry in range(self.regiones_y):
+                gx0, gy0 = rx * TAMANO_REGION, ry * TAMANO_REGION
+                region = Region(len(self.regiones), gx0, min(gx0 + TAMANO_REGION, self.grid_width),
+                                gy0, min(gy0 + TAMANO_REGION, self.grid_height))
+                self.regiones.append(region)
+        for rx in range(self.regiones_x):
+            for ry in range(self.regiones_y):
+                self.regiones[rx * self.regiones_y + ry].vecinas = [
+                    self.regiones[vx * self.regiones_y + vy]
+                    for vx in range(max(0, rx - 1), min(self.regiones_x, rx + 2))
+                    for vy in range(max(0, ry - 1), min(self.regiones_y, ry + 2))]
+
+        # Selvas y ríos con las regiones que tocan (en el orden en que crecen)
+        self.recursos_regionales = []
+        for terreno in self.terreno["selvas"] + self.terreno["rios"]:
+            recurso = RecursoRegional(terreno, self._regiones_de_rect(terreno.rect), dia=len(self.historial_factores), hora=self.hora_absoluta)
+            for region in recurso.regiones:
+                region.recursos.append(recurso)
+            self.recursos_regionales.append(recurso)
+        self._recurso_de = {recurso.terreno: recurso for recurso in self.recursos_regionales}
+
+    def _regiones_de_rect(self, rect):
+        """Regiones que tocan un rectángulo en píxeles."""
+        rx0 = max(0, rect.left // self._tamano_region_px)
+        rx1 = min(self.regiones_x - 1, (rect.right - 1) // self._tamano_region_px)
+        ry0 = max(0, rect.top // self._tamano_region_px)
+        ry1 = min(self.regiones_y - 1, (rect.bottom - 1) // self._tamano_region_px)
+        return [self.regiones[rx * self.regiones_y + ry] for rx in range(rx0, rx1 + 1) for ry in range(ry0, ry1 + 1)]
+
+    def region_en(self, x, y):
+        """Región que contiene el píxel (x, y); los puntos fuera del mundo van a la del borde."""
+        rx = min(max(int(x) // self._tamano_region_px, 0), self.regiones_x - 1)
+        ry = min(max(int(y) // self._tamano_region_px, 0), self.regiones_y - 1)
+        return self.regiones[rx * self.regiones_y + ry]
+
+    def hierba_region(self, region):
+        """Hierba total de la región (resumen calculado al pedirlo)."""
+        return int(self.hierba.valores(region.celdas).sum())
+
+    def _asentar_recurso(self, recurso):
+        recurso.asentar_dias(self.historial_factores)
+        recurso.asentar_horas(self.hora_absoluta - 1) # La hora actual la mueve simular_hora
+
+    def _despertar(self, region):
+        region.dormida = False
+        for recurso in region.recursos:
+            self._asentar_recurso(recurso)
+
+    def _actualizar_dormancia(self):
+        """Duermen las regiones sin animales activos en ellas ni en las de alrededor."""
+        con_actividad = {animal._region for animal in self.animales if animal._region is not None and not animal.en_reposo()}
+        despiertas = {vecina.indice for region in con_actividad for vecina in region.vecinas}
+        for region in self.regiones:
+            if region.indice in despiertas:
+                if region.dormida:
+                    self._despertar(region)
+            else:
+                region.dormida = True
+        self._recalcular_dormancia = False
+
+    def _cambiar_de_region(self, animal, region):
+        especie = type(animal).__name__
+        if animal._region is not None:
+            animal._region.quitar(especie)
+        region.agregar(especie)
+        animal._region = region
+        if region.dormida and not animal.en_reposo():
+            # Un animal activo llega a una región dormida: se despiertan ella y las de alrededor
+            for vecina in region.vecinas:
+                if vecina.dormida:
+                    self._despertar(vecina)
+
+    def asentar_regiones(self):
+        """
+        Pone al día las bayas de las selvas dormidas (antes de guardar la partida). Los
+        ríos no: sus peces usan el generador aleatorio y asentarlos aquí cambiaría la
+        partida según cuándo se guarde.
+        """
+        for recurso in self.recursos_regionales:
+            if not isinstance(recurso.terreno, Rio):
+                recurso.asentar_dias(self.historial_factores)
 
     def choca_con_terreno(self, x, y):
-        radio_tronco = 5
-        return any(math.sqrt((ax - x)**2 + (ay - y)**2) < radio_tronco for ax, ay in self.terreno["arboles"])
+        bits = self._obstaculos_en(x, y)
+        if bits is not None:
+            return bool(bits & OBSTACULO_TRONCO)
+        # Fuera del mundo: comprobación exacta
+        return any(math.sqrt((ax - x)**2 + (ay - y)**2) < RADIO_TRONCO for ax, ay in self.terreno["arboles"])
 
-    def agregar_carcasa(self, x, y):
+    def agregar_carcasa(self, x, y, energia_restante=60, dia_aparicion=None):
         if not self.choca_con_terreno(x, y):
-            nueva_carcasa = Carcasa(x, y)
+            nueva_carcasa = Carcasa(x, y, energia_restante, self.dia_total if dia_aparicion is None else dia_aparicion)
             self.recursos["carcasas"].append(nueva_carcasa)
+            # Desaparece al empezar el día dia_aparicion + DIAS_DESCOMPOSICION
+            self.calendario.programar((nueva_carcasa.dia_aparicion + DIAS_DESCOMPOSICION - 1) * 24, self._quitar_carcasa, nueva_carcasa)
+
+    def _quitar_carcasa(self, carcasa):
+        self.recursos["carcasas"].remove(carcasa) # Casi siempre la primera: salen en el orden en que llegaron
+
+    def dias_descomposicion(self, carcasa):
+        return self.dia_total - carcasa.dia_aparicion
+
+    def _programar_crecimiento(self):
+        """Programa _crecimiento_diario para el comienzo del día siguiente."""
+        self.calendario.programar(self.dia_total * 24, self._crecimiento_diario)
+
+    def _crecimiento_diario(self):
+        """Crecimiento de hierba, bayas y peces del día que empieza (evento del calendario)."""
+        factor_crecimiento = self.factor_crecimiento_base
+        if self.clima_actual == "Sequía":
+            factor_crecimiento *= 0.1
+
+        self.hierba.nuevo_dia(factor_crecimiento) # Cada celda se calcula al leerla
+        self.historial_factores.append(factor_crecimiento)
+        if self.dormancia:
+            # Solo crece lo despierto; lo dormido se asienta al despertar
+            for recurso in self.recursos_regionales:
+                if recurso.activo():
+                    recurso.asentar_dias(self.historial_factores)
+        else:
+            for selva in self.terreno["selvas"]: selva.crecer_recursos(factor_crecimiento)
+            for rio in self.terreno["rios"]: rio.crecer_recursos(factor_crecimiento)
+        self._programar_crecimiento()
     
-    def _es_posicion_valida_para_vegetacion(self, x, y, decoraciones_existentes, min_dist):
-        if any(rio.rect.collidepoint(x, y) for rio in self.terreno["rios"]):
-            return False
-        for px, py in self.terreno["puentes"]:
-            if math.sqrt((x - px)**2 + (y - py)**2) < 40: # Distancia de seguridad alrededor de los puentes
+    def _es_posicion_valida_para_vegetacion(self, x, y, decoraciones, min_dist):
+        """decoraciones: RejillaPuntos con las decoraciones ya colocadas."""
+        bits = self._obstaculos_en(x, y)
+        if bits is not None:
+            if bits & (OBSTACULO_RIO | OBSTACULO_PUENTE):
                 return False
-        return self._es_posicion_decoracion_valida(x, y, decoraciones_existentes, min_dist)
-
-    def _es_posicion_decoracion_valida(self, x, y, decoraciones_existentes, min_dist):
-        for dx, dy in decoraciones_existentes:
-            dist = math.sqrt((x - dx)**2 + (y - dy)**2)
-            if dist < min_dist:
+        else:
+            # Fuera del mundo (grupos de plantas junto al borde): comprobación exacta
+            if any(rio.rect.collidepoint(x, y) for rio in self.terreno["rios"]):
                 return False
-        return True
+            for px, py in self.terreno["puentes"]:
+                if math.sqrt((x - px)**2 + (y - py)**2) < RADIO_SEGURIDAD_PUENTE: # Distancia de seguridad alrededor de los puentes
+                    return False
+        return not decoraciones.hay_cercano(x, y, min_dist)
+
+    def _colocar_vegetacion(self, decoraciones, izquierda, arriba, derecha, abajo, cantidad, min_dist):
+        """
+        Hasta `cantidad` puntos de un muestreo de Poisson en la zona, a min_dist o más
+        de cualquier decoración. Los puntos se registran en `decoraciones`.
+        """
+        puntos = muestrear_poisson(self.rng, izquierda, arriba, derecha, abajo, min_dist,
+                                   lambda x, y: self._es_posicion_valida_para_vegetacion(x, y, decoraciones, min_dist),
+                                   maximo=cantidad)
+        for x, y in puntos:
+            decoraciones.insertar(x, y)
+        return puntos
 
     def _poblar_decoraciones(self):
         self.terreno["arboles"].clear()
         self.terreno["plantas"] = []
         self.terreno["plantas_2"] = []
+        self.mascara_obstaculos &= ~np.uint8(OBSTACULO_TRONCO)
+        self.troncos_por_celda.clear()
+        self._terreno_estatico = None
         
-        decoraciones_todas = []
+        decoraciones = RejillaPuntos(self.tamano_celda)
         intentos_max = 80
         margen = 10
+        # Las cantidades son para el mapa original: en mapas mayores crecen con el área
+        escala_area = self.escala_x * self.escala_y
 
-        # Poblar árboles densamente en las selvas
+        # Poblar árboles densamente en las selvas (hasta 40 por selva)
         for selva in self.terreno["selvas"]:
-            for _ in range(40): # Número de árboles por selva
-                for _ in range(intentos_max):
-                    x = random.randint(selva.rect.left + margen, selva.rect.right - margen)
-                    y = random.randint(selva.rect.top + margen, selva.rect.bottom - margen)
-                    if self._es_posicion_valida_para_vegetacion(x, y, decoraciones_todas, min_dist=25):
-                        self.terreno["arboles"].append((x, y)); decoraciones_todas.append((x, y))
-                        break
+            r = selva.rect
+            for x, y in self._colocar_vegetacion(decoraciones, r.left + margen, r.top + margen, r.right - margen, r.bottom - margen, round(40 * escala_area), min_dist=25):
+                self._agregar_arbol(x, y)
 
-        # Poblar algunos árboles en las praderas
+        # Poblar algunos árboles en las praderas (hasta 15 por pradera)
         for pradera in self.terreno["praderas"]:
-            for _ in range(15): # Número de árboles por pradera
+            r = pradera.rect
+            for x, y in self._colocar_vegetacion(decoraciones, r.left + margen, r.top + margen, r.right - margen, r.bottom - margen, round(15 * escala_area), min_dist=30):
+                self._agregar_arbol(x, y)
+        
+        # Poblar plantas en grupos sobre el fondo: (lista, grupos, plantas por grupo, radio del grupo)
+        grupos = [
+            ("plantas", round(15 * escala_area), 10, 40),
+            ("plantas_2", round(12 * escala_area), 8, 35),
+        ]
+        for clave, num_grupos, plantas_por_grupo, radio_grupo in grupos:
+            for _ in range(num_grupos):
+                # Elegir un centro para el grupo que no esté en un terreno ya definido
                 for _ in range(intentos_max):
-                    x = random.randint(pradera.rect.left + margen, pradera.rect.right - margen)
-                    y = random.randint(pradera.rect.top + margen, pradera.rect.bottom - margen)
-                    if self._es_posicion_valida_para_vegetacion(x, y, decoraciones_todas, min_dist=30):
-                        self.terreno["arboles"].append((x, y)); decoraciones_todas.append((x, y))
+                    centro_x = self.rng.randint(margen, self.ancho - margen)
+                    centro_y = self.rng.randint(margen, self.alto - margen)
+                    if not self.choca_con_terreno(centro_x, centro_y) and self.codigos_terreno[centro_x // self.tamano_celda, centro_y // self.tamano_celda] == CODIGO_TERRENO[None]:
                         break
-        
-        # Poblar plantas en grupos sobre el fondo
-        num_grupos_plantas = 15
-        plantas_por_grupo = 10
-        radio_grupo = 40
-
-        for _ in range(num_grupos_plantas):
-            # Elegir un centro para el grupo que no esté en un terreno ya definido
-            for _ in range(intentos_max):
-                centro_x = random.randint(margen, SIM_WIDTH - margen)
-                centro_y = random.randint(margen, SCREEN_HEIGHT - margen)
-                if not self.choca_con_terreno(centro_x, centro_y) and self.terrain_grid[centro_x // CELL_SIZE][centro_y // CELL_SIZE] is None:
-                    break
-            
-            for _ in range(plantas_por_grupo):
-                x = centro_x + random.randint(-radio_grupo, radio_grupo)
-                y = centro_y + random.randint(-radio_grupo, radio_grupo)
-                if self._es_posicion_valida_para_vegetacion(x, y, decoraciones_todas, min_dist=10):
-                    self.terreno["plantas"].append((x, y)); decoraciones_todas.append((x, y))
-        
-        # Poblar plantas_2 en grupos sobre el fondo
-        num_grupos_plantas_2 = 12
-        plantas_por_grupo_2 = 8
-        radio_grupo_2 = 35
-
-        for _ in range(num_grupos_plantas_2):
-            # Elegir un centro para el grupo que no esté en un terreno ya definido
-            for _ in range(intentos_max):
-                centro_x = random.randint(margen, SIM_WIDTH - margen)
-                centro_y = random.randint(margen, SCREEN_HEIGHT - margen)
-                if not self.choca_con_terreno(centro_x, centro_y) and self.terrain_grid[centro_x // CELL_SIZE][centro_y // CELL_SIZE] is None:
-                    break
-            
-            for _ in range(plantas_por_grupo_2):
-                x = centro_x + random.randint(-radio_grupo_2, radio_grupo_2)
-                y = centro_y + random.randint(-radio_grupo_2, radio_grupo_2)
-                if self._es_posicion_valida_para_vegetacion(x, y, decoraciones_todas, min_dist=10):
-                    self.terreno["plantas_2"].append((x, y)); decoraciones_todas.append((x, y))
+
+                self.terreno[clave].extend(self._colocar_vegetacion(
+                    decoraciones, centro_x - radio_grupo, centro_y - radio_grupo, centro_x + radio_grupo, centro_y + radio_grupo,
+                    plantas_por_grupo, min_dist=10))
 
     def _precalcular_terrenos_cercanos(self):
-        print("Precalculando caché de terrenos cercanos para optimización...")
-        for gx in range(self.grid_width):
-            for gy in range(self.grid_height):
-                x, y = gx * CELL_SIZE, gy * CELL_SIZE
-                
-                mejor_rio, menor_dist_rio_sq = None, float('inf')
-                for rio in self.terreno["rios"]:
-                    dist_sq = (x - rio.rect.centerx)**2 + (y - rio.rect.centery)**2
-                    if dist_sq < menor_dist_rio_sq:
-                        menor_dist_rio_sq, mejor_rio = dist_sq, rio
-                if mejor_rio: self.terrain_cache["rio"][(gx, gy)] = mejor_rio
-
-                mejor_selva, menor_dist_selva_sq = None, float('inf')
-                for selva in self.terreno["selvas"]:
-                    dist_sq = (x - selva.rect.centerx)**2 + (y - selva.rect.centery)**2
-                    if dist_sq < menor_dist_selva_sq:
-                        menor_dist_selva_sq, mejor_selva = dist_sq, selva
-                if mejor_selva: self.terrain_cache["selva"][(gx, gy)] = (mejor_selva, menor_dist_selva_sq)
+        """
+        Índice del río y de la selva más cercanos (por su centro) a cada celda, -1 si
+        no hay ninguno, y la distancia al cuadrado a la selva. Se calcula para todas
+        las celdas a la vez con broadcasting: (ancho, alto, 1) contra (num_terrenos,).
+        """
+        xs = (np.arange(self.grid_width) * self.tamano_celda)[:, None, None]
+        ys = (np.arange(self.grid_height) * self.tamano_celda)[None, :, None]
+
+        def mas_cercano(terrenos):
+            forma = (self.grid_width, self.grid_height)
+            if not terrenos:
+                return np.full(forma, -1, dtype=np.int16), np.zeros(forma, dtype=np.int64)
+            cx = np.array([t.rect.centerx for t in terrenos], dtype=np.int64)
+            cy = np.array([t.rect.centery for t in terrenos], dtype=np.int64)
+            dist_sq = (xs - cx)**2 + (ys - cy)**2
+            indice = dist_sq.argmin(axis=2) # El primero en caso de empate
+            return indice.astype(np.int16), np.take_along_axis(dist_sq, indice[..., None], axis=2)[..., 0]
+
+        self.indice_rio_cercano, _ = mas_cercano(self.terreno["rios"])
+        self.indice_selva_cercana, self.dist_selva_cercana_sq = mas_cercano(self.terreno["selvas"])
+
+    def rio_cercano(self, gx, gy):
+        """Río más cercano a la celda, o None si la celda está fuera del mundo o no hay ríos."""
+        gx, gy = int(gx), int(gy)
+        if not (0 <= gx < self.grid_width and 0 <= gy < self.grid_height):
+            return None
+        i = self.indice_rio_cercano[gx, gy]
+        if i < 0:
+            return None
+        rio = self.terreno["rios"][i]
+        if self.dormancia:
+            self._asentar_recurso(self._recurso_de[rio])
+        return rio
+
+    def selva_cercana(self, gx, gy):
+        """(selva más cercana, distancia al cuadrado) para la celda, o None."""
+        gx, gy = int(gx), int(gy)
+        if not (0 <= gx < self.grid_width and 0 <= gy < self.grid_height):
+            return None
+        i = self.indice_selva_cercana[gx, gy]
+        if i < 0:
+            return None
+        selva = self.terreno["selvas"][i]
+        if self.dormancia:
+            self._asentar_recurso(self._recurso_de[selva])
+        return selva, int(self.dist_selva_cercana_sq[gx, gy])
 
     def _actualizar_clima(self):
-        if random.random() < 0.05:
+        if self.rng.random() < self.prob_sequia:
             self.clima_actual = "Sequía"
         else:
             self.clima_actual = "Normal"
 
-    def _actualizar_grid_animales(self):
-        self.grid_animales.clear()
-        for animal in self.animales:
-            grid_x = int(animal.x // CELL_SIZE)
-            grid_y = int(animal.y // CELL_SIZE)
-            key = (grid_x, grid_y)
-            if key not in self.grid_animales:
-                self.grid_animales[key] = []
-            self.grid_animales[key].append(animal)
+    def registrar_en_rejilla(self, animal):
+        self.rejilla.insertar(animal)
+        if isinstance(animal, Herbivoro):
+            self.rejilla_presas.insertar(animal)
+        animal._hora_actualizada = self.hora_absoluta
+        self._cambiar_de_region(animal, self.region_en(animal.x, animal.y))
+        self.agregados.agregar(animal)
+
+    def _registrar_lote(self, tipo_animal, animales, posiciones):
+        """registrar_en_rejilla de muchos animales nuevos de una especie, con celdas y regiones calculadas de una vez."""
+        xy = np.array(posiciones, dtype=np.int64).reshape(-1, 2)
+        celdas = list(zip(*(xy // self.tamano_celda).T.tolist()))
+        self.rejilla.insertar_lote(animales, celdas)
+        if issubclass(tipo_animal, Herbivoro):
+            self.rejilla_presas.insertar_lote(animales, celdas)
+        rx = np.clip(xy[:, 0] // self._tamano_region_px, 0, self.regiones_x - 1)
+        ry = np.clip(xy[:, 1] // self._tamano_region_px, 0, self.regiones_y - 1)
+        hora = self.hora_absoluta
+        for animal, indice in zip(animales, (rx * self.regiones_y + ry).tolist()):
+            animal._hora_actualizada = hora
+            self._cambiar_de_region(animal, self.regiones[indice])
+            self.agregados.agregar(animal)
+
+    def notificar_movimiento(self, animal):
+        """Llamar tras cambiar la posición de un animal."""
+        self.rejilla.mover(animal)
+        self.rejilla_presas.mover(animal)
+        region = self.region_en(animal.x, animal.y)
+        if region is not animal._region:
+            self._cambiar_de_region(animal, region)
+
+    def notificar_muerte(self, animal):
+        """Saca al animal de las rejillas en cuanto muere (la lista de animales se limpia al final de la hora)."""
+        self.rejilla.quitar(animal)
+        self.rejilla_presas.quitar(animal)
+        if animal._region is not None: # Primera notificación de esta muerte
+            animal._region.quitar(type(animal).__name__)
+            animal._region = None
+            self.agregados.quitar(animal)
 
     def obtener_animales_cercanos(self, x, y, radio=2):
         """Obtiene los animales cercanos a una posición"""
-        grid_x = int(x // CELL_SIZE)
-        grid_y = int(y // CELL_SIZE)
-        cercanos = []
-        for dx in range(-radio, radio + 1):
-            for dy in range(-radio, radio + 1):
-                key = (grid_x + dx, grid_y + dy)
-                if key in self.grid_animales:
-                    cercanos.extend(self.grid_animales[key])
-        return cercanos
+        return list(self.rejilla.cercanos(x, y, radio))
+
+    def buscar_presas(self, x, y, radio=15, k=8):
+        """Herbívoros candidatos a presa: los de los anillos de celdas más cercanos hasta reunir k (o llegar a radio)."""
+        return self.rejilla_presas.buscar(x, y, radio, k)
 
     def get_animal_at(self, pos):
         """Devuelve el primer animal encontrado en la posición del clic."""
@@ -262,114 +692,287 @@ class Ecosistema:
         return None
 
     def simular_hora(self):
-        self._actualizar_grid_animales()
-
         self.hora_actual += 1
+        self.eventos.hora = self.hora_absoluta
 
         if self.hora_actual >= 24:
             self.hora_actual = 0
             self.dia_total += 1
             self._actualizar_clima()
-
-            factor_crecimiento = self.factor_crecimiento_base
-            if self.clima_actual == "Sequía":
-                factor_crecimiento *= 0.1
-
-            for gx in range(self.grid_width):
-                for gy in range(self.grid_height):
-                    if self.is_river[gx][gy]:
-                        self.grid_hierba[gx][gy] = 0
-                        continue
-
-                    tasa_crecimiento_base = 1 
-                    calidad_suelo_local = 1.0
-                    max_capacidad = Terrenos.MAX_HIERBA_NORMAL
-                    tasa_crecimiento_base = 1
-                    
-                    cell_rect = pygame.Rect(gx * CELL_SIZE, gy * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                    pradera_actual = next((p for p in self.terreno["praderas"] if p.rect.colliderect(cell_rect)), None)
-                    if pradera_actual:
-                        max_capacidad = pradera_actual.max_hierba
-                        tasa_crecimiento_base = pradera_actual.tasa_crecimiento
-                    crecimiento_real = int(tasa_crecimiento_base * factor_crecimiento * (1 - self.grid_hierba[gx][gy] / max_capacidad))
-                    self.grid_hierba[gx][gy] += crecimiento_real
-                    self.grid_hierba[gx][gy] = min(self.grid_hierba[gx][gy], max_capacidad)
-            
-            for selva in self.terreno["selvas"]: selva.crecer_recursos(factor_crecimiento)
-            for rio in self.terreno["rios"]: rio.crecer_recursos(factor_crecimiento)
-
-            for c in self.recursos["carcasas"]: c.dias_descomposicion += 1
-            self.recursos["carcasas"] = [c for c in self.recursos["carcasas"] if c.dias_descomposicion < 5]
-
-            for animal in self.animales:
-                animal._edad += 1
-
             self.animales_nuevos = []
+        # Lo programado para esta hora: crecimiento al empezar el día, carcasas que desaparecen...
+        # (la edad de los animales no se incrementa: se calcula desde su día de nacimiento)
+        self.calendario.ejecutar_hasta(self.hora_absoluta)
 
         self.animales.extend(self.animales_nuevos)
         
+        hora = self.hora_absoluta
+        if self.dormancia and (hora % HORAS_DORMIDA == 0 or self._recalcular_dormancia):
+            self._actualizar_dormancia()
+        if self.planificador is not None:
+            self.planificador.preparar_hora(self._candidatos_decision(), hora)
+
         # Actualizar estado de cada animal
-        for animal in self.animales:
-            animal.actualizar(self)
+        if self.almacen is not None:
+            self._actualizar_animales_soa()
+        elif self.dormancia:
+            self._actualizar_animales_por_regiones(hora)
+        elif self.cinetico:
+            self._actualizar_animales_por_tramos(hora)
+        else:
+            for animal in self.animales:
+                animal.actualizar(self)
 
         # Eliminar animales muertos de la simulación
+        for animal in self.animales:
+            if not animal.esta_vivo:
+                self.notificar_muerte(animal)
+                if self.almacen is not None:
+                    self.almacen.quitar(animal)
         self.animales = [animal for animal in self.animales if animal.esta_vivo]
 
         # Actualizar peces en cada río
-        for rio in self.terreno["rios"]:
-            for pez in rio.peces:
-                pez.actualizar()
-        
+        if self.dormancia:
+            for recurso in self.recursos_regionales:
+                if recurso.activo():
+                    recurso.asentar_horas(hora)
+        else:
+            for rio in self.terreno["rios"]:
+                rio.actualizar_peces()
+
+    def _candidatos_decision(self):
+        """Animales vivos que deambulan con hambre: los que tienen una decisión que tomar."""
+        if self.almacen is not None:
+            return [self.almacen.animales[i] for i in np.flatnonzero(self.almacen.mascara_decision())]
+        return [animal for animal in self.animales
+                if animal.esta_vivo and animal.estado is Estado.DEAMBULANDO and not animal.en_reposo()]
+
+    def _actualizar_animales_por_regiones(self, hora):
+        """
+        Los animales de regiones despiertas se actualizan cada hora; los de regiones
+        dormidas, cada HORAS_DORMIDA horas (escalonadas por región) y de golpe.
+        """
+        for animal in self.animales:
+            region = animal._region
+            if region is not None and region.dormida:
+                if (hora + region.indice) % HORAS_DORMIDA:
+                    continue
+                animal.actualizar_dormido(self, hora - animal._hora_actualizada)
+            else:
+                animal.actualizar(self)
+            animal._hora_actualizada = hora
+
+    def _actualizar_animales_por_tramos(self, hora):
+        """
+        Modo cinético: un animal en medio de un tramo no se toca hasta la hora en que
+        termina (su posición y su energía se calculan al pedirlas). Los que deambulan
+        saciados empiezan un tramo nuevo; el resto se actualiza hora a hora. Los
+        cambios de celda de los tramos de esta hora se aplican a la rejilla al final.
+        _hora_actualizada marca a quién le ha tocado ya en esta hora, para que el tramo
+        de un animal que aún espera su turno dé la posición de antes de su paso.
+        """
+        for animal in self.animales:
+            tramo = animal._tramo
+            if tramo is not None:
+                if hora < tramo.fin:
+                    animal._hora_actualizada = hora
+                    continue
+                animal.asentar_tramo()
+            if not (animal.esta_vivo and animal.en_reposo() and animal.iniciar_tramo(hora)):
+                animal.actualizar(self)
+            animal._hora_actualizada = hora
+        self.cruces_tramos.ejecutar_hasta(hora)
+
+    def _actualizar_animales_soa(self):
+        """
+        Hora de los animales con el backend SoA: los que deambulan saciados se mueven y
+        gastan energía en lote; el resto, agrupados por (dieta, estado), sigue la
+        máquina de estados de Comportamiento.
+
+        No sigue el orden de la lista: primero van los grupos (en el orden en que aparece
+        cada uno) y después el lote. Como los animales comparten el generador aleatorio,
+        la hierba y las presas, el resultado no coincide con el de la misma semilla sin
+        SoA; sí se repite exactamente entre ejecuciones con SoA.
+        """
+        lote = self.almacen.mascara_lote()
+        n = len(lote)
+        resto = [animal for animal in self.animales if animal._indice >= n or not lote[animal._indice]]
+        for clave, grupo in agrupar_por_estado(resto).items():
+            actualizar_grupo(clave, grupo, self)
+
+        # Una presa del lote puede haber muerto durante la fase por objeto
+        indices = self.almacen.vivos(np.flatnonzero(lote))
+        for i in self.almacen.deambular_lote(indices, BORDE_MARGEN, self.ancho - BORDE_MARGEN, BORDE_MARGEN, self.alto - BORDE_MARGEN, self.tamano_celda):
+            self.notificar_movimiento(self.almacen.animales[i])
+        self.almacen.consumir_energia_lote(indices, Animal.COSTE_ENERGIA_HORA)
+
     def _obtener_posicion_inicial(self, tipo_animal):
         """Determina la posición inicial para un nuevo animal basado en su tipo."""
-        intentos = 0
-        center_x = SIM_WIDTH // 2
-        center_y = SCREEN_HEIGHT // 2
-        thickness = 60
-        
-        rio_borde_izq = center_x - thickness // 2
-        rio_borde_der = center_x + thickness // 2
-        rio_borde_sup = center_y - thickness // 2
-
-        while intentos < 100:
-            if issubclass(tipo_animal, Carnivoro):
-                # Cuadrante superior izquierdo
-                x = random.randint(BORDE_MARGEN, rio_borde_izq - BORDE_MARGEN)
-                y = random.randint(BORDE_MARGEN, rio_borde_sup - BORDE_MARGEN)
-            elif issubclass(tipo_animal, Herbivoro):
-                # Cuadrante inferior
-                x = random.randint(BORDE_MARGEN, SIM_WIDTH - BORDE_MARGEN)
-                y = random.randint(rio_borde_sup + thickness, SCREEN_HEIGHT - BORDE_MARGEN)
-            elif issubclass(tipo_animal, Omnivoro):
-                # Cuadrante superior derecho
-                x = random.randint(rio_borde_der + BORDE_MARGEN, SIM_WIDTH - BORDE_MARGEN)
-                y = random.randint(BORDE_MARGEN, rio_borde_sup - BORDE_MARGEN)
-            
-            if not self.choca_con_terreno(x, y) and not any(rio.rect.collidepoint(x, y) for rio in self.terreno["rios"]):
+        x_min, x_max, y_min, y_max = self.zonas_aparicion[tipo_animal.DIETA]
+
+        for _ in range(100):
+            x = self.rng.randint(x_min, x_max)
+            y = self.rng.randint(y_min, y_max)
+            if not self._obstaculos_en(x, y) & (OBSTACULO_TRONCO | OBSTACULO_RIO):
                 return x, y
-            intentos += 1
-        return random.randint(20, SIM_WIDTH - 20), random.randint(20, SCREEN_HEIGHT - 20) # Fallback
+        return self.rng.randint(20, self.ancho - 20), self.rng.randint(20, self.alto - 20) # Fallback
 
-    def agregar_animal(self, tipo_animal, nombre=None, es_cria=False, pos=None):
-        if es_cria:
-            if pos:
-                # La cría aparece cerca de la madre
-                x = pos[0] + random.randint(-10, 10)
-                y = pos[1] + random.randint(-10, 10)
-            else: # Fallback si no se da posición
-                x, y = self._obtener_posicion_inicial(tipo_animal)
-            nombre = f"Cría de {tipo_animal.__name__}"
-            nuevo_animal = tipo_animal(nombre, x, y, edad=-1) # Edad -1 para que en el siguiente ciclo de día se ponga a 0
-        else:
-            if nombre is None:
+    def _celdas_aparicion(self, dieta):
+        """
+        Celdas (gx, gy) de la zona de aparición de la dieta sin troncos ni río en
+        ninguno de sus píxeles. Se calculan una vez y se olvidan al plantar un árbol.
+        """
+        celdas = self._celdas_libres.get(dieta)
+        if celdas is None:
+            x_min, x_max, y_min, y_max = self.zonas_aparicion[dieta]
+            c = self.tamano_celda
+            gx0, gx1 = -(-x_min // c), (x_max + 1) // c
+            gy0, gy1 = -(-y_min // c), (y_max + 1) // c
+            if gx1 <= gx0 or gy1 <= gy0:
+                celdas = np.empty((0, 2), dtype=np.int64)
+            else:
+                ocupada = self.mascara_obstaculos[gx0:gx1, gy0:gy1] & (OBSTACULO_TRONCO | OBSTACULO_RIO) != 0
+                celdas = np.argwhere(~ocupada) + (gx0, gy0)
+            self._celdas_libres[dieta] = celdas
+        return celdas
+
+    def _posiciones_aparicion(self, tipo_animal, cantidad):
+        """cantidad posiciones al azar en las celdas libres de la zona de la dieta del animal."""
+        celdas = self._celdas_aparicion(tipo_animal.DIETA)
+        if len(celdas) == 0: # Zona sin celdas libres (mundos muy pequeños): posición a posición
+            return [self._obtener_posicion_inicial(tipo_animal) for _ in range(cantidad)]
+        generador = np.random.default_rng(self.rng.getrandbits(64)) # Sigue dependiendo solo de la semilla
+        elegidas = celdas[generador.integers(len(celdas), size=cantidad)] * self.tamano_celda
+        elegidas += generador.integers(self.tamano_celda, size=(cantidad, 2))
+        return elegidas.tolist()
+
+    def agregar_animales(self, tipo_animal, cantidad, posiciones=None, es_cria=False):
+        """
+        Crea y registra cantidad animales de una especie de una vez. Sin posiciones,
+        se reparten por las celdas libres de la zona de su dieta. Es el camino de
+        todas las altas: población inicial, botones de la interfaz y nacimientos.
+        """
+        if posiciones is None:
+            posiciones = self._posiciones_aparicion(tipo_animal, cantidad)
+        nuevos = []
+        for x, y in posiciones:
+            if es_cria:
+                # Edad -1 para que en el siguiente ciclo de día se ponga a 0
+                nuevos.append(tipo_animal(f"Cría de {tipo_animal.__name__}", x, y, edad=-1, rng=self.rng))
+            else:
                 nombre = f"{tipo_animal.__name__} {getattr(tipo_animal, 'contador', 0) + 1}"
-            x, y = self._obtener_posicion_inicial(tipo_animal)
-            nuevo_animal = tipo_animal(nombre, x, y)
-            
-        nuevo_animal.ecosistema = self # Asignar referencia al ecosistema
-        self.animales.append(nuevo_animal)
+                nuevos.append(tipo_animal(nombre, x, y, rng=self.rng))
+
+        for animal in nuevos:
+            animal.ecosistema = self
+        self._registrar_lote(tipo_animal, nuevos, posiciones)
+        if self.almacen is not None:
+            self.almacen.agregar_lote(nuevos)
+        self.animales.extend(nuevos)
+        return nuevos
+
+    def agregar_animal(self, tipo_animal, nombre=None, es_cria=False, pos=None):
+        posiciones = None
+        if es_cria and pos:
+            # La cría aparece cerca de la madre
+            posiciones = [(pos[0] + self.rng.randint(-10, 10), pos[1] + self.rng.randint(-10, 10))]
+        nuevo_animal = self.agregar_animales(tipo_animal, 1, posiciones, es_cria)[0]
+        if nombre is not None:
+            nuevo_animal._nombre = nombre
         # Devolvemos el animal para que el controlador pueda gestionar efectos (como el sonido)
         return nuevo_animal
+
+    def poblar(self, cantidad_por_especie=2, cantidades=None):
+        """
+        Añade la población inicial: la misma cantidad de cada especie, salvo las que
+        aparezcan en cantidades ({nombre de la especie: cantidad}). Devuelve los animales creados.
+        """
+        cantidades = cantidades or {}
+        nuevos = []
+        for tipo in self.tipos_de_animales:
+            nuevos.extend(self.agregar_animales(tipo, cantidades.get(tipo.__name__, cantidad_por_especie)))
+        return nuevos
+
+    @property
+    def hora_absoluta(self):
+        """Horas simuladas desde el inicio (día 1, 00:00)."""
+        return (self.dia_total - 1) * 24 + self.hora_actual
+
+    def aplicar_comando(self, tipo, *args):
+        """
+        Aplica una acción de la interfaz y la anota en registro_comandos con la hora
+        en que se aplicó, para poder repetir la partida sin pantalla (run.py --replay).
+        Los animales se identifican por su posición en self.animales.
+        """
+        self.registro_comandos.append([self.hora_absoluta, tipo, *args])
+        self.eventos.hora = self.hora_absoluta
+        self._recalcular_dormancia = True
+        for animal in self.animales: # Los comandos cambian estados y energía: sin tramos a medias
+            animal.asentar_tramo()
+        if tipo == "poblar":
+            return self.poblar(*args)
+        if tipo == "agregar":
+            tipos = {t.__name__: t for t in self.tipos_de_animales}
+            return self.agregar_animal(tipos[args[0]])
+        if tipo == "modo_caza":
+            return self.activar_modo_caza_carnivoro(forzar_estado=args[0])
+        if tipo == "alimentar":
+            return self.alimentar_herbivoros()
+        if tipo == "reproducir":
+            animal, pareja = self.animales[args[0]], self.animales[args[1]]
+            return animal.buscar_pareja_para_reproducir(pareja)
+        raise ValueError(f"Comando desconocido: {tipo}")
+
+    def alimentar_herbivoros(self):
+        """Da la orden de comer a todos los herbívoros y omnívoros con baja energía."""
+        for animal in self.animales:
+            if not isinstance(animal, Carnivoro) and (animal.energia / animal.max_energia) < 0.8:
+                animal.buscar_comida(forzado=True)
+
+    def terreno_estatico(self):
+        """TerrenoEstatico del mundo; se crea una vez y lo comparten todas las instantáneas."""
+        if self._terreno_estatico is None:
+            nombres = ("praderas", "selvas", "santuarios", "santuarios_especiales", "montanas", "rios")
+            self._terreno_estatico = TerrenoEstatico(
+                ancho=self.ancho,
+                alto=self.alto,
+                zonas={nombre: tuple(pygame.Rect(t.rect) for t in self.terreno[nombre]) for nombre in nombres},
+                puentes=tuple(self.terreno["puentes"]),
+                decoraciones={clave: tuple(self.terreno[clave]) for clave in ("arboles", "plantas", "plantas_2")}
+            )
+        return self._terreno_estatico
+
+    def _animal_seleccionado(self, animal):
+        """AnimalSeleccionado del animal, o None si no hay animal o ha muerto."""
+        if animal is None or not animal.esta_vivo:
+            return None
+        return AnimalSeleccionado(animal.x, animal.y, animal.nombre, animal.__class__.__name__,
+                                  animal.energia, animal.max_energia, animal.edad, animal.estado.value)
+
+    def crear_instantanea(self, seleccionado=None, pareja=None):
+        """
+        Copia inmutable y compacta del estado visible (posiciones, especies, recursos y
+        reloj), con los datos de los animales seleccionados en la interfaz.
+        """
+        animales = [AnimalVisible(a.x, a.y, a.__class__.__name__, a.DIETA, a.energia / a.max_energia, a) for a in self.animales]
+        herb, carn, omni = self.agregados.dietas()
+        return Instantanea(
+            dia_total=self.dia_total,
+            hora_actual=self.hora_actual,
+            clima_actual=self.clima_actual,
+            modo_caza_carnivoro_activo=self.modo_caza_carnivoro_activo,
+            animales=tuple(animales),
+            carcasas=tuple((c.x, c.y, self.dias_descomposicion(c)) for c in self.recursos["carcasas"]),
+            peces=tuple((int(x), int(y)) for r in self.terreno["rios"] for x, y in r.posiciones_peces()),
+            herbivoros=herb,
+            carnivoros=carn,
+            omnivoros=omni,
+            bayas=self.agregados.bayas(),
+            terreno=self.terreno_estatico(),
+            seleccionado=self._animal_seleccionado(seleccionado),
+            pareja=self._animal_seleccionado(pareja)
+        )
+
     def activar_modo_caza_carnivoro(self, forzar_estado=None):
         if forzar_estado is not None:
             self.modo_caza_carnivoro_activo = forzar_estado
@@ -381,39 +984,51 @@ class Ecosistema:
                 
                 if self.modo_caza_carnivoro_activo:
                     # Encontrar el puente más cercano para cruzar
-                    puentes_caza = [p for p in self.terreno["puentes"] if p[1] > 300] # Puentes horizontales
+                    # Puentes de los brazos horizontales (los que llevan a la zona de herbívoros)
+                    centro_y = self._geometria_rios()[1]
+                    puentes_caza = [p for p in self.terreno["puentes"] if p[1] == centro_y]
                     if not puentes_caza:
                         animal.objetivo_puente = None
                     else:
                         puente_cercano = min(puentes_caza, key=lambda p: (animal.x - p[0])**2 + (animal.y - p[1])**2)
                         animal.objetivo_puente = puente_cercano
 
-                    print(f"{animal.nombre} entra en modo caza y se dirige a la zona de herbívoros.")
+                    self.eventos.emitir(DECISION, animal.nombre, detalle="entra en modo caza y se dirige a la zona de herbívoros")
                     if animal.objetivo_puente:
-                        animal.estado = "yendo_a_cazar"
+                        animal.estado = Estado.YENDO_A_CAZAR
                     else: # Si no hay puentes, deambula como antes
-                        animal.estado = "deambulando"
+                        animal.estado = Estado.DEAMBULANDO
                 else:
-                    print(f"{animal.nombre} sale del modo caza y regresa a su territorio.")
+                    self.eventos.emitir(DECISION, animal.nombre, detalle="sale del modo caza y regresa a su territorio")
                     # Usar el puente que cruzó para regresar, si lo recuerda
                     animal.objetivo_puente = animal.puente_cruzado
                     if animal.objetivo_puente:
-                        animal.estado = "regresando_de_cazar"
+                        animal.estado = Estado.REGRESANDO_DE_CAZAR
                     else:
-                        animal.estado = "regresando_a_zona"
+                        animal.estado = Estado.REGRESANDO_A_ZONA
                     animal.objetivo_comida = None # Cancela cualquier caza actual
 
     def to_dict(self, sim_speed_multiplier=None, autosave_interval=None):
         """Convierte el estado del ecosistema a un diccionario serializable."""
+        if self.dormancia:
+            self.asentar_regiones()
         cantidad_plantas = (
             len(self.terreno.get("arboles", [])) +
             len(self.terreno.get("plantas", [])) +
             len(self.terreno.get("plantas_2", []))
         )
-        cantidad_peces = sum(len(r.peces) for r in self.terreno.get("rios", []))
-        cantidad_total_animales = len(self.animales) + cantidad_peces
+        cantidad_total_animales = self.agregados.total + self.agregados.peces()
         return {
             "fecha_guardado": datetime.now().isoformat(),
+            "semilla": self.semilla,
+            "ancho": self.ancho,
+            "alto": self.alto,
+            "tamano_celda": self.tamano_celda,
+            "dormancia": self.dormancia,
+            "cinetico": self.cinetico,
+            "fases_decision": self.fases_decision,
+            "presupuesto_decisiones": self.presupuesto_decisiones,
+            "rng_estado": list(self.rng.getstate()),
             "dia_total": self.dia_total,
             "hora_actual": self.hora_actual,
             "cantidad_animales": cantidad_total_animales,
@@ -423,10 +1038,13 @@ class Ecosistema:
                 "sim_speed_multiplier": sim_speed_multiplier,
                 "autosave_interval": autosave_interval
             },
-            "grid_hierba": self.grid_hierba,
+            "grid_hierba": self.hierba.valores().tolist(),
             "clima_actual": self.clima_actual,
             "selvas": [{"rect": list(s.rect), "bayas": s.bayas} for s in self.terreno["selvas"]],
-            "rios": [{"rect": list(r.rect), "peces": [{"x": p.x, "y": p.y, "energia": p.energia} for p in r.peces]} for r in self.terreno["rios"]],
+            "rios": [
+                {"rect": list(r.rect), "peces": [{"x": x, "y": y, "energia": e} for (x, y), e in zip(r.posiciones_peces(), r.peces_energia[:r.num_peces].tolist())]}
+                for r in self.terreno["rios"]
+            ],
             "arboles": [list(t) for t in self.terreno.get("arboles", [])],
             "plantas": [list(p) for p in self.terreno.get("plantas", [])],
             "plantas_2": [list(p) for p in self.terreno.get("plantas_2", [])],
@@ -440,18 +1058,26 @@ class Ecosistema:
                 }
                 for a in self.animales
             ],
-            "carcasas": [{"x": c.x, "y": c.y, "energia_restante": c.energia_restante, "dias": c.dias_descomposicion} for c in self.recursos["carcasas"]]
+            "carcasas": [{"x": c.x, "y": c.y, "energia_restante": c.energia_restante, "dias": self.dias_descomposicion(c)} for c in self.recursos["carcasas"]]
         }
 
     @classmethod
     def from_dict(cls, data):
         """Crea una instancia de Ecosistema a partir de un diccionario."""
-        ecosistema = cls() # Crea una nueva instancia con valores por defecto
+        # Sin pasar por __init__: nada se genera al azar para luego tirarlo, cada
+        # estructura se construye una vez a partir de lo que hay en el archivo
+        ecosistema = cls.__new__(cls)
+        ecosistema._iniciar_estado(usar_soa=False, semilla=data.get("semilla"),
+                                   ancho=data.get("ancho", SIM_WIDTH), alto=data.get("alto", SCREEN_HEIGHT),
+                                   tamano_celda=data.get("tamano_celda", CELL_SIZE), dormancia=data.get("dormancia", False),
+                                   cinetico=data.get("cinetico", False), fases_decision=data.get("fases_decision", 1),
+                                   presupuesto_decisiones=data.get("presupuesto_decisiones"))
+        ecosistema._crear_rios_y_puentes(peces_iniciales=False)
+        ecosistema.reproducible = False
 
         # Cargar estado simple
         ecosistema.dia_total = data.get("dia_total", 1)
         ecosistema.hora_actual = data.get("hora_actual", 0)
-        ecosistema.grid_hierba = data.get("grid_hierba", ecosistema.grid_hierba)
         ecosistema.clima_actual = data.get("clima_actual", ecosistema.clima_actual)
         ecosistema.modo_caza_carnivoro_activo = data.get("modo_caza_carnivoro_activo", False)
 
@@ -469,47 +1095,31 @@ class Ecosistema:
         for i, r_data in enumerate(data.get("rios", [])):
             if i >= len(ecosistema.terreno["rios"]): continue
             rio = ecosistema.terreno["rios"][i]
-            rio.peces = []
             for p_data in r_data.get("peces", []):
-                pez = Pez(p_data["x"], p_data["y"], rio)
-                pez.energia = p_data.get("energia", 50)
-                rio.peces.append(pez)
+                rio.agregar_pez(p_data["x"], p_data["y"], p_data.get("energia", Rio.ENERGIA_PEZ))
 
         # Restaurar decoraciones (árboles, plantas, puentes) si están en el archivo
-        if "arboles" in data:
-            ecosistema.terreno["arboles"] = [tuple(p) for p in data.get("arboles", [])]
-        if "plantas" in data:
-            ecosistema.terreno["plantas"] = [tuple(p) for p in data.get("plantas", [])]
-        if "plantas_2" in data:
-            ecosistema.terreno["plantas_2"] = [tuple(p) for p in data.get("plantas_2", [])]
         if "puentes" in data:
             ecosistema.terreno["puentes"] = [tuple(p) for p in data.get("puentes", [])]
+        ecosistema.terreno["arboles"] = [tuple(p) for p in data.get("arboles", [])]
+        ecosistema.terreno["plantas"] = [tuple(p) for p in data.get("plantas", [])]
+        ecosistema.terreno["plantas_2"] = [tuple(p) for p in data.get("plantas_2", [])]
 
-        # Recalcular la rejilla de tipo de terreno e indicadores de río (no sobreescribimos grid_hierba)
-        ecosistema.terrain_grid = [[None for _ in range(ecosistema.grid_height)] for _ in range(ecosistema.grid_width)]
-        ecosistema.is_river = [[False for _ in range(ecosistema.grid_height)] for _ in range(ecosistema.grid_width)]
-        terrain_hierarchy = [
-            ("montanas", "montana"),
-            ("santuarios", "santuario"),
-            ("santuarios_especiales", "santuario_1"), # Añadimos la nueva jerarquía
-            ("selvas", "selva"),
-            ("praderas", "pradera")
-        ]
-        for gx in range(ecosistema.grid_width):
-            for gy in range(ecosistema.grid_height):
-                cell_rect = pygame.Rect(gx * CELL_SIZE, gy * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                if any(rio.rect.colliderect(cell_rect) for rio in ecosistema.terreno["rios"]):
-                    ecosistema.terrain_grid[gx][gy] = "rio"
-                    ecosistema.is_river[gx][gy] = True
-                    continue
-                for terrain_list_name, terrain_type_name in terrain_hierarchy:
-                    if any(t.rect.colliderect(cell_rect) for t in ecosistema.terreno[terrain_list_name]):
-                        ecosistema.terrain_grid[gx][gy] = terrain_type_name
-                        break
+        # Rejillas de terreno, ríos, capacidades y máscara de obstáculos (con los árboles cargados)
+        ecosistema._construir_rejillas_terreno()
+        if "arboles" not in data:
+            # Partida antigua sin decoraciones guardadas: se generan
+            ecosistema._poblar_decoraciones()
+
+        # Restaurar la hierba guardada si coincide con el tamaño de la rejilla
+        grid_hierba = np.array(data.get("grid_hierba", []), dtype=np.int32)
+        if grid_hierba.shape == (ecosistema.grid_width, ecosistema.grid_height):
+            ecosistema.hierba = RejillaHierba(grid_hierba, ecosistema.tasa_hierba, ecosistema.capacidad_hierba)
+        else:
+            ecosistema._generar_hierba_inicial()
 
-        # Actualizar caché de terrenos cercanos
-        ecosistema.terrain_cache = {"rio": {}, "selva": {}}
         ecosistema._precalcular_terrenos_cercanos()
+        ecosistema._crear_regiones()
 
         # Cargar animales
         ecosistema.animales = []
@@ -519,15 +1129,25 @@ class Ecosistema:
             if tipo_clase:
                 animal = tipo_clase(a_data["nombre"], a_data["x"], a_data["y"], 
                                     a_data.get("edad", 0), a_data.get("energia", 100), 
-                                    max_energia=a_data.get("max_energia"))
-                animal.estado = a_data.get("estado", "deambulando")
+                                    max_energia=a_data.get("max_energia"), rng=ecosistema.rng)
+                animal.estado = Estado.desde_texto(a_data.get("estado", "deambulando"))
+                animal.ecosistema = ecosistema
                 ecosistema.animales.append(animal)
+                ecosistema.registrar_en_rejilla(animal)
         
         # Cargar carcasas
         ecosistema.recursos["carcasas"] = []
         for c_data in data.get("carcasas", []):
-            carcasa = Carcasa(c_data["x"], c_data["y"], c_data.get("energia_restante", 60))
-            carcasa.dias_descomposicion = c_data.get("dias", 0)
-            ecosistema.recursos["carcasas"].append(carcasa)
+            ecosistema.agregar_carcasa(c_data["x"], c_data["y"], c_data.get("energia_restante", 60),
+                                       dia_aparicion=ecosistema.dia_total - c_data.get("dias", 0))
+        ecosistema._programar_crecimiento()
+
+        # Continuar la secuencia aleatoria donde se guardó (después de crear los animales,
+        # que también consumen números aleatorios)
+        if "semilla" in data:
+            ecosistema.semilla = data["semilla"]
+        if "rng_estado" in data:
+            version, estado, gauss = data["rng_estado"]
+            ecosistema.rng.setstate((version, tuple(estado), gauss))
 
         return ecosistema, sim_speed_multiplier, autosave_interval
\ No newline at end of file
@@ -0,0 +1,58 @@
+UMBRAL_URGENTE = 0.3 # Fracción de max_energia por debajo de la cual un animal decide sin esperar a su fase
+
+
+class PlanificadorDecisiones:
+    """
+    Reparte las decisiones de los animales (buscar presas, ir al río, buscar hierba)
+    entre las horas para que su coste por hora sea predecible.
+
+    Los animales se reparten en fases grupos: cada uno toma sus decisiones solo en
+    las horas de su fase (una de cada fases) y el resto del tiempo sigue con lo que
+    estaba haciendo (deambular, ir hacia su objetivo...). Deciden sin esperar los
+    urgentes: con poca energía (UMBRAL_URGENTE) o cuya presa ha muerto. Como mucho
+    se toman presupuesto decisiones por hora; las que no caben se aplazan y tienen
+    prioridad la hora siguiente (por detrás de las urgentes).
+
+    Solo cuentan los animales que tienen algo que decidir (deambulando con hambre):
+    los saciados no deciden nada y no gastan presupuesto.
+    """
+    def __init__(self, fases=1, presupuesto=None):
+        self.fases = max(1, fases)
+        self.presupuesto = presupuesto
+        self._siguiente_fase = 0
+        self._permitidos = set() # Animales que pueden decidir en la hora en curso
+        self.decisiones = 0 # Totales, para estadísticas
+        self.aplazadas = 0
+
+    def _fase(self, animal):
+        """Fase del animal; se asigna por turnos la primera vez que tiene algo que decidir."""
+        if animal._fase_decision is None:
+            animal._fase_decision = self._siguiente_fase
+            self._siguiente_fase = (self._siguiente_fase + 1) % self.fases
+        return animal._fase_decision
+
+    def preparar_hora(self, candidatos, hora):
+        """Elige, entre los candidatos (animales con una decisión que tomar), los que deciden en esta hora."""
+        urgentes, pendientes, en_fase = [], [], []
+        for animal in candidatos:
+            if animal._decision_urgente or animal.energia < animal.max_energia * UMBRAL_URGENTE:
+                urgentes.append(animal)
+            elif animal._decision_pendiente:
+                pendientes.append(animal)
+            elif (hora - self._fase(animal)) % self.fases == 0:
+                en_fase.append(animal)
+
+        elegidos = urgentes + pendientes + en_fase
+        if self.presupuesto is not None and len(elegidos) > self.presupuesto:
+            for animal in elegidos[self.presupuesto:]:
+                animal._decision_pendiente = True
+            self.aplazadas += len(elegidos) - self.presupuesto
+            elegidos = elegidos[:self.presupuesto]
+        for animal in elegidos:
+            animal._decision_pendiente = False
+            animal._decision_urgente = False
+        self._permitidos = set(elegidos)
+        self.decisiones += len(elegidos)
+
+    def puede_decidir(self, animal):
+        return animal in self._permitidos
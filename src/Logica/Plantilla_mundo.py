@@ -0,0 +1,124 @@
+"""
+Caché de plantillas de mundo.
+
+Una plantilla es todo lo que Ecosistema calcula antes de tener animales: rejillas de
+terreno, hierba inicial, decoraciones, terrenos cercanos, peces iniciales y el estado
+del generador aleatorio al terminar (la máscara de obstáculos se reconstruye con los
+árboles). Solo depende del diseño del mapa, la semilla, CELL_SIZE y el código que
+genera el mundo, así que un mundo nuevo (o reiniciado) con la misma clave copia la
+plantilla en lugar de volver a generarlo.
+
+Las plantillas se guardan en memoria. Con activar_cache_en_disco (opción
+--world-cache) las de semillas elegidas a propósito se guardan también en una
+carpeta del usuario, para que otras ejecuciones con esa semilla las reutilicen. Se
+leen con pickle: la carpeta no debe ser compartida con otros usuarios.
+"""
+import hashlib
+import os
+import pickle
+
+# Código del que depende el mundo generado: si cambia, cambia la clave y las plantillas viejas no se usan
+ARCHIVOS_GENERACION = ("Plantilla_mundo.py", "Logica.py",
+                       os.path.join("Terrenos", "Terrenos.py"),
+                       os.path.join("Terrenos", "Hierba.py"),
+                       os.path.join("Terrenos", "Muestreo_poisson.py"))
+MAX_EN_MEMORIA = 8
+MAX_EN_DISCO = 64
+
+_plantillas = {} # clave -> plantilla, de la más antigua a la más reciente
+_directorio_cache = None # Sin carpeta: solo en memoria
+_version = None
+
+
+def directorio_cache_usuario():
+    """Carpeta de plantillas por defecto: $XDG_CACHE_HOME/ecosistema/mundos (o ~/.cache/...)."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "ecosistema", "mundos")
+
+
+def activar_cache_en_disco(directorio=None):
+    """Guarda y busca también las plantillas en directorio (por defecto, directorio_cache_usuario())."""
+    global _directorio_cache
+    _directorio_cache = directorio or directorio_cache_usuario()
+
+
+def version_plantilla():
+    """Huella del código que genera el mundo (ARCHIVOS_GENERACION); se calcula una vez."""
+    global _version
+    if _version is None:
+        huella = hashlib.sha1()
+        carpeta = os.path.dirname(os.path.abspath(__file__))
+        for nombre in ARCHIVOS_GENERACION:
+            with open(os.path.join(carpeta, nombre), "rb") as f:
+                huella.update(f.read())
+        _version = huella.hexdigest()
+    return _version
+
+
+def clave_plantilla(diseno, semilla, tamano_celda):
+    texto = repr((version_plantilla(), diseno, semilla, tamano_celda))
+    return hashlib.sha1(texto.encode("utf-8")).hexdigest()
+
+
+def _ruta(clave):
+    return os.path.join(_directorio_cache, clave + ".pkl")
+
+
+def _recordar(clave, plantilla):
+    _plantillas.pop(clave, None)
+    _plantillas[clave] = plantilla
+    while len(_plantillas) > MAX_EN_MEMORIA:
+        del _plantillas[next(iter(_plantillas))]
+
+
+def obtener_plantilla(clave):
+    """Devuelve la plantilla de la clave (memoria o disco), o None si no existe."""
+    plantilla = _plantillas.get(clave)
+    if plantilla is not None:
+        _recordar(clave, plantilla)
+        return plantilla
+    if _directorio_cache is None:
+        return None
+    ruta = _ruta(clave)
+    if not os.path.exists(ruta):
+        return None
+    try:
+        with open(ruta, "rb") as f:
+            plantilla = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError) as e:
+        print(f"No se pudo leer la plantilla de mundo {ruta}: {e}")
+        return None
+    _recordar(clave, plantilla)
+    return plantilla
+
+
+def guardar_plantilla(clave, plantilla, en_disco=True):
+    """Guarda la plantilla en memoria y, si en_disco y hay carpeta de caché, también en ella (escritura atómica)."""
+    _recordar(clave, plantilla)
+    if not en_disco or _directorio_cache is None:
+        return
+    ruta = _ruta(clave)
+    ruta_temporal = f"{ruta}.{os.getpid()}.tmp" # Varios procesos del ensamble pueden escribir a la vez
+    try:
+        os.makedirs(_directorio_cache, mode=0o700, exist_ok=True)
+        with open(ruta_temporal, "wb") as f:
+            pickle.dump(plantilla, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(ruta_temporal, ruta)
+        _limpiar_disco()
+    except OSError as e:
+        print(f"No se pudo guardar la plantilla de mundo {ruta}: {e}")
+        if os.path.exists(ruta_temporal):
+            os.remove(ruta_temporal)
+
+
+def _limpiar_disco():
+    """Borra las plantillas más antiguas si hay más de MAX_EN_DISCO."""
+    archivos = [os.path.join(_directorio_cache, a) for a in os.listdir(_directorio_cache) if a.endswith(".pkl")]
+    if len(archivos) <= MAX_EN_DISCO:
+        return
+    archivos.sort(key=os.path.getmtime)
+    for ruta in archivos[:-MAX_EN_DISCO]:
+        try:
+            os.remove(ruta)
+        except OSError:
+            pass # Otro proceso ya la ha borrado
@@ -0,0 +1,58 @@
+from .Terrenos.Terrenos import Rio
+
+TAMANO_REGION = 16 # Celdas por lado de cada región (más que el radio de búsqueda de presas)
+HORAS_DORMIDA = 4 # Cada cuántas horas se actualizan los animales de una región dormida
+
+
+class Region:
+    """
+    Trozo fijo del mapa de TAMANO_REGION x TAMANO_REGION celdas. Una región sin
+    animales activos cerca duerme: los recursos que solo tocan regiones dormidas dejan
+    de crecer hasta que se asientan al despertar (o al leerlos), y sus animales se
+    actualizan cada HORAS_DORMIDA horas. (La hierba ya se calcula celda a celda al leerla.)
+
+    Guarda un resumen barato de los animales por especie; la hierba total la da
+    Ecosistema.hierba_region.
+    """
+    def __init__(self, indice, gx0, gx1, gy0, gy1):
+        self.indice = indice
+        self.celdas = (slice(gx0, gx1), slice(gy0, gy1)) # Para indexar las rejillas [gx, gy]
+        self.vecinas = [] # Ella misma y las regiones de alrededor
+        self.recursos = [] # RecursoRegional que la tocan
+        self.dormida = False
+        self.poblacion = {} # Nombre de la especie -> animales en la región
+
+    def agregar(self, especie):
+        self.poblacion[especie] = self.poblacion.get(especie, 0) + 1
+
+    def quitar(self, especie):
+        restantes = self.poblacion[especie] - 1
+        if restantes:
+            self.poblacion[especie] = restantes
+        else:
+            del self.poblacion[especie]
+
+
+class RecursoRegional:
+    """
+    Selva o río con las regiones que toca. Solo crece (y sus peces solo nadan) mientras
+    alguna de esas regiones está despierta; lo pendiente se aplica de golpe al asentarlo.
+    """
+    def __init__(self, terreno, regiones, dia=0, hora=0):
+        self.terreno = terreno
+        self.regiones = regiones
+        self.dia = dia # Días del historial de factores ya aplicados
+        self.hora = hora # Última hora en la que se movieron sus peces
+
+    def activo(self):
+        return any(not region.dormida for region in self.regiones)
+
+    def asentar_dias(self, historial_factores):
+        for factor in historial_factores[self.dia:]:
+            self.terreno.crecer_recursos(factor)
+        self.dia = len(historial_factores)
+
+    def asentar_horas(self, hora):
+        if isinstance(self.terreno, Rio) and hora > self.hora:
+            self.terreno.actualizar_peces(hora - self.hora)
+        self.hora = max(self.hora, hora)
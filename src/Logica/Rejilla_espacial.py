@@ -0,0 +1,108 @@
+class RejillaEspacial:
+    """
+    Hash espacial persistente de animales por celdas de tamano_celda píxeles.
+
+    Se mantiene de forma incremental en lugar de reconstruirse cada hora:
+    - insertar() y quitar() registran nacimientos y muertes en el momento.
+    - mover() solo toca los cubos cuando el animal cambia de celda.
+    Cada cubo es un diccionario {animal: None}: conserva el orden de inserción
+    (la simulación sigue siendo reproducible) y permite borrar en O(1).
+    """
+    def __init__(self, tamano_celda):
+        self.tamano_celda = tamano_celda
+        self.celdas = {} # (gx, gy) -> {animal: None}
+        self._celda_de = {} # animal -> (gx, gy)
+
+    def __len__(self):
+        return len(self._celda_de)
+
+    def __contains__(self, animal):
+        return animal in self._celda_de
+
+    def celda(self, x, y):
+        return int(x // self.tamano_celda), int(y // self.tamano_celda)
+
+    def insertar(self, animal):
+        if animal in self._celda_de:
+            return
+        celda = self.celda(animal.x, animal.y)
+        self._celda_de[animal] = celda
+        self.celdas.setdefault(celda, {})[animal] = None
+
+    def insertar_lote(self, animales, celdas):
+        """insertar() de animales nuevos cuyas celdas (gx, gy) ya se han calculado."""
+        for animal, celda in zip(animales, celdas):
+            if animal in self._celda_de:
+                continue
+            self._celda_de[animal] = celda
+            cubo = self.celdas.get(celda)
+            if cubo is None:
+                self.celdas[celda] = {animal: None}
+            else:
+                cubo[animal] = None
+
+    def quitar(self, animal):
+        celda = self._celda_de.pop(animal, None)
+        if celda is None:
+            return
+        cubo = self.celdas[celda]
+        del cubo[animal]
+        if not cubo:
+            del self.celdas[celda]
+
+    def mover(self, animal):
+        """Actualiza la celda del animal tras moverse; no hace nada si sigue en la misma."""
+        anterior = self._celda_de.get(animal)
+        if anterior is None:
+            return
+        celda = self.celda(animal.x, animal.y)
+        if celda == anterior:
+            return
+        cubo = self.celdas[anterior]
+        del cubo[animal]
+        if not cubo:
+            del self.celdas[anterior]
+        self._celda_de[animal] = celda
+        self.celdas.setdefault(celda, {})[animal] = None
+
+    def cercanos(self, x, y, radio):
+        """Recorre los animales de las celdas a distancia <= radio (en celdas) de (x, y)."""
+        gx, gy = self.celda(x, y)
+        celdas = self.celdas
+        for dx in range(-radio, radio + 1):
+            for dy in range(-radio, radio + 1):
+                cubo = celdas.get((gx + dx, gy + dy))
+                if cubo:
+                    yield from cubo
+
+    def _anillo(self, gx, gy, r):
+        """Celdas a distancia de Chebyshev exactamente r de (gx, gy)."""
+        if r == 0:
+            yield gx, gy
+            return
+        for dx in range(-r, r + 1):
+            yield gx + dx, gy - r
+            yield gx + dx, gy + r
+        for dy in range(-r + 1, r):
+            yield gx - r, gy + dy
+            yield gx + r, gy + dy
+
+    def buscar(self, x, y, radio, k):
+        """
+        Busca por anillos de celdas alrededor de (x, y), del más cercano al más lejano
+        y como mucho hasta radio, y se detiene al completar el anillo en el que ya hay
+        al menos k candidatos. Devuelve la lista de candidatos (puede estar vacía).
+        """
+        candidatos = []
+        if not self._celda_de:
+            return candidatos
+        gx, gy = self.celda(x, y)
+        celdas = self.celdas
+        for r in range(radio + 1):
+            for celda in self._anillo(gx, gy, r):
+                cubo = celdas.get(celda)
+                if cubo:
+                    candidatos.extend(cubo)
+            if len(candidatos) >= k:
+                break
+        return candidatos
@@ -0,0 +1,122 @@
+import numpy as np
+
+DIAS_COMPACTAR = 365 # Cada cuántos días se ponen al día todas las celdas y se vacía el historial
+
+
+class RejillaHierba:
+    """
+    Hierba por celda calculada bajo demanda en lugar de crecer toda la rejilla cada día.
+
+    Cada celda guarda (valor, día en que se calculó). El crecimiento diario
+    h -> min(h + int(tasa * factor * (1 - h / max)), max) solo depende de la clase
+    de la celda (tasa, max), del factor del día y de h, que es un entero pequeño:
+    para cada clase y factor es una tabla de valores. Para cada día d y cada j se
+    guarda además la composición de los 2^j días que empiezan en d, así que poner
+    al día una celda que lleva k días sin tocarse son log2(k) consultas.
+
+    Pasar de día cuesta lo mismo sea cual sea el tamaño del mapa. La hierba total se
+    lleva con un histograma de valores por clase, que se actualiza con las mismas tablas.
+    """
+    def __init__(self, valores, tasa, capacidad):
+        pares, clases = np.unique(np.stack([tasa.ravel(), capacidad.ravel().astype(np.float64)], axis=1), axis=0, return_inverse=True)
+        self.tasas = pares[:, 0]
+        self.capacidades = pares[:, 1].astype(np.int64)
+        self.divisores = np.maximum(self.capacidades, 1).astype(np.float64) # Las celdas de río tienen capacidad 0
+        self.clase = clases.reshape(valores.shape).astype(np.uint8)
+        self.forma = valores.shape
+        self.num_valores = int(max(self.capacidades.max(), valores.max(), 0)) + 1
+        self._tablas = {} # factor -> tabla (clases, num_valores)
+        self._reiniciar(np.array(valores, dtype=np.int32))
+
+    def _reiniciar(self, valores):
+        """Toma valores como el estado de hoy y vacía el historial."""
+        self.valor = valores
+        self.dia = np.zeros(self.forma, dtype=np.int32)
+        self.dias = 0
+        self.niveles = [] # niveles[j][d]: tabla de los 2^j días que empiezan en el día d
+        self.histograma = np.zeros((len(self.tasas), self.num_valores), dtype=np.float64)
+        np.add.at(self.histograma, (self.clase.ravel(), valores.ravel()), 1)
+
+    def _tabla(self, factor):
+        """Tabla (clases, num_valores) con la hierba tras un día de ese factor para cada valor de partida."""
+        tabla = self._tablas.get(factor)
+        if tabla is None:
+            h = np.arange(self.num_valores)
+            filas = []
+            for tasa, capacidad, divisor in zip(self.tasas, self.capacidades, self.divisores):
+                crecimiento = (tasa * factor * (1 - h / divisor)).astype(np.int32)
+                filas.append(np.minimum(h + crecimiento, capacidad))
+            tabla = self._tablas[factor] = np.array(filas, dtype=np.int16)
+        return tabla
+
+    def nuevo_dia(self, factor):
+        """Crecimiento de un día: solo se anotan las tablas, las celdas se calculan al leerlas."""
+        if self.dias >= DIAS_COMPACTAR:
+            self._reiniciar(self.valores())
+        tabla = self._tabla(factor)
+        if not self.niveles:
+            self.niveles.append([])
+        self.niveles[0].append(tabla)
+        self.dias += 1
+        # Tablas de 2^j días que terminan hoy: la de 2^(j-1) días seguida de la siguiente de 2^(j-1)
+        j = 1
+        while (1 << j) <= self.dias:
+            if j == len(self.niveles):
+                self.niveles.append([])
+            inicio = self.dias - (1 << j)
+            primera = self.niveles[j - 1][inicio]
+            segunda = self.niveles[j - 1][inicio + (1 << (j - 1))]
+            self.niveles[j].append(np.take_along_axis(segunda, primera, axis=1))
+            j += 1
+
+        for c in range(len(self.tasas)):
+            self.histograma[c] = np.bincount(tabla[c], weights=self.histograma[c], minlength=self.num_valores)
+
+    def __getitem__(self, celda):
+        """Hierba actual de la celda (gx, gy)."""
+        valor, dia = int(self.valor[celda]), int(self.dia[celda])
+        pendientes = self.dias - dia
+        if pendientes:
+            clase = self.clase[celda]
+            j = 0
+            while pendientes:
+                if pendientes & 1:
+                    valor = int(self.niveles[j][dia][clase, valor])
+                    dia += 1 << j
+                pendientes >>= 1
+                j += 1
+        return valor
+
+    def comer(self, gx, gy, cantidad):
+        """Quita cantidad de hierba de la celda si tiene más; devuelve si se pudo comer."""
+        valor = self[gx, gy]
+        self.valor[gx, gy] = valor
+        self.dia[gx, gy] = self.dias
+        if valor <= cantidad:
+            return False
+        self.valor[gx, gy] = valor - cantidad
+        clase = self.clase[gx, gy]
+        self.histograma[clase, valor] -= 1
+        self.histograma[clase, valor - cantidad] += 1
+        return True
+
+    def valores(self, celdas=(slice(None), slice(None))):
+        """Copia de la hierba actual de todas las celdas (o de una parte de la rejilla)."""
+        valor = self.valor[celdas].copy()
+        dia = self.dia[celdas].copy()
+        clase = self.clase[celdas]
+        pendientes = self.dias - dia
+        j = 0
+        while pendientes.any():
+            bit = (pendientes & 1).astype(bool)
+            if bit.any():
+                nivel = np.stack(self.niveles[j])
+                valor[bit] = nivel[dia[bit], clase[bit], valor[bit]]
+                dia[bit] += 1 << j
+            pendientes >>= 1
+            j += 1
+        return valor
+
+    def total(self):
+        """Hierba total de la rejilla, sin calcular ninguna celda."""
+        return int((self.histograma @ np.arange(self.num_valores)).sum())
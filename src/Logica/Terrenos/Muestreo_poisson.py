@@ -0,0 +1,99 @@
+import math
+
+import numpy as np
+
+
+class RejillaPuntos:
+    """
+    Rejilla de aceleración para puntos fijos (decoraciones). Cada celda guarda la
+    lista de puntos que caen en ella, así que comprobar si hay un punto a menos de
+    una distancia solo mira las celdas vecinas en lugar de todos los puntos.
+    """
+    def __init__(self, tamano_celda):
+        self.tamano_celda = tamano_celda
+        self.celdas = {} # (gx, gy) -> [(x, y), ...]
+
+    def celda(self, x, y):
+        return int(x // self.tamano_celda), int(y // self.tamano_celda)
+
+    def insertar(self, x, y):
+        self.celdas.setdefault(self.celda(x, y), []).append((x, y))
+
+    def hay_cercano(self, x, y, distancia):
+        """True si algún punto está a distancia estrictamente menor que distancia de (x, y)."""
+        gx, gy = self.celda(x, y)
+        alcance = math.ceil(distancia / self.tamano_celda)
+        dist_sq = distancia * distancia
+        celdas = self.celdas
+        for cx in range(gx - alcance, gx + alcance + 1):
+            for cy in range(gy - alcance, gy + alcance + 1):
+                for px, py in celdas.get((cx, cy), ()):
+                    if (px - x) ** 2 + (py - y) ** 2 < dist_sq:
+                        return True
+        return False
+
+
+def _disco(radio):
+    """Máscara booleana (2r+1, 2r+1) de los desplazamientos a distancia < radio."""
+    r = math.ceil(radio)
+    d = np.arange(-r, r + 1)
+    return d[:, None] ** 2 + d[None, :] ** 2 < radio * radio
+
+
+def muestrear_poisson(rng, izquierda, arriba, derecha, abajo, min_dist, es_valido, maximo=None, intentos=30):
+    """
+    Muestreo de disco de Poisson (Bridson) de puntos enteros en [izquierda, derecha] x
+    [arriba, abajo], todos a min_dist o más entre sí. es_valido(x, y) descarta los
+    candidatos que no sirven (obstáculos, decoraciones ya colocadas...).
+
+    Con maximo se para al llegar a esa cantidad. Para que los puntos no se agrupen
+    alrededor de la primera semilla, antes de crecer se lanzan hasta `intentos`
+    puntos al azar por toda la zona; el crecimiento solo rellena los huecos.
+    Devuelve la lista de puntos en orden de generación.
+    """
+    if izquierda > derecha or arriba > abajo:
+        return []
+    # Rejilla de fondo a resolución de píxel: cada punto aceptado marca su disco de
+    # exclusión, así que comprobar un candidato contra los ya aceptados es una consulta
+    ancho, alto = derecha - izquierda + 1, abajo - arriba + 1
+    ocupado = np.zeros((ancho, alto), dtype=bool)
+    disco = _disco(min_dist)
+    r = disco.shape[0] // 2
+    puntos, activos = [], []
+
+    def aceptar(x, y):
+        lx, ly = x - izquierda, y - arriba
+        x0, x1 = max(0, lx - r), min(ancho, lx + r + 1)
+        y0, y1 = max(0, ly - r), min(alto, ly + r + 1)
+        ocupado[x0:x1, y0:y1] |= disco[x0 - lx + r:x1 - lx + r, y0 - ly + r:y1 - ly + r]
+        puntos.append((x, y))
+        activos.append((x, y))
+
+    # Semillas al azar por toda la zona (una sola si no hay máximo)
+    semillas = maximo if maximo is not None else 1
+    for _ in range(intentos):
+        if len(puntos) >= semillas:
+            break
+        x, y = rng.randint(izquierda, derecha), rng.randint(arriba, abajo)
+        if not ocupado[x - izquierda, y - arriba] and es_valido(x, y):
+            aceptar(x, y)
+
+    aleatorio = rng.random
+    dos_pi = 2 * math.pi
+    while activos and (maximo is None or len(puntos) < maximo):
+        i = int(aleatorio() * len(activos))
+        ox, oy = activos[i]
+        for _ in range(intentos):
+            # Candidato en el anillo [min_dist, 2 * min_dist) alrededor del punto activo
+            angulo = dos_pi * aleatorio()
+            radio = min_dist * (1 + aleatorio())
+            x = round(ox + radio * math.cos(angulo))
+            y = round(oy + radio * math.sin(angulo))
+            if izquierda <= x <= derecha and arriba <= y <= abajo and not ocupado[x - izquierda, y - arriba] and es_valido(x, y):
+                aceptar(x, y)
+                break
+        else:
+            # Sin hueco alrededor: el punto deja de estar activo
+            activos[i] = activos[-1]
+            activos.pop()
+    return puntos
@@ -1,42 +1,19 @@
 import random
 import math
+import numpy as np
 import pygame
 
 MAX_HIERBA_NORMAL = 70
 MAX_HIERBA_PRADERA = 120
 
+DIAS_DESCOMPOSICION = 5 # Días que dura una carcasa
+
 class Carcasa:
-    def __init__(self, x, y, energia_restante=60):
+    def __init__(self, x, y, energia_restante=60, dia_aparicion=1):
         self.x = x
         self.y = y
         self.energia_restante = energia_restante
-        self.dias_descomposicion = 0
-
-class Pez:
-    def __init__(self, x, y, rio=None):
-        self.x = x
-        self.y = y
-        self.rio = rio
-        self.energia = 50
-        self.fue_comido = False
-        self.velocidad = 1
-        self.direccion = random.uniform(0, 2 * math.pi)
-
-    def actualizar(self):
-        """Mueve el pez y lo mantiene dentro de los límites de su río."""
-        if self.fue_comido:
-            return
-
-        # Mover el pez
-        self.x += self.velocidad * math.cos(self.direccion)
-        self.y += self.velocidad * math.sin(self.direccion)
-
-        # Rebotar en los bordes del río
-        if not self.rio.rect.collidepoint(self.x, self.y):
-            self.x = max(self.rio.rect.left, min(self.x, self.rio.rect.right))
-            self.y = max(self.rio.rect.top, min(self.y, self.rio.rect.bottom))
-            # Cambiar de dirección al chocar
-            self.direccion = random.uniform(0, 2 * math.pi)
+        self.dia_aparicion = dia_aparicion # Los días de descomposición se cuentan desde aquí
 
 class Terreno:
     def __init__(self, rect):
@@ -44,25 +21,107 @@ class Terreno:
         
 
 class Rio(Terreno):
-    def __init__(self, rect):
+    """
+    Río con sus peces guardados como arrays (posición, dirección y energía), uno por
+    pez vivo en las primeras num_peces posiciones. Un pez comido se elimina al momento
+    moviendo el último a su hueco, y todos los peces del río se mueven en un solo paso.
+    """
+    VELOCIDAD_PEZ = 1
+    ENERGIA_PEZ = 50
+
+    def __init__(self, rect, rng=None, peces_iniciales=True):
         super().__init__(rect)
-        self.max_peces = 20
-        self.peces = []
-        self._generar_peces_iniciales()
+        self.rng = rng if rng is not None else random # Generador aleatorio del ecosistema
+        self.max_peces = 50
+        self.num_peces = 0
+        self.peces_x = np.zeros(self.max_peces)
+        self.peces_y = np.zeros(self.max_peces)
+        self.peces_direccion = np.zeros(self.max_peces)
+        self.peces_energia = np.zeros(self.max_peces)
+        if peces_iniciales: # Al cargar una partida los peces vienen del archivo
+            self._generar_peces_iniciales()
 
     def _generar_peces_iniciales(self):
         for _ in range(10):
-            x = random.randint(self.rect.left + 5, self.rect.right - 5)
-            y = random.randint(self.rect.top + 5, self.rect.bottom - 5)
-            pez = Pez(x, y, self)
-            self.peces.append(pez)
+            x = self.rng.randint(self.rect.left + 5, self.rect.right - 5)
+            y = self.rng.randint(self.rect.top + 5, self.rect.bottom - 5)
+            self.agregar_pez(x, y)
+
+    def agregar_pez(self, x, y, energia=ENERGIA_PEZ):
+        if self.num_peces >= self.max_peces:
+            return
+        i = self.num_peces
+        self.peces_x[i] = x
+        self.peces_y[i] = y
+        self.peces_direccion[i] = self.rng.uniform(0, 2 * math.pi)
+        self.peces_energia[i] = energia
+        self.num_peces += 1
+
+    def quitar_pez(self, i):
+        """Elimina el pez i moviendo el último a su lugar."""
+        ultimo = self.num_peces - 1
+        for arr in (self.peces_x, self.peces_y, self.peces_direccion, self.peces_energia):
+            arr[i] = arr[ultimo]
+        self.num_peces -= 1
+
+    def posiciones_peces(self):
+        """Lista de (x, y) de los peces vivos."""
+        n = self.num_peces
+        return list(zip(self.peces_x[:n].tolist(), self.peces_y[:n].tolist()))
+
+    def pez_cercano(self, x, y, radio):
+        """Índice del pez más cercano a (x, y) a menos de radio píxeles, o None."""
+        n = self.num_peces
+        if n == 0:
+            return None
+        dist_sq = (self.peces_x[:n] - x)**2 + (self.peces_y[:n] - y)**2
+        i = int(np.argmin(dist_sq))
+        return i if dist_sq[i] < radio**2 else None
+
+    def comer_pez(self, i):
+        """Quita el pez i y devuelve su energía."""
+        energia = float(self.peces_energia[i])
+        self.quitar_pez(i)
+        return energia
+
+    def actualizar_peces(self, horas=1):
+        """
+        Mueve todos los peces y los hace rebotar (con nueva dirección) en los bordes del río.
+        Con horas > 1 avanza varias horas de golpe, reflejando la trayectoria en los bordes.
+        """
+        n = self.num_peces
+        if n == 0:
+            return
+        x, y, direccion = self.peces_x[:n], self.peces_y[:n], self.peces_direccion[:n]
+        x += self.VELOCIDAD_PEZ * horas * np.cos(direccion)
+        y += self.VELOCIDAD_PEZ * horas * np.sin(direccion)
+
+        r = self.rect
+        fuera = (x < r.left) | (x >= r.right) | (y < r.top) | (y >= r.bottom)
+        if fuera.any():
+            if horas > 1:
+                _reflejar(x, r.left, r.right)
+                _reflejar(y, r.top, r.bottom)
+            np.clip(x, r.left, r.right, out=x)
+            np.clip(y, r.top, r.bottom, out=y)
+            # Cambiar de dirección al chocar (en orden de índice, para que sea reproducible)
+            for i in np.flatnonzero(fuera):
+                direccion[i] = self.rng.uniform(0, 2 * math.pi)
 
     def crecer_recursos(self, factor_crecimiento):
-        if len(self.peces) < 50:
-            if random.random() < 0.1 * factor_crecimiento:
-                x = random.randint(self.rect.left + 5, self.rect.right - 5)
-                y = random.randint(self.rect.top + 5, self.rect.bottom - 5)
-                self.peces.append(Pez(x, y, self))
+        if self.num_peces < self.max_peces:
+            if self.rng.random() < 0.1 * factor_crecimiento:
+                x = self.rng.randint(self.rect.left + 5, self.rect.right - 5)
+                y = self.rng.randint(self.rect.top + 5, self.rect.bottom - 5)
+                self.agregar_pez(x, y)
+
+def _reflejar(valores, minimo, maximo):
+    """Pliega en [minimo, maximo] los valores que se salen, como si rebotaran en los bordes."""
+    ancho = maximo - minimo
+    if ancho <= 0:
+        return
+    t = np.mod(valores - minimo, 2 * ancho)
+    valores[:] = minimo + np.where(t > ancho, 2 * ancho - t, t)
 
 class Selva(Terreno):
     def __init__(self, rect):
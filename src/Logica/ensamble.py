@@ -0,0 +1,226 @@
+"""
+Ensamble de simulaciones sin pantalla: varias semillas × una rejilla de parámetros.
+
+Uso:
+    python -m src.Logica.ensamble --seeds 20 --days 365 --out-dir ensamble \\
+        --grid '{"factor_crecimiento_base": [1.0, 1.5], "prob_sequia": [0.05, 0.2]}'
+
+Cada combinación (semilla, parámetros) es un trabajo que se ejecuta en un
+ProcessPoolExecutor. Los procesos envían las poblaciones de cada día al proceso
+principal a medida que las simulan; al terminar un trabajo su serie se añade a
+<out-dir>/ejecuciones.jsonl, de modo que si se interrumpe el ensamble y se vuelve
+a lanzar con el mismo --out-dir, los trabajos ya terminados se saltan. Un trabajo
+solo cuenta como terminado si se simuló con los mismos --days y --per-species; los
+de otras ejecuciones del ensamble se quedan en el archivo pero no entran en el resumen.
+Al final se escribe <out-dir>/resumen.csv con la media y los percentiles de cada
+dieta por día y combinación de parámetros.
+
+Parámetros admitidos en la rejilla:
+    - Cualquier atributo numérico del Ecosistema (factor_crecimiento_base, prob_sequia...).
+    - "poblacion": diccionario {especie: cantidad} que sustituye a --per-species
+      para esas especies (p. ej. [{"Leopardo": 1}, {"Leopardo": 4}]).
+"""
+import argparse
+import concurrent.futures
+import contextlib
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import queue
+import sys
+
+import numpy as np
+
+from . import run
+from .Plantilla_mundo import activar_cache_en_disco, directorio_cache_usuario
+
+DIETAS = ["herbivoros", "carnivoros", "omnivoros"]
+PERCENTILES = [10, 50, 90]
+
+
+def combinaciones(rejilla):
+    """Producto cartesiano de la rejilla {parámetro: [valores]} como lista de diccionarios."""
+    if not rejilla:
+        return [{}]
+    nombres = sorted(rejilla)
+    return [dict(zip(nombres, valores)) for valores in itertools.product(*(rejilla[n] for n in nombres))]
+
+
+def clave_parametros(parametros):
+    return json.dumps(parametros, sort_keys=True, ensure_ascii=False)
+
+
+def clave_trabajo(semilla, parametros, dias, cantidad_por_especie):
+    return f"{semilla}|{dias}|{cantidad_por_especie}|{clave_parametros(parametros)}"
+
+
+def _ejecutar_trabajo(clave, semilla, parametros, dias, cantidad_por_especie, cola):
+    """
+    Trabajo de un proceso hijo: simula y envía (clave, dia, herb, carn, omni) de cada día.
+    Devuelve True si la población se extinguió antes de completar los días.
+    """
+    ajustes = {k: v for k, v in parametros.items() if k != "poblacion"}
+
+    def enviar(fila):
+        cola.put((clave, fila["dia"], fila["herbivoros"], fila["carnivoros"], fila["omnivoros"]))
+
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+        filas, _, _, _ = run.simular(dias, semilla, cantidad_por_especie, al_terminar_dia=enviar, ajustes=ajustes, cantidades=parametros.get("poblacion"))
+    return filas[-1]["dia"] <= dias # Sin llegar al último día: no quedaban animales
+
+
+def cargar_ejecuciones(ruta):
+    """Lee las ejecuciones ya terminadas: {clave: registro}."""
+    ejecuciones = {}
+    if not os.path.exists(ruta):
+        return ejecuciones
+    with open(ruta, encoding="utf-8") as f:
+        for linea in f:
+            linea = linea.strip()
+            if not linea:
+                continue
+            try:
+                registro = json.loads(linea)
+            except json.JSONDecodeError:
+                continue # Línea a medio escribir si se interrumpió el proceso
+            ejecuciones[registro["clave"]] = registro
+    return ejecuciones
+
+
+def agregar(ejecuciones, dias):
+    """
+    Agrupa las ejecuciones por combinación de parámetros y calcula por día y dieta
+    la media y los percentiles. Una ejecución que se extinguió cuenta como 0 desde
+    su último día; cualquier otro día que falte en una serie no cuenta (la columna
+    ejecuciones dice cuántas hay detrás de cada fila).
+    """
+    grupos = {}
+    for registro in ejecuciones.values():
+        grupos.setdefault(clave_parametros(registro["parametros"]), []).append(registro)
+
+    filas = []
+    for parametros, registros in sorted(grupos.items()):
+        datos = np.full((len(registros), dias + 1, len(DIETAS)), np.nan)
+        for i, registro in enumerate(registros):
+            ultimo = 0
+            for dia, *conteos in registro["serie"]:
+                if dia <= dias:
+                    datos[i, dia] = conteos
+                    ultimo = max(ultimo, dia)
+            if registro.get("extinguida"):
+                datos[i, ultimo + 1:] = 0
+        for dia in range(1, dias + 1):
+            del_dia = datos[:, dia]
+            del_dia = del_dia[~np.isnan(del_dia[:, 0])]
+            if not len(del_dia):
+                continue
+            media = del_dia.mean(axis=0)
+            bandas = np.percentile(del_dia, PERCENTILES, axis=0)
+            for d, dieta in enumerate(DIETAS):
+                fila = {"parametros": parametros, "dia": dia, "dieta": dieta, "ejecuciones": len(del_dia), "media": round(float(media[d]), 3)}
+                for p, banda in zip(PERCENTILES, bandas):
+                    fila[f"p{p}"] = float(banda[d])
+                filas.append(fila)
+    return filas
+
+
+def escribir_resumen(filas, ruta):
+    columnas = ["parametros", "dia", "dieta", "ejecuciones", "media"] + [f"p{p}" for p in PERCENTILES]
+    with open(ruta, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.DictWriter(f, fieldnames=columnas)
+        escritor.writeheader()
+        escritor.writerows(filas)
+
+
+def ejecutar_ensamble(semillas, rejilla, dias, out_dir, cantidad_por_especie=2, procesos=None, cache_mundos=None):
+    """
+    Lanza los trabajos pendientes, guarda cada serie al terminar y escribe el resumen.
+    cache_mundos: carpeta donde los procesos guardan y comparten las plantillas de mundo.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    ruta_ejecuciones = os.path.join(out_dir, "ejecuciones.jsonl")
+    guardadas = cargar_ejecuciones(ruta_ejecuciones)
+
+    # Solo las de este ensamble (mismos días y animales por especie) entran en el resumen
+    ejecuciones, pendientes = {}, []
+    for parametros in combinaciones(rejilla):
+        for semilla in semillas:
+            clave = clave_trabajo(semilla, parametros, dias, cantidad_por_especie)
+            if clave in guardadas:
+                ejecuciones[clave] = guardadas[clave]
+            else:
+                pendientes.append((clave, semilla, parametros))
+    print(f"{len(ejecuciones)} ejecuciones ya terminadas, {len(pendientes)} pendientes.", file=sys.stderr)
+
+    if pendientes:
+        series = {clave: [] for clave, _, _ in pendientes}
+        with multiprocessing.Manager() as gestor, \
+                concurrent.futures.ProcessPoolExecutor(max_workers=procesos, initializer=activar_cache_en_disco if cache_mundos else None,
+                                                       initargs=(cache_mundos,) if cache_mundos else ()) as pool, \
+                open(ruta_ejecuciones, "a", encoding="utf-8") as salida:
+            cola = gestor.Queue()
+            futuros = {pool.submit(_ejecutar_trabajo, clave, semilla, parametros, dias, cantidad_por_especie, cola): (clave, semilla, parametros)
+                       for clave, semilla, parametros in pendientes}
+
+            def vaciar_cola(espera):
+                try:
+                    mensaje = cola.get(timeout=espera)
+                    while True:
+                        clave, dia, herb, carn, omni = mensaje
+                        series[clave].append((dia, herb, carn, omni))
+                        mensaje = cola.get_nowait()
+                except queue.Empty:
+                    pass
+
+            terminados = 0
+            while futuros:
+                vaciar_cola(0.2)
+                for futuro in [f for f in futuros if f.done()]:
+                    clave, semilla, parametros = futuros.pop(futuro)
+                    try:
+                        extinguida = futuro.result()
+                    except Exception as e:
+                        print(f"Error en la ejecución {clave}: {e}", file=sys.stderr)
+                        continue
+                    vaciar_cola(0) # Los últimos días del trabajo ya están en la cola
+                    registro = {"clave": clave, "semilla": semilla, "parametros": parametros, "dias": dias,
+                                "cantidad_por_especie": cantidad_por_especie, "extinguida": extinguida, "serie": series.pop(clave)}
+                    salida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+                    salida.flush()
+                    ejecuciones[clave] = registro
+                    terminados += 1
+                    print(f"[{terminados}/{len(pendientes)}] semilla={semilla} {clave_parametros(parametros)}: día {registro['serie'][-1][0]}", file=sys.stderr)
+
+    ruta_resumen = os.path.join(out_dir, "resumen.csv")
+    escribir_resumen(agregar(ejecuciones, dias), ruta_resumen)
+    return ruta_resumen
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ensamble de simulaciones: semillas × rejilla de parámetros en varios procesos.")
+    parser.add_argument("--seeds", type=int, default=10, help="Número de semillas por combinación (0..N-1).")
+    parser.add_argument("--days", type=int, default=365, help="Días a simular en cada ejecución.")
+    parser.add_argument("--grid", default=None, help="Rejilla de parámetros en JSON, o ruta a un archivo JSON.")
+    parser.add_argument("--per-species", type=int, default=2, help="Animales iniciales por especie (por defecto 2).")
+    parser.add_argument("--workers", type=int, default=None, help="Número de procesos (por defecto, uno por CPU).")
+    parser.add_argument("--out-dir", default="ensamble", help="Carpeta de resultados; permite reanudar el ensamble.")
+    parser.add_argument("--world-cache", action="store_true", help="Guardar los mundos generados de cada semilla en la carpeta de caché del usuario (~/.cache/ecosistema/mundos) y reutilizarlos.")
+    args = parser.parse_args(argv)
+
+    rejilla = {}
+    if args.grid:
+        if os.path.exists(args.grid):
+            with open(args.grid, encoding="utf-8") as f:
+                rejilla = json.load(f)
+        else:
+            rejilla = json.loads(args.grid)
+
+    ruta = ejecutar_ensamble(range(args.seeds), rejilla, args.days, args.out_dir, args.per_species, args.workers,
+                             cache_mundos=directorio_cache_usuario() if args.world_cache else None)
+    print(f"Resumen del ensamble guardado en {ruta}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Simulación por lotes sin pantalla ni audio.
+
+Uso:
+    python -m src.Logica.run --days 730 --seed 1 --out stats.csv
+    python -m src.Logica.run --days 30 --width 8000 --height 7000 --per-species 1000
+    python -m src.Logica.run --replay replays/sesion_20250101_120000.json
+    python -m src.Logica.run --days 30 --seed 1 --events eventos.jsonl
+
+Construye y puebla un Ecosistema igual que el controlador gráfico y ejecuta las
+horas una detrás de otra, sin límite de FPS. Al final informa de las horas
+simuladas por segundo y, si se indica --out, escribe las poblaciones de cada día en CSV.
+Con --replay repite exactamente una sesión grabada desde la interfaz (misma semilla y
+mismos comandos en las mismas horas), por ejemplo para perfilarla.
+Con --events los eventos de la simulación (comer, cazar, nacer, morir...) se
+escriben en un archivo JSON Lines; con --verbose también se muestran en la consola.
+"""
+import os
+
+# Sin ventana ni dispositivo de audio: pygame usa los drivers "dummy"
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import contextlib
+import csv
+import json
+import sys
+import time
+
+from .Logica import Ecosistema
+from .Eventos import MOSTRAR
+from .Plantilla_mundo import activar_cache_en_disco
+
+COLUMNAS_CSV = ["dia", "herbivoros", "carnivoros", "omnivoros", "peces", "bayas", "carcasas", "clima", "hierba", "energia_media", "edad_media"]
+
+
+def estadisticas_dia(ecosistema):
+    """Fila de estadísticas del día actual del ecosistema."""
+    agregados = ecosistema.agregados
+    herb, carn, omni = agregados.dietas()
+    return {
+        "dia": ecosistema.dia_total,
+        "herbivoros": herb,
+        "carnivoros": carn,
+        "omnivoros": omni,
+        "peces": agregados.peces(),
+        "bayas": agregados.bayas(),
+        "carcasas": len(ecosistema.recursos["carcasas"]),
+        "clima": ecosistema.clima_actual,
+        "hierba": agregados.hierba(),
+        "energia_media": round(agregados.energia_media(), 2),
+        "edad_media": round(agregados.edad_media(), 2),
+    }
+
+
+def _preparar_eventos(ecosistema, archivo_eventos, mostrar_eventos):
+    if archivo_eventos:
+        ecosistema.eventos.abrir_archivo(archivo_eventos)
+    if mostrar_eventos:
+        ecosistema.eventos.fijar_nivel(MOSTRAR)
+
+
+def simular(dias, semilla=None, cantidad_por_especie=2, usar_soa=False, al_terminar_dia=None, ajustes=None, cantidades=None, mundo=None,
+            archivo_eventos=None, mostrar_eventos=False):
+    """
+    Ejecuta una simulación completa sin pantalla.
+    al_terminar_dia(fila) se llama con las estadísticas de cada día completado.
+    ajustes es un diccionario opcional de atributos del Ecosistema a cambiar antes de
+    poblarlo (p. ej. {"factor_crecimiento_base": 1.0, "prob_sequia": 0.2}) y cantidades
+    la población inicial de especies concretas (ver Ecosistema.poblar). mundo es un
+    diccionario opcional con ancho, alto y tamano_celda del Ecosistema. Los eventos se
+    escriben en archivo_eventos (JSON Lines) y, con mostrar_eventos, en la consola.
+    Devuelve (filas, horas_simuladas, segundos, contadores_de_eventos).
+    """
+    ecosistema = Ecosistema(usar_soa=usar_soa, semilla=semilla, **(mundo or {}))
+    ecosistema.sonido_activo = False
+    _preparar_eventos(ecosistema, archivo_eventos, mostrar_eventos)
+    for nombre, valor in (ajustes or {}).items():
+        if not hasattr(ecosistema, nombre):
+            raise ValueError(f"El ecosistema no tiene el parámetro '{nombre}'.")
+        setattr(ecosistema, nombre, valor)
+    ecosistema.poblar(cantidad_por_especie, cantidades)
+
+    filas = [estadisticas_dia(ecosistema)]
+    if al_terminar_dia:
+        al_terminar_dia(filas[0])
+
+    horas = 0
+    inicio = time.perf_counter()
+    while ecosistema.dia_total <= dias and ecosistema.animales:
+        ecosistema.simular_hora()
+        horas += 1
+        if ecosistema.hora_actual == 0:
+            fila = estadisticas_dia(ecosistema)
+            filas.append(fila)
+            if al_terminar_dia:
+                al_terminar_dia(fila)
+    segundos = time.perf_counter() - inicio
+    ecosistema.eventos.cerrar()
+    return filas, horas, segundos, dict(ecosistema.eventos.contadores)
+
+
+def reproducir(registro, al_terminar_dia=None, archivo_eventos=None, mostrar_eventos=False):
+    """
+    Repite una sesión grabada (ver Persistencia.guardar_registro_comandos): crea el
+    ecosistema con la misma semilla y aplica cada comando en la hora en que se aplicó.
+    Devuelve (ecosistema, filas, horas_simuladas, segundos).
+    """
+    mundo = {clave: registro[clave] for clave in ("ancho", "alto", "tamano_celda", "dormancia", "cinetico", "fases_decision", "presupuesto_decisiones") if clave in registro}
+    ecosistema = Ecosistema(usar_soa=registro.get("usar_soa", False), semilla=registro["semilla"], **mundo)
+    ecosistema.sonido_activo = False
+    _preparar_eventos(ecosistema, archivo_eventos, mostrar_eventos)
+    comandos = sorted(registro["comandos"], key=lambda c: c[0]) # Orden estable: respeta el orden dentro de cada hora
+    filas = []
+
+    horas = 0
+    siguiente = 0
+    inicio = time.perf_counter()
+    while True:
+        while siguiente < len(comandos) and comandos[siguiente][0] <= ecosistema.hora_absoluta:
+            _, tipo, *args = comandos[siguiente]
+            ecosistema.aplicar_comando(tipo, *args)
+            siguiente += 1
+        if not filas:
+            filas.append(estadisticas_dia(ecosistema))
+            if al_terminar_dia:
+                al_terminar_dia(filas[0])
+        if ecosistema.hora_absoluta >= registro["horas"]:
+            break
+        ecosistema.simular_hora()
+        horas += 1
+        if ecosistema.hora_actual == 0:
+            fila = estadisticas_dia(ecosistema)
+            filas.append(fila)
+            if al_terminar_dia:
+                al_terminar_dia(fila)
+    segundos = time.perf_counter() - inicio
+    ecosistema.eventos.cerrar()
+    return ecosistema, filas, horas, segundos
+
+
+def escribir_csv(filas, ruta):
+    with open(ruta, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.DictWriter(f, fieldnames=COLUMNAS_CSV)
+        escritor.writeheader()
+        escritor.writerows(filas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulación del ecosistema sin pantalla.")
+    parser.add_argument("--days", type=int, default=730, help="Días a simular (por defecto 730).")
+    parser.add_argument("--seed", type=int, default=None, help="Semilla aleatoria.")
+    parser.add_argument("--out", default=None, help="Archivo CSV con las poblaciones por día.")
+    parser.add_argument("--per-species", type=int, default=2, help="Animales iniciales por especie (por defecto 2).")
+    parser.add_argument("--soa", action="store_true", help="Usar el almacén structure-of-arrays para los animales. Cambia el orden de actualización: reproducible, pero no idéntico a la misma semilla sin esta opción.")
+    parser.add_argument("--width", type=int, default=None, help="Ancho del mundo en píxeles (por defecto 800).")
+    parser.add_argument("--height", type=int, default=None, help="Alto del mundo en píxeles (por defecto 700).")
+    parser.add_argument("--cell-size", type=int, default=None, help="Tamaño de las celdas en píxeles (por defecto 20).")
+    parser.add_argument("--dormancy", action="store_true", help="Dormir las regiones del mapa sin animales activos cerca (mapas grandes).")
+    parser.add_argument("--kinetic", action="store_true", help="Mover a los animales que deambulan por tramos rectos calculados una vez.")
+    parser.add_argument("--decision-phases", type=int, default=None, help="Grupos en los que se reparten las decisiones de los animales: cada uno decide una de cada N horas.")
+    parser.add_argument("--decision-budget", type=int, default=None, help="Máximo de decisiones de los animales por hora.")
+    parser.add_argument("--replay", default=None, help="Repetir una sesión grabada desde la interfaz (archivo de replays/).")
+    parser.add_argument("--events", default=None, help="Archivo JSON Lines donde escribir los eventos de la simulación.")
+    parser.add_argument("--verbose", action="store_true", help="Mostrar los mensajes y eventos de la simulación.")
+    parser.add_argument("--world-cache", action="store_true", help="Guardar los mundos generados de cada semilla en la carpeta de caché del usuario (~/.cache/ecosistema/mundos) y reutilizarlos.")
+    args = parser.parse_args(argv)
+    if args.world_cache:
+        activar_cache_en_disco()
+    mundo = {clave: valor for clave, valor in (("ancho", args.width), ("alto", args.height), ("tamano_celda", args.cell_size)) if valor is not None}
+    if args.dormancy:
+        mundo["dormancia"] = True
+    if args.kinetic:
+        mundo["cinetico"] = True
+    if args.decision_phases is not None:
+        mundo["fases_decision"] = args.decision_phases
+    if args.decision_budget is not None:
+        mundo["presupuesto_decisiones"] = args.decision_budget
+
+    def informar(fila):
+        print(f"Día {fila['dia']}: herbívoros={fila['herbivoros']} carnívoros={fila['carnivoros']} omnívoros={fila['omnivoros']}", file=sys.stderr)
+
+    with contextlib.ExitStack() as pila:
+        if not args.verbose:
+            pila.enter_context(contextlib.redirect_stdout(pila.enter_context(open(os.devnull, "w"))))
+        if args.replay:
+            with open(args.replay, encoding="utf-8") as f:
+                ecosistema, filas, horas, segundos = reproducir(json.load(f), al_terminar_dia=informar, archivo_eventos=args.events, mostrar_eventos=args.verbose)
+            contadores = ecosistema.eventos.contadores
+        else:
+            filas, horas, segundos, contadores = simular(args.days, args.seed, args.per_species, args.soa, al_terminar_dia=informar, mundo=mundo,
+                                                         archivo_eventos=args.events, mostrar_eventos=args.verbose)
+
+    if args.out:
+        escribir_csv(filas, args.out)
+    velocidad = horas / segundos if segundos > 0 else float("inf")
+    print(f"Simuladas {horas} horas ({filas[-1]['dia'] - 1} días) en {segundos:.2f} s: {velocidad:.0f} horas/segundo")
+    print("Eventos: " + ", ".join(f"{tipo}={cantidad}" for tipo, cantidad in contadores.items()))
+    if args.out:
+        print(f"Poblaciones por día guardadas en {args.out}")
+
+
+if __name__ == "__main__":
+    main()
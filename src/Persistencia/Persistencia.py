@@ -14,6 +14,15 @@ def guardar_partida(ecosistema: Ecosistema, ruta_archivo: str, autosave=False, s
     1. Guarda en un archivo temporal.
     2. Si tiene éxito, reemplaza el archivo de guardado original.
     """
+    datos = ecosistema.to_dict(sim_speed_multiplier, autosave_interval)
+    guardar_datos(datos, ecosistema.dia_total, len(ecosistema.animales), ruta_archivo, autosave)
+
+def guardar_datos(datos: dict, dia_total: int, num_animales: int, ruta_archivo: str, autosave=False):
+    """
+    Escribe en disco un diccionario ya generado con Ecosistema.to_dict().
+    Permite sacar el estado en el hilo de simulación y hacer la escritura
+    (lo lento) en otro hilo sin copiar el ecosistema entero.
+    """
     directorio = os.path.dirname(ruta_archivo)
     ruta_temporal = ruta_archivo + ".tmp"
     ruta_respaldo = ruta_archivo + ".bak"
@@ -29,11 +38,10 @@ def guardar_partida(ecosistema: Ecosistema, ruta_archivo: str, autosave=False, s
 
         # 2. Escribir en el archivo temporal
         with open(ruta_temporal, 'w', encoding='utf-8') as f:
-            datos = ecosistema.to_dict(sim_speed_multiplier, autosave_interval)
             datos['metadata'] = {
                 "save_date": datetime.now().isoformat(),
-                "in_game_day": ecosistema.dia_total,
-                "animal_count": len(ecosistema.animales)
+                "in_game_day": dia_total,
+                "animal_count": num_animales
             }
             datos['simulator_version'] = SIMULATOR_VERSION # Añadir la versión al guardar
             json.dump(datos, f, indent=2, ensure_ascii=False)
@@ -56,6 +64,35 @@ def guardar_partida(ecosistema: Ecosistema, ruta_archivo: str, autosave=False, s
             os.remove(ruta_temporal)
             print(f"Archivo temporal limpiado: {ruta_temporal}")
 
+def guardar_registro_comandos(ecosistema: Ecosistema, ruta_archivo: str):
+    """
+    Guarda lo necesario para repetir la partida sin pantalla: semilla, tamaño del mundo,
+    regiones dormidas, movimiento cinético, reparto de decisiones, backend de animales, horas simuladas y los comandos aplicados desde la interfaz.
+    """
+    registro = {
+        "semilla": ecosistema.semilla,
+        "ancho": ecosistema.ancho,
+        "alto": ecosistema.alto,
+        "tamano_celda": ecosistema.tamano_celda,
+        "dormancia": ecosistema.dormancia,
+        "cinetico": ecosistema.cinetico,
+        "fases_decision": ecosistema.fases_decision,
+        "presupuesto_decisiones": ecosistema.presupuesto_decisiones,
+        "usar_soa": ecosistema.usar_soa,
+        "horas": ecosistema.hora_absoluta,
+        "comandos": ecosistema.registro_comandos,
+        "simulator_version": SIMULATOR_VERSION
+    }
+    try:
+        directorio = os.path.dirname(ruta_archivo)
+        if directorio and not os.path.exists(directorio):
+            os.makedirs(directorio)
+        with open(ruta_archivo, 'w', encoding='utf-8') as f:
+            json.dump(registro, f, indent=2, ensure_ascii=False)
+        print(f"Registro de la sesión guardado en: {ruta_archivo}")
+    except (IOError, OSError) as e:
+        print(f"Error al guardar el registro de la sesión: {e}")
+
 def cargar_partida(ruta_archivo: str) -> Ecosistema:
     """
     Carga una partida desde un archivo JSON y la convierte en un objeto Ecosistema.
@@ -0,0 +1,10 @@
+import os
+import sys
+
+# Sin ventana ni dispositivo de audio, como src.Logica.run
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+os.chdir(RAIZ) # Los sonidos se cargan con rutas relativas a la raíz del proyecto
@@ -0,0 +1,45 @@
+import pytest
+
+from src.Logica.Logica import Ecosistema, Conejo, Leopardo, Mono, OBSTACULO_RIO, OBSTACULO_TRONCO
+
+
+@pytest.fixture(scope="module")
+def ecosistema():
+    ecosistema = Ecosistema(semilla=4)
+    ecosistema.sonido_activo = False
+    return ecosistema
+
+
+@pytest.mark.parametrize("especie", [Conejo, Leopardo, Mono])
+def test_aparecen_en_su_zona_sin_troncos_ni_rio(ecosistema, especie):
+    x_min, x_max, y_min, y_max = ecosistema.zonas_aparicion[especie.DIETA]
+    nuevos = ecosistema.agregar_animales(especie, 300)
+    assert len(nuevos) == 300
+    for animal in nuevos:
+        assert x_min <= animal.x <= x_max and y_min <= animal.y <= y_max
+        assert not ecosistema._obstaculos_en(animal.x, animal.y) & (OBSTACULO_TRONCO | OBSTACULO_RIO)
+        assert not ecosistema.choca_con_terreno(animal.x, animal.y)
+        assert animal in ecosistema.rejilla
+        assert (animal in ecosistema.rejilla_presas) == (especie.DIETA == "herbivoro")
+
+
+def test_se_registran_en_los_agregados():
+    ecosistema = Ecosistema(semilla=4)
+    ecosistema.agregar_animales(Conejo, 5)
+    ecosistema.agregar_animales(Leopardo, 2)
+    assert ecosistema.agregados.dietas() == (5, 2, 0)
+    assert ecosistema.agregados.por_especie == {"Conejo": 5, "Leopardo": 2}
+
+
+def test_misma_semilla_mismas_posiciones():
+    posiciones = []
+    for _ in range(2):
+        ecosistema = Ecosistema(semilla=9)
+        posiciones.append([(a.x, a.y) for a in ecosistema.agregar_animales(Mono, 50)])
+    assert posiciones[0] == posiciones[1]
+
+
+def test_posiciones_dadas():
+    ecosistema = Ecosistema(semilla=4)
+    nuevos = ecosistema.agregar_animales(Conejo, 2, posiciones=[(300, 600), (310, 610)])
+    assert [(a.x, a.y) for a in nuevos] == [(300, 600), (310, 610)]
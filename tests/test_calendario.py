@@ -0,0 +1,45 @@
+from src.Logica.Calendario import Calendario
+
+
+def test_ejecuta_por_hora_y_en_orden_de_programacion():
+    calendario = Calendario()
+    ejecutados = []
+    calendario.programar(5, ejecutados.append, "b")
+    calendario.programar(2, ejecutados.append, "a")
+    calendario.programar(5, ejecutados.append, "c")
+    calendario.programar(9, ejecutados.append, "d")
+
+    calendario.ejecutar_hasta(1)
+    assert ejecutados == []
+    calendario.ejecutar_hasta(5) # Incluida
+    assert ejecutados == ["a", "b", "c"]
+    assert len(calendario) == 1
+    calendario.ejecutar_hasta(100)
+    assert ejecutados == ["a", "b", "c", "d"]
+    assert len(calendario) == 0
+
+
+def test_eventos_programados_al_ejecutar():
+    calendario = Calendario()
+    ejecutados = []
+
+    def repetir(hora):
+        ejecutados.append(hora)
+        if hora < 6:
+            calendario.programar(hora + 2, repetir, hora + 2)
+
+    calendario.programar(0, repetir, 0)
+    calendario.programar(2, ejecutados.append, "fijo")
+    calendario.ejecutar_hasta(4)
+    # El evento de la hora 2 programado al ejecutar va detrás del que ya estaba
+    assert ejecutados == [0, "fijo", 2, 4]
+    calendario.ejecutar_hasta(10)
+    assert ejecutados == [0, "fijo", 2, 4, 6]
+
+
+def test_varios_argumentos():
+    calendario = Calendario()
+    sumas = []
+    calendario.programar(3, lambda a, b: sumas.append(a + b), 1, 2)
+    calendario.ejecutar_hasta(3)
+    assert sumas == [3]
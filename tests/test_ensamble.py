@@ -0,0 +1,76 @@
+import json
+import math
+import os
+
+from src.Logica import ensamble
+
+
+def _registro(semilla, serie, extinguida=False, parametros=None, dias=4):
+    parametros = parametros or {}
+    return {"clave": ensamble.clave_trabajo(semilla, parametros, dias, 2), "semilla": semilla, "parametros": parametros,
+            "dias": dias, "cantidad_por_especie": 2, "extinguida": extinguida, "serie": serie}
+
+
+def _filas(filas, dieta):
+    return {fila["dia"]: fila for fila in filas if fila["dieta"] == dieta}
+
+
+def test_agregar_ceros_solo_tras_extinguirse():
+    ejecuciones = {r["clave"]: r for r in (
+        _registro(0, [(1, 4, 2, 2), (2, 6, 2, 2), (3, 8, 2, 2), (4, 10, 2, 2)]),
+        _registro(1, [(1, 2, 1, 1), (2, 0, 0, 0)], extinguida=True),
+        _registro(2, [(1, 6, 3, 3), (3, 12, 3, 3)]), # Sin el día 2 ni el 4, pero no extinguida
+    )}
+    herbivoros = _filas(ensamble.agregar(ejecuciones, 4), "herbivoros")
+
+    assert herbivoros[1]["ejecuciones"] == 3
+    assert math.isclose(herbivoros[1]["media"], 4.0)
+    # Día 2: la tercera no tiene dato y no cuenta
+    assert herbivoros[2]["ejecuciones"] == 2
+    assert math.isclose(herbivoros[2]["media"], 3.0)
+    # Días 3 y 4: la extinguida cuenta como 0
+    assert herbivoros[3]["ejecuciones"] == 3
+    assert math.isclose(herbivoros[3]["media"], 20 / 3, rel_tol=1e-3)
+    assert herbivoros[4]["ejecuciones"] == 2
+    assert math.isclose(herbivoros[4]["media"], 5.0)
+
+
+def test_agregar_por_parametros():
+    ejecuciones = {r["clave"]: r for r in (
+        _registro(0, [(1, 1, 0, 0)], parametros={"prob_sequia": 0.1}, dias=1),
+        _registro(0, [(1, 3, 0, 0)], parametros={"prob_sequia": 0.2}, dias=1),
+    )}
+    filas = ensamble.agregar(ejecuciones, 1)
+    medias = {fila["parametros"]: fila["media"] for fila in filas if fila["dieta"] == "herbivoros"}
+    assert medias == {ensamble.clave_parametros({"prob_sequia": 0.1}): 1.0, ensamble.clave_parametros({"prob_sequia": 0.2}): 3.0}
+
+
+def test_cargar_ejecuciones_ignora_lineas_a_medias(tmp_path):
+    ruta = tmp_path / "ejecuciones.jsonl"
+    registro = _registro(0, [(1, 1, 1, 1)])
+    ruta.write_text(json.dumps(registro) + "\n" + '{"clave": "1|4', encoding="utf-8")
+    assert ensamble.cargar_ejecuciones(str(ruta)) == {registro["clave"]: json.loads(json.dumps(registro))}
+
+
+def test_reanudar_salta_los_trabajos_terminados(tmp_path, capsys):
+    out_dir = str(tmp_path)
+    ruta_ejecuciones = os.path.join(out_dir, "ejecuciones.jsonl")
+    ensamble.ejecutar_ensamble([0], {}, 2, out_dir, cantidad_por_especie=1, procesos=1)
+    with open(ruta_ejecuciones, encoding="utf-8") as f:
+        lineas = f.readlines()
+    assert len(lineas) == 1
+    capsys.readouterr()
+
+    # Mismos días y animales: nada pendiente y el archivo no cambia
+    ensamble.ejecutar_ensamble([0], {}, 2, out_dir, cantidad_por_especie=1, procesos=1)
+    assert "1 ejecuciones ya terminadas, 0 pendientes." in capsys.readouterr().err
+    with open(ruta_ejecuciones, encoding="utf-8") as f:
+        assert f.readlines() == lineas
+
+    # Otros días: es otro trabajo, y el resumen solo tiene el nuevo
+    ruta = ensamble.ejecutar_ensamble([0], {}, 3, out_dir, cantidad_por_especie=1, procesos=1)
+    assert "0 ejecuciones ya terminadas, 1 pendientes." in capsys.readouterr().err
+    with open(ruta, encoding="utf-8") as f:
+        resumen = f.read().splitlines()
+    assert len(resumen) == 1 + 3 * 3 # Cabecera y 3 días × 3 dietas, cada uno de una ejecución
+    assert all(linea.split(",")[-5] == "1" for linea in resumen[1:])
@@ -0,0 +1,74 @@
+import random
+
+import numpy as np
+
+from src.Logica.Terrenos.Hierba import RejillaHierba, DIAS_COMPACTAR
+
+
+class HierbaDiaADia:
+    """Referencia: hace crecer todas las celdas cada día, como antes de RejillaHierba."""
+    def __init__(self, valores, tasa, capacidad):
+        self.valor = valores.astype(np.int64)
+        self.tasa = tasa
+        self.capacidad = capacidad
+
+    def nuevo_dia(self, factor):
+        divisor = np.maximum(self.capacidad, 1).astype(np.float64)
+        crecimiento = (self.tasa * factor * (1 - self.valor / divisor)).astype(np.int32)
+        self.valor = np.minimum(self.valor + crecimiento, self.capacidad)
+
+    def comer(self, gx, gy, cantidad):
+        if self.valor[gx, gy] <= cantidad:
+            return False
+        self.valor[gx, gy] -= cantidad
+        return True
+
+
+def _rejillas(semilla, forma=(7, 5)):
+    generador = np.random.default_rng(semilla)
+    capacidad = generador.choice([0, 60, 100, 150], size=forma).astype(np.int32)
+    tasa = generador.choice([0.5, 1.0, 2.5], size=forma)
+    tasa[capacidad == 0] = 0.0 # Celdas de río
+    valores = (generador.random(forma) * capacidad).astype(np.int32)
+    return RejillaHierba(valores, tasa, capacidad), HierbaDiaADia(valores, tasa, capacidad)
+
+
+def test_coincide_con_el_crecimiento_dia_a_dia():
+    rejilla, referencia = _rejillas(1)
+    azar = random.Random(1)
+    for dia in range(2 * DIAS_COMPACTAR + 40): # Pasa dos veces por la compactación
+        factor = azar.choice([1.0, 1.0, 0.1, 1.5])
+        rejilla.nuevo_dia(factor)
+        referencia.nuevo_dia(factor)
+        for _ in range(azar.randrange(4)):
+            gx, gy, cantidad = azar.randrange(7), azar.randrange(5), azar.randrange(1, 40)
+            assert rejilla.comer(gx, gy, cantidad) == referencia.comer(gx, gy, cantidad)
+        if dia % 37 == 0:
+            gx, gy = azar.randrange(7), azar.randrange(5)
+            assert rejilla[gx, gy] == referencia.valor[gx, gy]
+            assert rejilla.total() == referencia.valor.sum()
+    assert np.array_equal(rejilla.valores(), referencia.valor)
+    assert rejilla.total() == referencia.valor.sum()
+
+
+def test_celda_sin_tocar_durante_muchos_dias():
+    # Sin comer nada, cada celda se pone al día con la composición de tablas de 2^j días
+    rejilla, referencia = _rejillas(2)
+    for dia in range(300):
+        factor = 0.1 if dia % 50 < 10 else 1.0
+        rejilla.nuevo_dia(factor)
+        referencia.nuevo_dia(factor)
+    for gx in range(7):
+        for gy in range(5):
+            assert rejilla[gx, gy] == referencia.valor[gx, gy]
+    assert np.array_equal(rejilla.valores(np.s_[2:5, 1:4]), referencia.valor[2:5, 1:4])
+
+
+def test_compacta_el_historial():
+    rejilla, referencia = _rejillas(3)
+    for _ in range(DIAS_COMPACTAR + 10):
+        rejilla.nuevo_dia(1.0)
+        referencia.nuevo_dia(1.0)
+    assert rejilla.dias <= 11 # Al llegar a DIAS_COMPACTAR las celdas se ponen al día y el historial se vacía
+    assert sum(len(nivel) for nivel in rejilla.niveles) < 40
+    assert np.array_equal(rejilla.valores(), referencia.valor)